@@ -3,6 +3,7 @@ from typing import Dict, Set, List, Any, Optional
 import re
 from collections import defaultdict
 from utils.logging import logger
+from core.project_archive import iter_project_files
 from .visionos_patterns import get_visionos_patterns, get_realitykit_patterns, get_reality_composer_patterns
 
 class ComponentAnalyzer:
@@ -27,7 +28,7 @@ class ComponentAnalyzer:
             samples_dir = self.samples_dir
         
         try:
-            swift_files = list(samples_dir.glob('**/*.swift'))
+            swift_files = list(iter_project_files(samples_dir, '*.swift'))
             logger.info(f"Found {len(swift_files)} Swift files to analyze")
             
             for file_path in swift_files:
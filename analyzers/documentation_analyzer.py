@@ -1,14 +1,14 @@
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from core.html_parser import parse_html
+from typing import List, Dict, Optional
 import re
 
 class DocumentationAnalyzer:
-    def analyze_code_patterns(self, content: str, url: str) -> List[Dict]:
-        """Analyze code patterns in documentation"""
+    def analyze_code_patterns(self, content: str, url: str, parser: Optional[str] = None) -> List[Dict]:
+        """Analyze code patterns in documentation (``parser`` overrides HTML_PARSER)"""
         patterns = []
         
         # Find code blocks
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = parse_html(content, parser)
         code_blocks = soup.find_all('code')
         
         for block in code_blocks:
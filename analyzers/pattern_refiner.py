@@ -1,8 +1,140 @@
-from typing import List, Dict, Set, Optional
+from bisect import bisect_left
+from typing import List, Dict, Set, Optional, Tuple
 from models.base import Pattern, PatternType, PatternRelationship, ValidationResult
 import re
 from utils.logging import logger
 
+# (type, regex, literals) rules run by PatternRefiner.detect_patterns, in output
+# order. Every match of a regex contains at least one of its literals, so a
+# rule whose literals are all absent from the code cannot match and its regex
+# is skipped; a rule that cannot match across lines only scans the lines that
+# contain one of its literals.
+PATTERN_RULES = [
+    # Framework patterns
+    (PatternType.SWIFTUI, r'import\s+SwiftUI', ('SwiftUI',)),
+    (PatternType.REALITYKIT, r'import\s+RealityKit', ('RealityKit',)),
+
+    # UI patterns
+    (PatternType.VIEW, r'struct\s+\w+:\s*View', ('View',)),
+    (PatternType.REALITY_VIEW, r'RealityView\s*{[^}]*}', ('RealityView',)),
+    (PatternType.TEXT, r'Text\s*\([^)]*\)', ('Text',)),
+
+    # Entity patterns
+    (PatternType.MODEL_ENTITY, r'ModelEntity\s*\([^)]*\)', ('ModelEntity',)),
+    (PatternType.ENTITY, r'class\s+\w+:\s*Entity', ('Entity',)),
+
+    # State patterns
+    (PatternType.STATE, r'@State\s+(?:private\s+)?var', ('@State',)),
+    (PatternType.OBSERVED_OBJECT, r'@ObservedObject\s+var', ('@ObservedObject',)),
+    (PatternType.STATE_OBJECT, r'@StateObject\s+var', ('@StateObject',)),
+
+    # Event System patterns
+    (PatternType.EVENT_SUBSCRIPTION, r'EventSubscription|subscribe\s*\(\s*to:\s*\w+\.?\w*\.self', ('EventSubscription', 'subscribe')),
+    (PatternType.EVENT_HANDLING, r'SceneEvents\.Update|handle\w+Event', ('SceneEvents.Update', 'handle')),
+    (PatternType.EVENT_SYSTEM, r'class\s+\w+:\s*EventSystem', ('EventSystem',)),
+
+    # Transform patterns
+    (PatternType.TRANSFORM_ACTION, r'\.(move|rotate|scale)\(to:', ('(to:',)),
+    (PatternType.TRANSFORM_ANIMATE, r'\.transform\.animate', ('.transform.animate',)),
+    (PatternType.TRANSFORM_SEQUENCE, r'\.transformSequence', ('.transformSequence',)),
+    (PatternType.TRANSFORM, r'transform\s*=\s*Transform\(|\.transform\s*=|transform\.rotation', ('transform',)),
+
+    # Spatial patterns
+    (PatternType.POSITION, r'\.position\s*=|\(position:', ('position',)),
+    (PatternType.SCALE, r'\.scale\s*=|\(scale:', ('scale',)),
+    (PatternType.ROTATION, r'\.rotation\s*=|\(rotation:|simd_quatf\(angle:', ('rotation', 'simd_quatf(angle:')),
+
+    # Gesture patterns
+    (PatternType.DRAG_GESTURE, r'DragGesture\s*\(\s*\)', ('DragGesture',)),
+    (PatternType.TAP_GESTURE, r'TapGesture\s*\(\s*\)', ('TapGesture',)),
+    (PatternType.GESTURE, r'\.gesture\s*\([^)]*\)', ('.gesture',)),
+
+    # Animation patterns
+    (PatternType.WITH_ANIMATION, r'withAnimation\s*\([^)]*\)', ('withAnimation',)),
+    (PatternType.ANIMATION, r'\.animation\s*\([^)]*\)', ('.animation',)),
+    (PatternType.TRANSITION, r'\.transition\s*\([^)]*\)', ('.transition',)),
+
+    # Lifecycle patterns
+    (PatternType.ON_APPEAR, r'\.onAppear\s*{', ('.onAppear',)),
+    (PatternType.ON_DISAPPEAR, r'\.onDisappear\s*{', ('.onDisappear',)),
+    (PatternType.TASK, r'\.task\s*{', ('.task',)),
+    (PatternType.ON_CHANGE, r'\.onChange\s*\([^)]*\)\s*{', ('.onChange',)),
+
+    # Interaction patterns
+    (PatternType.ON_TAP_GESTURE, r'\.onTapGesture\s*{', ('.onTapGesture',)),
+    (PatternType.ON_LONG_PRESS_GESTURE, r'\.onLongPressGesture\s*{', ('.onLongPressGesture',)),
+    (PatternType.SIMULTANEOUS_GESTURE, r'\.simultaneousGesture\s*\([^)]*\)', ('.simultaneousGesture',)),
+    (PatternType.HIGH_PRIORITY_GESTURE, r'\.highPriorityGesture\s*\([^)]*\)', ('.highPriorityGesture',)),
+
+    # Reality Composer Pro patterns
+    (PatternType.USDZ_LOADING, r'try\s+await\s+Entity\.load\("[^"]+\.usdz"\)', ('Entity.load("',)),
+    (PatternType.REALITY_FILE, r'\.reality\s*file\s*reference', ('.reality',)),
+    (PatternType.MATERIAL_VARIANTS, r'materialVariants\s*=', ('materialVariants',)),
+    (PatternType.ANIMATION_CONTROLLER, r'(AnimationController|availableAnimations)', ('AnimationController', 'availableAnimations')),
+    (PatternType.REALITY_COMPOSER_IMPORT, r'import\s+RealityComposer', ('RealityComposer',)),
+    (PatternType.REALITY_COMPOSER_ASSET, r'\.realityComposerContent', ('.realityComposerContent',)),
+
+    # Component System patterns
+    (PatternType.COMPONENT_DEFINITION, r'protocol\s+(\w+)Component\s*:\s*Component', ('protocol',)),
+    (PatternType.COMPONENT_ACCESS, r'(\w+)\.components\[(\w+)Component\.self\]', ('Component.self]',)),
+    (PatternType.COMPONENT_ADD, r'addComponent\((\w+)\)', ('addComponent(',)),
+    (PatternType.COMPONENT_SYSTEM, r'class\s+(\w+)System\s*:\s*System', ('System',)),
+    (PatternType.COMPONENT_QUERY, r'components\.query\(', ('components.query(',)),
+    (PatternType.COMPONENT_UPDATE, r'func\s+update\(context:\s*SceneUpdateContext\)', ('update(context:',)),
+
+    # RealityKit System patterns
+    (PatternType.SCENE_SYSTEM, r'class\s+\w+:\s*SceneSystem', ('SceneSystem',)),
+    (PatternType.SCENE_UPDATE, r'func\s+update\(context:\s*SceneUpdateContext\)', ('update(context:',)),
+    (PatternType.SCENE_SETUP, r'func\s+setup\(scene:\s*RealityKit\.Scene\)', ('setup(scene:',)),
+    (PatternType.ENTITY_SYSTEM, r'class\s+\w+:\s*System', ('System',)),
+    (PatternType.ENTITY_QUERY, r'scene\.components\.query\(', ('scene.components.query(',)),
+    (PatternType.ENTITY_SUBSCRIPTION, r'scene\.subscribe\(', ('scene.subscribe(',)),
+    (PatternType.COMPONENT_REGISTRATION, r'scene\.registerSystem\(', ('scene.registerSystem(',)),
+
+    # Entity Action patterns
+    (PatternType.PHYSICS_ACTION, r'\.(applyForce|applyTorque|setVelocity)\(', ('.applyForce(', '.applyTorque(', '.setVelocity(')),
+    (PatternType.PHYSICS_CONSTRAINT, r'PhysicsConstraint\(', ('PhysicsConstraint(',)),
+    (PatternType.HIERARCHY_ACTION, r'\.(addChild|removeFromParent|moveToParent)\(', ('.addChild(', '.removeFromParent(', '.moveToParent(')),
+    (PatternType.HIERARCHY_QUERY, r'\.(findEntity|findEntities)\(', ('.findEntit',)),
+    (PatternType.ANIMATION_ACTION, r'\.(playAnimation|resumeAnimation|pauseAnimation)\(', ('Animation(',)),
+    (PatternType.ANIMATION_CONTROL, r'AnimationController\(', ('AnimationController(',)),
+    (PatternType.INTERACTION_ACTION, r'\.(enableInteraction|disableInteraction)\(', ('ableInteraction(',)),
+    (PatternType.GESTURE_ACTION, r'\.(addGestureRecognizer|removeGestureRecognizer)\(', ('GestureRecognizer(',)),
+
+    # View Attachment patterns
+    (PatternType.VIEW_ATTACH, r'\.attachments\s*{[^}]*}', ('.attachments',)),
+    (PatternType.VIEW_ENTITY, r'ViewAttachmentEntity\(', ('ViewAttachmentEntity(',)),
+    (PatternType.VIEW_GEOMETRY, r'\.attachmentGeometry\s*=', ('.attachmentGeometry',)),
+    (PatternType.ATTACH_TRANSFORM, r'\.transform\s*=\s*Transform3D\(', ('Transform3D(',)),
+    (PatternType.ATTACH_ORIENTATION, r'\.orientation\s*=', ('.orientation',)),
+    (PatternType.ATTACH_POSITION, r'\.position\s*=', ('.position',)),
+    (PatternType.REALITY_VIEW_CONTENT, r'\.content\s*=', ('.content',)),
+    (PatternType.REALITY_VIEW_UPDATE, r'\.update\s*{', ('.update',)),
+]
+
+# Regex syntax that can match a newline (\s, negated classes, an unescaped dot)
+_CROSSES_LINES = re.compile(r'\\s|\[\^|(?<!\\)\.')
+
+_COMPILED_RULES = [
+    (pattern_type, re.compile(regex), literals, not _CROSSES_LINES.search(regex))
+    for pattern_type, regex, literals in PATTERN_RULES
+]
+
+_NEWLINE = re.compile(r'\n')
+
+
+def _candidate_lines(code: str, literals: Tuple[str, ...], newlines: List[int]) -> List[Tuple[int, int]]:
+    """(start, end) offsets of every line containing one of ``literals``, in order"""
+    lines = set()
+    for literal in literals:
+        at = code.find(literal)
+        while at != -1:
+            lines.add(bisect_left(newlines, at))
+            at = code.find(literal, at + 1)
+    return [(newlines[line - 1] + 1 if line else 0, newlines[line] if line < len(newlines) else len(code))
+            for line in sorted(lines)]
+
+
 class PatternRefiner:
     """Analyzes and refines code patterns from Swift code"""
     
@@ -153,128 +285,36 @@ class PatternRefiner:
         }
 
     def detect_patterns(self, code: str) -> List[Pattern]:
-        """Detect patterns in Swift code"""
+        """Detect patterns in Swift code
+
+        Runs the precompiled PATTERN_RULES, skipping rules whose literals do
+        not occur in the code and scanning single-line rules only on the lines
+        that contain them. Line numbers come from bisecting the newline
+        offsets instead of recounting from the start of the file.
+        """
         patterns: List[Pattern] = []
+        newlines = [m.start() for m in _NEWLINE.finditer(code)]
         
-        # Dictionary mapping pattern types to their pattern dictionaries
-        pattern_mappings = [
-            # Framework patterns
-            (PatternType.SWIFTUI, r'import\s+SwiftUI'),
-            (PatternType.REALITYKIT, r'import\s+RealityKit'),
-            
-            # UI patterns
-            (PatternType.VIEW, r'struct\s+\w+:\s*View'),
-            (PatternType.REALITY_VIEW, r'RealityView\s*{[^}]*}'),
-            (PatternType.TEXT, r'Text\s*\([^)]*\)'),
-            
-            # Entity patterns
-            (PatternType.MODEL_ENTITY, r'ModelEntity\s*\([^)]*\)'),
-            (PatternType.ENTITY, r'class\s+\w+:\s*Entity'),
-            
-            # State patterns
-            (PatternType.STATE, r'@State\s+(?:private\s+)?var'),
-            (PatternType.OBSERVED_OBJECT, r'@ObservedObject\s+var'),
-            (PatternType.STATE_OBJECT, r'@StateObject\s+var'),
-            
-            # Event System patterns
-            (PatternType.EVENT_SUBSCRIPTION, r'EventSubscription|subscribe\s*\(\s*to:\s*\w+\.?\w*\.self'),
-            (PatternType.EVENT_HANDLING, r'SceneEvents\.Update|handle\w+Event'),
-            (PatternType.EVENT_SYSTEM, r'class\s+\w+:\s*EventSystem'),
-            
-            # Transform patterns
-            (PatternType.TRANSFORM_ACTION, r'\.(move|rotate|scale)\(to:'),
-            (PatternType.TRANSFORM_ANIMATE, r'\.transform\.animate'),
-            (PatternType.TRANSFORM_SEQUENCE, r'\.transformSequence'),
-            (PatternType.TRANSFORM, r'transform\s*=\s*Transform\(|\.transform\s*=|transform\.rotation'),
-            
-            # Spatial patterns
-            (PatternType.POSITION, r'\.position\s*=|\(position:'),
-            (PatternType.SCALE, r'\.scale\s*=|\(scale:'),
-            (PatternType.ROTATION, r'\.rotation\s*=|\(rotation:|simd_quatf\(angle:'),
-            
-            # Gesture patterns
-            (PatternType.DRAG_GESTURE, r'DragGesture\s*\(\s*\)'),
-            (PatternType.TAP_GESTURE, r'TapGesture\s*\(\s*\)'),
-            (PatternType.GESTURE, r'\.gesture\s*\([^)]*\)'),
-            
-            # Animation patterns
-            (PatternType.WITH_ANIMATION, r'withAnimation\s*\([^)]*\)'),
-            (PatternType.ANIMATION, r'\.animation\s*\([^)]*\)'),
-            (PatternType.TRANSITION, r'\.transition\s*\([^)]*\)'),
-            
-            # Lifecycle patterns
-            (PatternType.ON_APPEAR, r'\.onAppear\s*{'),
-            (PatternType.ON_DISAPPEAR, r'\.onDisappear\s*{'),
-            (PatternType.TASK, r'\.task\s*{'),
-            (PatternType.ON_CHANGE, r'\.onChange\s*\([^)]*\)\s*{'),
-            
-            # Interaction patterns
-            (PatternType.ON_TAP_GESTURE, r'\.onTapGesture\s*{'),
-            (PatternType.ON_LONG_PRESS_GESTURE, r'\.onLongPressGesture\s*{'),
-            (PatternType.SIMULTANEOUS_GESTURE, r'\.simultaneousGesture\s*\([^)]*\)'),
-            (PatternType.HIGH_PRIORITY_GESTURE, r'\.highPriorityGesture\s*\([^)]*\)'),
-            
-            # Reality Composer Pro patterns
-            (PatternType.USDZ_LOADING, r'try\s+await\s+Entity\.load\("[^"]+\.usdz"\)'),
-            (PatternType.REALITY_FILE, r'\.reality\s*file\s*reference'),
-            (PatternType.MATERIAL_VARIANTS, r'materialVariants\s*='),
-            (PatternType.ANIMATION_CONTROLLER, r'(AnimationController|availableAnimations)'),
-            (PatternType.REALITY_COMPOSER_IMPORT, r'import\s+RealityComposer'),
-            (PatternType.REALITY_COMPOSER_ASSET, r'\.realityComposerContent'),
-            
-            # Component System patterns
-            (PatternType.COMPONENT_DEFINITION, r'protocol\s+(\w+)Component\s*:\s*Component'),
-            (PatternType.COMPONENT_ACCESS, r'(\w+)\.components\[(\w+)Component\.self\]'),
-            (PatternType.COMPONENT_ADD, r'addComponent\((\w+)\)'),
-            (PatternType.COMPONENT_SYSTEM, r'class\s+(\w+)System\s*:\s*System'),
-            (PatternType.COMPONENT_QUERY, r'components\.query\('),
-            (PatternType.COMPONENT_UPDATE, r'func\s+update\(context:\s*SceneUpdateContext\)'),
-            
-            # RealityKit System patterns
-            (PatternType.SCENE_SYSTEM, r'class\s+\w+:\s*SceneSystem'),
-            (PatternType.SCENE_UPDATE, r'func\s+update\(context:\s*SceneUpdateContext\)'),
-            (PatternType.SCENE_SETUP, r'func\s+setup\(scene:\s*RealityKit\.Scene\)'),
-            (PatternType.ENTITY_SYSTEM, r'class\s+\w+:\s*System'),
-            (PatternType.ENTITY_QUERY, r'scene\.components\.query\('),
-            (PatternType.ENTITY_SUBSCRIPTION, r'scene\.subscribe\('),
-            (PatternType.COMPONENT_REGISTRATION, r'scene\.registerSystem\('),
-            
-            # Entity Action patterns
-            (PatternType.PHYSICS_ACTION, r'\.(applyForce|applyTorque|setVelocity)\('),
-            (PatternType.PHYSICS_CONSTRAINT, r'PhysicsConstraint\('),
-            (PatternType.HIERARCHY_ACTION, r'\.(addChild|removeFromParent|moveToParent)\('),
-            (PatternType.HIERARCHY_QUERY, r'\.(findEntity|findEntities)\('),
-            (PatternType.ANIMATION_ACTION, r'\.(playAnimation|resumeAnimation|pauseAnimation)\('),
-            (PatternType.ANIMATION_CONTROL, r'AnimationController\('),
-            (PatternType.INTERACTION_ACTION, r'\.(enableInteraction|disableInteraction)\('),
-            (PatternType.GESTURE_ACTION, r'\.(addGestureRecognizer|removeGestureRecognizer)\('),
-            
-            # View Attachment patterns
-            (PatternType.VIEW_ATTACH, r'\.attachments\s*{[^}]*}'),
-            (PatternType.VIEW_ENTITY, r'ViewAttachmentEntity\('),
-            (PatternType.VIEW_GEOMETRY, r'\.attachmentGeometry\s*='),
-            (PatternType.ATTACH_TRANSFORM, r'\.transform\s*=\s*Transform3D\('),
-            (PatternType.ATTACH_ORIENTATION, r'\.orientation\s*='),
-            (PatternType.ATTACH_POSITION, r'\.position\s*='),
-            (PatternType.REALITY_VIEW_CONTENT, r'\.content\s*='),
-            (PatternType.REALITY_VIEW_UPDATE, r'\.update\s*{')
-        ]
-        
-        # Detect patterns for each type
-        for pattern_type, pattern_regex in pattern_mappings:
-            matches = re.finditer(pattern_regex, code)
+        for pattern_type, regex, literals, single_line in _COMPILED_RULES:
+            if not any(literal in code for literal in literals):
+                continue
+            if single_line:
+                matches = [match for start, end in _candidate_lines(code, literals, newlines)
+                           for match in regex.finditer(code, start, end)]
+            else:
+                matches = regex.finditer(code)
             for match in matches:
                 start, end = match.span()
                 patterns.append(Pattern(
                     name=pattern_type.value,
                     type=pattern_type,
                     confidence=0.85,
-                    line_number=code[:start].count('\n') + 1,
+                    line_number=bisect_left(newlines, start) + 1,
                     start=start,
                     end=end
                 ))
                 # Only log at debug level for first occurrence of each pattern type
-                if not any(p.type == pattern_type for p in patterns[:-1]):
+                if len(patterns) == 1 or patterns[-2].type != pattern_type:
                     logger.debug(f"Found first {pattern_type.value} pattern")
         
         return patterns
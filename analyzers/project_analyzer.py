@@ -3,6 +3,7 @@ from typing import List, Dict, Optional
 import logging
 import re
 from core.config import TEST_PATTERN_VALIDATION, PATTERN_TYPES
+from core.project_archive import iter_project_files
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -24,15 +25,14 @@ class ProjectAnalyzer:
             logger.error(f"Project path does not exist: {project_path}")
             return {'patterns': patterns}
         
-        # Find all Swift files
-        swift_files = list(project_path.glob('**/*.swift'))
+        # Find all Swift files, reading archive-backed projects straight from the ZIP
+        swift_files = list(iter_project_files(project_path, '*.swift'))
         logger.info(f"Found {len(swift_files)} Swift files")
         
         # First pass: collect all code
         for file_path in swift_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    project_code[file_path] = f.read()
+                project_code[file_path] = file_path.read_text(encoding='utf-8')
             except Exception as e:
                 logger.error(f"Error reading {file_path}: {str(e)}")
         
@@ -6,6 +6,7 @@ import matplotlib.pyplot as plt
 from rich.console import Console
 import logging
 import numpy as np
+from extractors.doc_extractor import TopicNode, build_topic_tree
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -70,6 +71,15 @@ class TopicAnalyzer:
         
         return self.graph
     
+    def topic_trees(self) -> Dict[str, List[TopicNode]]:
+        """Nested topic hierarchy of every extracted page, keyed by page title"""
+        trees = {}
+        for file in self.extracted_dir.glob("extracted_*.json"):
+            with open(file) as f:
+                data = json.load(f)
+            trees[data['title']] = build_topic_tree(data.get('topics', []))
+        return trees
+    
     def visualize_relationships(self, output_file: Path = Path('data/topic_graph.png')):
         """Create a visualization of topic relationships"""
         if not self.graph:
@@ -4,6 +4,19 @@ from typing import List, Optional
 import asyncio
 import json
 from core.scraper import DocumentationScraper
+from core.blob_store import BlobStore, migrate_raw_files
+from core.cache_budget import CacheBudget
+from core.config import (
+    BASE_URLS,
+    CACHE_BUDGET_BYTES,
+    CACHE_EVICTION_POLICY,
+    CRAWL_PAGES_PER_PROCESS,
+    CRAWL_PROCESSES,
+    MAX_CRAWL_DEPTH
+)
+from core.crawl_journal import CrawlJournal
+from core.crawl_supervisor import CrawlSupervisor
+from core.url_sources import DocumentationURLCollector
 import logging
 from rich.console import Console
 from rich.logging import RichHandler
@@ -212,6 +225,125 @@ def clean(
         logger.error(f"Error during cleanup: {str(e)}")
         raise typer.Exit(code=1)
 
+@app.command()
+def crawl(
+    urls: List[str] = typer.Argument(
+        None,
+        help="Seed URLs. If not provided, will use BASE_URLS"
+    ),
+    data_dir: Path = typer.Option(
+        Path("data"),
+        "--data-dir", "-d",
+        help="Data directory holding cache/"
+    ),
+    workers: int = typer.Option(
+        CRAWL_PROCESSES,
+        "--workers", "-w",
+        help="Worker processes, each with its own browser (1 crawls in this process)"
+    ),
+    pages: int = typer.Option(
+        CRAWL_PAGES_PER_PROCESS,
+        "--pages-per-worker",
+        help="Concurrent pages in each worker process"
+    ),
+    depth: int = typer.Option(
+        MAX_CRAWL_DEPTH,
+        "--depth",
+        help="Maximum crawl depth"
+    )
+):
+    """Crawl documentation pages, optionally across several browser processes"""
+    seeds = [(url, 'documentation') for url in (urls or BASE_URLS)]
+    try:
+        if workers > 1:
+            journal = CrawlJournal(data_dir / 'cache' / 'crawl_journal.sqlite3')
+            journal.begin_run()
+            stats = CrawlSupervisor(data_dir, processes=workers, pages_per_process=pages,
+                                    max_depth=depth).run(seeds)
+        else:
+            collector = DocumentationURLCollector(base_dir=data_dir)
+            journal = collector.journal
+            journal.begin_run()
+            stats = asyncio.run(collector.cache_documentation_pages(seeds, max_depth=depth))
+            collector.writer.close()
+        journal.finish_run()
+    except Exception as e:
+        logger.error(f"Error during crawl: {str(e)}")
+        raise typer.Exit(code=1)
+
+    table = Table(title="Crawl Summary")
+    table.add_column("Depth", justify="right", style="cyan")
+    table.add_column("Pages", justify="right", style="green")
+    for page_depth, page_urls in sorted(stats.depth_pages.items()):
+        table.add_row(str(page_depth), str(len(page_urls)))
+    console.print(table)
+    console.print(f"[green]{stats.pages} pages fetched, {stats.resumed} resumed, {stats.failures} failed "
+                  f"in {stats.elapsed:.1f}s ({stats.pages_per_second:.2f} pages/sec)")
+    for url in sorted(stats.failed):
+        console.print(f"[red]- {url}: {stats.errors.get(url, '')}")
+
+@app.command()
+def import_raw(
+    data_dir: Path = typer.Option(
+        Path("data"),
+        "--data-dir", "-d",
+        help="Data directory holding cache/ and debug/"
+    )
+):
+    """Move plain raw HTML and debug dumps into the compressed blob store"""
+    try:
+        store = BlobStore(data_dir / 'cache' / 'blobs')
+        count = migrate_raw_files(data_dir, store)
+        console.print(f"[green]Imported {count} files; blob store now uses "
+                      f"{store.disk_usage() / 1024:.0f} KB "
+                      f"({store.stats['deduplicated']} duplicates skipped)")
+    except Exception as e:
+        logger.error(f"Error importing raw files: {str(e)}")
+        raise typer.Exit(code=1)
+
+@app.command()
+def gc(
+    data_dir: Path = typer.Option(
+        Path("data"),
+        "--data-dir", "-d",
+        help="Data directory holding cache/, debug/ and projects/"
+    ),
+    budget_mb: float = typer.Option(
+        CACHE_BUDGET_BYTES / 1024 / 1024,
+        "--budget-mb",
+        help="Disk budget in megabytes"
+    ),
+    policy: str = typer.Option(
+        CACHE_EVICTION_POLICY,
+        "--policy",
+        help="Eviction order: lru or oldest"
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Only report what would be evicted"
+    )
+):
+    """Evict cached pages, blobs, debug dumps and sample projects down to a disk budget"""
+    try:
+        report = CacheBudget(data_dir, budget=int(budget_mb * 1024 * 1024), policy=policy).collect(dry_run=dry_run)
+    except Exception as e:
+        logger.error(f"Error collecting cache garbage: {str(e)}")
+        raise typer.Exit(code=1)
+
+    if report['evicted']:
+        table = Table(title="Would evict" if dry_run else "Evicted")
+        table.add_column("Entry")
+        for name in report['evicted']:
+            table.add_row(name)
+        console.print(table)
+    console.print(f"[green]{report['total'] / 1024 / 1024:.1f} MB in {report['entries']} entries "
+                  f"({report['pinned']} pinned by the knowledge base); "
+                  f"{'would free' if dry_run else 'freed'} {report['freed'] / 1024 / 1024:.1f} MB, "
+                  f"leaving {report['after'] / 1024 / 1024:.1f} MB of {budget_mb:.1f} MB")
+    if report['over_budget']:
+        console.print("[yellow]Still over budget: pinned entries alone exceed it")
+
 @app.command()
 def analyze_topics(
     input_dir: Path = typer.Option(
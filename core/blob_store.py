@@ -0,0 +1,279 @@
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from utils.logging import logger
+from core.config import BLOB_STORE_DIR, BLOB_COMPRESSION
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency; gzip is always available
+    zstandard = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    meta TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS refs_digest ON refs(digest);
+"""
+
+CODEC_SUFFIXES = {'zstd': '.zst', 'gzip': '.gz'}
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst blobs")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class BlobStore:
+    """Compressed, content-addressed store for raw pages and debug dumps
+
+    Bodies are stored once under ``objects/<sha256[:2]>/<sha256>.zst|.gz`` no
+    matter how many URLs or writers produce them. A SQLite index maps a
+    ``(kind, key)`` reference, such as ``('content', url)`` or
+    ``('debug', 'raw_RealityKit.html')``, to its blob plus optional metadata.
+    """
+
+    def __init__(self, root: Path = BLOB_STORE_DIR, compression: str = BLOB_COMPRESSION):
+        if compression not in CODEC_SUFFIXES:
+            raise ValueError(f"Unknown blob compression: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            compression = 'gzip'
+        self.root = root
+        self.objects_dir = root / 'objects'
+        self.codec = compression
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(root / 'index.sqlite3'), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.stats: Counter = Counter()
+
+    def _object_path(self, digest: str, codec: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}{CODEC_SUFFIXES[codec]}"
+
+    def _find_object(self, digest: str) -> Optional[Tuple[Path, str]]:
+        for codec in (self.codec, *(c for c in CODEC_SUFFIXES if c != self.codec)):
+            path = self._object_path(digest, codec)
+            if path.exists():
+                return path, codec
+        return None
+
+    def put_blob(self, data: Union[str, bytes]) -> str:
+        """Store bytes once and return their SHA-256 digest"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        self.stats['puts'] += 1
+        self.stats['bytes_in'] += len(data)
+        if self._find_object(digest) is not None:
+            self.stats['deduplicated'] += 1
+            return digest
+        self._write_object(digest, data)
+        return digest
+
+    def _write_object(self, digest: str, data: bytes):
+        path = self._object_path(digest, self.codec)
+        path.parent.mkdir(exist_ok=True)
+        compressed = _compress(self.codec, data)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, path)
+        self.stats['bytes_stored'] += len(compressed)
+
+    def get_blob(self, digest: str) -> Optional[bytes]:
+        found = self._find_object(digest)
+        if found is None:
+            return None
+        path, codec = found
+        return _decompress(codec, path.read_bytes())
+
+    def put(self, kind: str, key: str, data: Union[str, bytes], meta: Optional[Dict[str, Any]] = None) -> str:
+        """Store ``data`` and point the ``(kind, key)`` reference at it"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = self.put_blob(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO refs(kind, key, digest, size, meta, updated_at) VALUES(?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(kind, key) DO UPDATE SET digest = excluded.digest, size = excluded.size, "
+                "meta = excluded.meta, updated_at = excluded.updated_at",
+                (kind, key, digest, len(data), json.dumps(meta) if meta is not None else None, time.time())
+            )
+            # A delete of the last other reference may have removed the object since put_blob
+            if self._find_object(digest) is None:
+                self._write_object(digest, data)
+        return digest
+
+    def ref(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return digest, size, meta and updated_at for a reference"""
+        row = self._conn.execute(
+            "SELECT digest, size, meta, updated_at FROM refs WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        if row is None:
+            return None
+        digest, size, meta, updated_at = row
+        return {'digest': digest, 'size': size, 'meta': json.loads(meta) if meta else {}, 'updated_at': updated_at}
+
+    def get(self, kind: str, key: str) -> Optional[bytes]:
+        entry = self.ref(kind, key)
+        return self.get_blob(entry['digest']) if entry else None
+
+    def get_text(self, kind: str, key: str) -> Optional[str]:
+        data = self.get(kind, key)
+        return data.decode('utf-8') if data is not None else None
+
+    def touch(self, kind: str, key: str, at: Optional[float] = None):
+        """Update a reference's timestamp without rewriting its blob"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE refs SET updated_at = ? WHERE kind = ? AND key = ?",
+                (time.time() if at is None else at, kind, key)
+            )
+
+    def delete(self, kind: str, key: str):
+        """Drop a reference; the blob is removed once nothing points at it"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM refs WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM refs WHERE kind = ? AND key = ?", (kind, key))
+            still_used = self._conn.execute(
+                "SELECT 1 FROM refs WHERE digest = ? LIMIT 1", (row[0],)
+            ).fetchone()
+            # Unlinked under the lock, so a concurrent put cannot reference it meanwhile
+            if not still_used:
+                found = self._find_object(row[0])
+                if found is not None:
+                    found[0].unlink(missing_ok=True)
+
+    def refs(self, kind: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+        """Yield (kind, key, digest) for every reference, optionally of one kind"""
+        query = "SELECT kind, key, digest FROM refs"
+        params: Tuple = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        yield from self._conn.execute(query, params).fetchall()
+
+    def total_size(self, kind: str) -> int:
+        """Uncompressed bytes referenced by one kind"""
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM refs WHERE kind = ?", (kind,)).fetchone()
+        return row[0]
+
+    def least_recent(self, kind: str) -> Iterator[Tuple[str, int]]:
+        """Yield (key, size) for one kind, least recently updated first"""
+        yield from self._conn.execute(
+            "SELECT key, size FROM refs WHERE kind = ? ORDER BY updated_at", (kind,)
+        ).fetchall()
+
+    def objects(self) -> Iterator[Tuple[str, Optional[Path], list, float]]:
+        """Yield (digest, object path, [(kind, key), ...], last use) per referenced blob"""
+        grouped: Dict[str, Tuple[list, float]] = {}
+        for kind, key, digest, updated_at in self._conn.execute(
+                "SELECT kind, key, digest, updated_at FROM refs").fetchall():
+            refs, last_used = grouped.get(digest, ([], 0.0))
+            refs.append((kind, key))
+            grouped[digest] = (refs, max(last_used, updated_at))
+        for digest, (refs, last_used) in grouped.items():
+            found = self._find_object(digest)
+            yield digest, found[0] if found else None, refs, last_used
+
+    def orphaned_objects(self) -> Iterator[Path]:
+        """Yield object files no reference points at, e.g. left by an interrupted delete"""
+        referenced = {row[0] for row in self._conn.execute("SELECT DISTINCT digest FROM refs")}
+        for path in self.objects_dir.glob('*/*'):
+            if path.is_file() and path.name.split('.')[0] not in referenced:
+                yield path
+
+    def ingest(self, kind: str, key: str, path: Path, remove: bool = True) -> str:
+        """Move an existing plain file into the store"""
+        digest = self.put(kind, key, path.read_bytes())
+        self.touch(kind, key, path.stat().st_mtime)
+        if remove:
+            path.unlink()
+        return digest
+
+    def disk_usage(self) -> int:
+        """Compressed bytes held in the object directory"""
+        return sum(path.stat().st_size for path in self.objects_dir.rglob('*') if path.is_file())
+
+    def log_stats(self):
+        """Log how much was written, deduplicated and saved by compression"""
+        if not self.stats['puts']:
+            return
+        logger.info(f"Blob store ({self.codec}): {self.stats['puts']} writes, "
+                    f"{self.stats['deduplicated']} deduplicated, {self.stats['bytes_in']} bytes in, "
+                    f"{self.stats['bytes_stored']} bytes written")
+
+    def close(self):
+        self._conn.close()
+
+
+def migrate_raw_files(base_dir: Path, store: BlobStore) -> int:
+    """Move raw pages written before the blob store into it
+
+    Covers the old fetch_content cache (``cache/content/<md5>.html`` with its
+    ``.meta.json``), ``debug/*.html|json`` dumps and the HTML copies in
+    ``cache/documentation``. Cached pages whose metadata is missing are kept
+    under their md5 key, since their URL is unknown. Returns the number of
+    files ingested.
+    """
+    count = 0
+    content_dir = base_dir / 'cache' / 'content'
+    for body_path in sorted(content_dir.glob('*.html')) if content_dir.exists() else []:
+        meta_path = body_path.with_suffix('.meta.json')
+        try:
+            meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        except (json.JSONDecodeError, OSError):
+            meta = {}
+        if 'url' not in meta:
+            store.ingest('content', body_path.stem, body_path)
+            meta_path.unlink(missing_ok=True)
+            count += 1
+            continue
+        store.put('content', meta['url'], body_path.read_bytes(), meta={'validators': meta.get('validators', {})})
+        store.touch('content', meta['url'], body_path.stat().st_mtime)
+        body_path.unlink()
+        meta_path.unlink(missing_ok=True)
+        count += 1
+
+    legacy_dumps = [
+        (base_dir / 'debug', ('*.html', '*.json')),
+        (base_dir / 'cache' / 'documentation', ('*.html',)),
+    ]
+    for directory, patterns in legacy_dumps:
+        if not directory.exists():
+            continue
+        for pattern in patterns:
+            for path in sorted(directory.glob(pattern)):
+                store.ingest('debug', str(path.relative_to(base_dir)), path)
+                count += 1
+
+    logger.info(f"Migrated {count} raw files into {store.root}")
+    return count
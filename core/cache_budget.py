@@ -0,0 +1,253 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import json
+import os
+import shutil
+import time
+from utils.logging import logger
+from core.config import CACHE_BUDGET_BYTES, CACHE_EVICTION_POLICY, CACHE_GC_GRACE
+from core.blob_store import BlobStore
+from core.crawl_journal import CrawlJournal
+from core.project_archive import ARCHIVES_DIRNAME
+
+POLICIES = ('lru', 'oldest')
+
+
+@dataclass
+class CacheEntry:
+    """One evictable unit: a blob, a project directory or a file"""
+    name: str
+    size: int
+    last_access: float
+    created: float
+    pinned: bool = False
+    garbage: bool = False
+    path: Optional[Path] = None
+    remove: Callable[[], None] = field(default=lambda: None, repr=False, compare=False)
+
+
+def _tree_stats(path: Path):
+    """Size, latest access and latest modification of a file or directory tree"""
+    if path.is_file():
+        stat = path.stat()
+        return stat.st_size, max(stat.st_atime, stat.st_mtime), stat.st_mtime
+    size, accessed, modified = 0, 0.0, 0.0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            size += stat.st_size
+            accessed = max(accessed, stat.st_atime, stat.st_mtime)
+            modified = max(modified, stat.st_mtime)
+    if not modified:  # Empty directory
+        modified = accessed = path.stat().st_mtime
+    return size, accessed, modified
+
+
+def _remove_path(path: Path) -> Callable[[], None]:
+    def remove():
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+    return remove
+
+
+def _remove_refs(store: BlobStore, refs: List[Tuple[str, str]]) -> Callable[[], None]:
+    def remove():
+        for kind, key in refs:
+            store.delete(kind, key)
+    return remove
+
+
+def knowledge_references(knowledge_dir: Path) -> Set[Path]:
+    """Resolved file paths the knowledge base points at (pattern files and examples)"""
+    references: Set[Path] = set()
+    for path in knowledge_dir.glob('*.json') if knowledge_dir.exists() else []:
+        try:
+            data = json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError):
+            continue
+        for pattern in data.values() if isinstance(data, dict) else []:
+            if not isinstance(pattern, dict):
+                continue
+            files = list(pattern.get('files', []))
+            files += [example.get('file') for example in pattern.get('examples', []) if isinstance(example, dict)]
+            references.update(Path(file).resolve() for file in files if file)
+    return references
+
+
+class CacheBudget:
+    """Keep data/cache, data/debug and data/projects under a byte budget
+
+    Entries are blob store objects (with every reference to them), sample
+    project directories, their retained archives and partial downloads, and
+    debug dumps. When the total exceeds ``budget``, entries are evicted least
+    recently used first (``lru``) or oldest first (``oldest``). Projects
+    holding files the knowledge base refers to are pinned; interrupted
+    downloads, extractions and unreferenced blobs older than ``grace`` seconds
+    are always removed. Evicted projects are dropped from the samples cache
+    and queued again in the crawl journal, so the next run downloads them.
+    """
+
+    def __init__(self, base_dir: Path = Path('data'), budget: int = CACHE_BUDGET_BYTES,
+                 policy: str = CACHE_EVICTION_POLICY, knowledge_dir: Optional[Path] = None,
+                 grace: float = CACHE_GC_GRACE):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r} (expected one of {', '.join(POLICIES)})")
+        self.base_dir = base_dir
+        self.budget = budget
+        self.policy = policy
+        self.knowledge_dir = knowledge_dir or base_dir / 'knowledge'
+        self.grace = grace
+        self._store: Optional[BlobStore] = None
+
+    def _blob_entries(self) -> Iterable[CacheEntry]:
+        blob_dir = self.base_dir / 'cache' / 'blobs'
+        if not (blob_dir / 'index.sqlite3').exists():
+            return
+        if self._store is None:
+            self._store = BlobStore(blob_dir)
+        store = self._store
+        for digest, path, refs, last_used in store.objects():
+            if path is None:
+                continue
+            stat = path.stat()
+            kinds = sorted({kind for kind, _ in refs})
+            yield CacheEntry(
+                name=f"blob {digest[:12]} ({', '.join(kinds)}, {len(refs)} refs)",
+                size=stat.st_size, last_access=last_used, created=stat.st_mtime,
+                remove=_remove_refs(store, refs)
+            )
+        for path in store.orphaned_objects():
+            stat = path.stat()
+            if time.time() - stat.st_mtime >= self.grace:
+                yield CacheEntry(name=f"unreferenced blob {path.name}", size=stat.st_size,
+                                 last_access=stat.st_mtime, created=stat.st_mtime,
+                                 garbage=True, remove=_remove_path(path))
+
+    def _path_entries(self, directory: Path, label: str, pinned_paths: Set[Path] = frozenset(),
+                      pattern: str = '*') -> Iterable[CacheEntry]:
+        for path in sorted(directory.glob(pattern)) if directory.exists() else []:
+            if path.name in ('.downloads', ARCHIVES_DIRNAME):
+                continue
+            size, accessed, modified = _tree_stats(path)
+            resolved = path.resolve()
+            garbage = path.name.endswith('.extracting') and time.time() - modified >= self.grace
+            yield CacheEntry(
+                name=f"{label} {path.name}", size=size, last_access=accessed, created=modified,
+                pinned=any(ref == resolved or resolved in ref.parents for ref in pinned_paths),
+                garbage=garbage, path=path, remove=_remove_path(path)
+            )
+
+    def entries(self) -> List[CacheEntry]:
+        """Every evictable entry with its size, last access and pin state"""
+        pinned_paths = knowledge_references(self.knowledge_dir)
+        entries = list(self._blob_entries())
+        projects = list(self._path_entries(self.base_dir / 'projects', 'project', pinned_paths))
+        entries += projects
+        # A retained archive is pinned with its project, which may be read straight from it
+        archives_dir = self.base_dir / 'projects' / ARCHIVES_DIRNAME
+        pinned_archives = {
+            (archives_dir / f"{entry.path.name}.zip").resolve() for entry in projects if entry.pinned
+        }
+        entries += self._path_entries(archives_dir, 'archive', pinned_archives, pattern='*.zip')
+        entries += self._path_entries(self.base_dir / 'projects' / '.downloads', 'download')
+        entries += self._path_entries(self.base_dir / 'debug', 'debug')
+        return entries
+
+    def plan(self, entries: Optional[List[CacheEntry]] = None) -> List[CacheEntry]:
+        """Entries to evict: garbage first, then by policy until the budget is met"""
+        entries = self.entries() if entries is None else entries
+        evict = [entry for entry in entries if entry.garbage]
+        remaining = sum(entry.size for entry in entries) - sum(entry.size for entry in evict)
+        key = (lambda entry: entry.last_access) if self.policy == 'lru' else (lambda entry: entry.created)
+        for entry in sorted((e for e in entries if not e.garbage and not e.pinned), key=key):
+            if remaining <= self.budget:
+                break
+            evict.append(entry)
+            remaining -= entry.size
+        return evict
+
+    def collect(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Evict down to the budget (or only report what would go) and return a summary"""
+        try:
+            entries = self.entries()
+            evict = self.plan(entries)
+            if not dry_run:
+                evicted_projects = []
+                for entry in evict:
+                    try:
+                        entry.remove()
+                    except OSError as e:
+                        logger.error(f"Could not evict {entry.name}: {str(e)}")
+                        continue
+                    if entry.name.startswith('project '):
+                        evicted_projects.append(entry.path)
+                if evicted_projects:
+                    self._forget_projects(evicted_projects)
+        finally:
+            self.close()
+        total = sum(entry.size for entry in entries)
+        freed = sum(entry.size for entry in evict)
+        report = {
+            'total': total,
+            'budget': self.budget,
+            'after': total - freed,
+            'freed': freed,
+            'entries': len(entries),
+            'pinned': sum(1 for entry in entries if entry.pinned),
+            'evicted': [entry.name for entry in evict],
+            'over_budget': total - freed > self.budget,
+            'dry_run': dry_run,
+        }
+        logger.info(f"Cache GC{' (dry run)' if dry_run else ''}: {total / 1024 / 1024:.1f} MB in "
+                    f"{len(entries)} entries, budget {self.budget / 1024 / 1024:.1f} MB, "
+                    f"{'would free' if dry_run else 'freed'} {freed / 1024 / 1024:.1f} MB "
+                    f"from {len(evict)} entries ({report['pinned']} pinned)")
+        if report['over_budget']:
+            logger.warning("Cache is still over budget; pinned entries alone exceed it")
+        return report
+
+    def _forget_projects(self, project_dirs: List[Path]):
+        """Drop evicted projects from the samples cache and queue their URLs again
+
+        Otherwise the next run still sees them as downloaded and extracted
+        and analyzes a directory that no longer exists.
+        """
+        evicted = {path.resolve() for path in project_dirs}
+        samples_cache = self.base_dir / 'cache' / 'discovered_samples.json'
+        try:
+            cache_data = json.loads(samples_cache.read_text()) if samples_cache.exists() else {}
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Could not read samples cache {samples_cache}: {str(e)}")
+            cache_data = {}
+        
+        urls, kept = set(), []
+        for sample in cache_data.get('samples', []):
+            local_path = sample.get('local_path')
+            if local_path and Path(local_path).resolve() in evicted:
+                urls.update(url for url in (sample.get('url'), sample.get('download_url')) if url)
+            else:
+                kept.append(sample)
+        if not urls:
+            return
+        cache_data['samples'] = kept
+        samples_cache.write_text(json.dumps(cache_data, indent=2))
+        
+        journal_path = self.base_dir / 'cache' / 'crawl_journal.sqlite3'
+        if journal_path.exists():
+            journal = CrawlJournal(journal_path)
+            try:
+                journal.requeue(urls)
+            finally:
+                journal.close()
+        logger.info(f"Queued {len(urls)} evicted sample URLs for download on the next run")
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 
 # Configuration settings
 TESTING_MODE = False  # Set to False for full analysis
@@ -10,12 +11,74 @@ TEST_PATTERN_VALIDATION = True  # Validate patterns during test runs
 SKIP_URL_DISCOVERY = False  # Set to False to enable URL discovery
 PAGE_TIMEOUT = 60000  # Increase timeout to 60 seconds
 
+# HTTP client settings
+HTTP_CONNECTION_LIMIT = 32  # Total pooled connections in the shared session
+HTTP_CONNECTIONS_PER_HOST = 8  # Pooled connections per host
+HTTP_RATE_PER_HOST = 5.0  # Requests per second allowed per host (0 disables limiting)
+HTTP_BURST_PER_HOST = 10  # Token bucket capacity per host
+HTTP_MAX_RETRIES = 3  # Retries for connection errors, 429 and 5xx responses
+HTTP_BACKOFF_BASE = 0.5  # Seconds; retry delays are drawn from [0, base * 2**attempt]
+HTTP_BACKOFF_MAX = 30.0  # Upper bound for a single retry delay in seconds
+MAX_CONCURRENT_DOWNLOADS = 4  # Sample URLs processed at once by process_urls_concurrent
+
 # Cache settings
 CACHE_DURATION = 24 * 60 * 60  # 24 hours in seconds
+RESPONSE_CACHE_ENABLED = True  # Share one GET response cache between HttpClient and Playwright pages
+RESPONSE_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU cap on (uncompressed) cached response bytes
+RESPONSE_CACHE_MAX_ENTRY = 5 * 1024 * 1024  # Larger responses (e.g. sample archives) bypass the cache
 FORCE_DOWNLOAD = True  # Force re-download of documentation
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read per chunk when streaming sample archives
+ARCHIVE_EXTRACT_MODE = "selective"  # Options: "selective", "lazy" (read from the ZIP), "full"
+ARCHIVE_EXTRACT_EXTENSIONS = ['.swift']  # File types extracted in selective mode
+BLOB_STORE_DIR = Path("data/cache/blobs")  # Content-addressed store for raw pages and debug dumps
+BLOB_COMPRESSION = "zstd"  # Options: "zstd" (needs the zstandard package, else gzip), "gzip"
+HTML_PARSER = "lxml"  # BeautifulSoup backend: "lxml" (needs the lxml package, else html.parser), "html.parser"
+WRITE_QUEUE_SIZE = 256  # Pending cache/debug writes before crawl coroutines wait on disk
+EXTRACTION_WORKERS = os.cpu_count() or 1  # Processes parsing and extracting fetched pages (0 extracts inline)
+EXTRACTION_QUEUE_SIZE = None  # Fetched pages held for extraction before the next fetch waits (None: 4 per worker)
+CACHE_BUDGET_BYTES = 10 * 1024 * 1024 * 1024  # Disk budget for data/cache, data/debug and data/projects
+CACHE_EVICTION_POLICY = "lru"  # Options: "lru" (least recently used first), "oldest" (oldest written first)
+CACHE_GC_GRACE = 60 * 60  # Seconds before partial downloads/extractions and unreferenced blobs count as garbage
+CACHE_GC_AFTER_RUN = True  # Enforce CACHE_BUDGET_BYTES at the end of run_scraper
+INDEX_COMPACT_EVERY = 1000  # Documentation index log entries appended between snapshot compactions
 
 # Documentation crawling settings
 MAX_CRAWL_DEPTH = 3  # Maximum depth for documentation page crawling
+MAX_CONCURRENT_PAGES = 6  # Browser pages processed in parallel during discovery
+CRAWL_WORKERS = 4  # Concurrent workers draining each depth of the crawl frontier
+MAX_PAGES_PER_DEPTH = 500  # Cap on pages fetched at a single crawl depth (None for no limit)
+CRAWL_PROCESSES = 1  # Worker processes for `crawl --workers`, each with its own browser (1 crawls in-process)
+CRAWL_PAGES_PER_PROCESS = 2  # Concurrent pages per crawl worker process
+CRAWL_LEASE_ATTEMPTS = 3  # Times a URL is handed out again after its worker process died
+CRAWL_PROGRESS_INTERVAL = 5.0  # Seconds between progress reports from the crawl supervisor
+FETCH_STRATEGIES = ['json', 'html', 'browser']  # Tried in order: DocC JSON, static HTML, Playwright
+REQUIRED_DOCUMENTATION_SELECTORS = ['title']  # DOCUMENTATION_SELECTORS keys static HTML must contain
+SITEMAP_URLS = ["https://developer.apple.com/sitemap.xml"]  # Sitemaps (or indexes) read by incremental re-crawls
+SITEMAP_MAX_FILES = 200  # Upper bound on sitemap files fetched while following sitemap indexes
+BLOCK_RESOURCES = True  # Abort page resources the DOM extraction does not need
+BLOCKED_RESOURCE_TYPES = ['image', 'media', 'font', 'stylesheet']  # Playwright resource types aborted
+BLOCKED_HOSTS = [  # Analytics/third-party hosts aborted, subdomains included
+    'metrics.apple.com',
+    'securemetrics.apple.com',
+    'xp.apple.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'omtrdc.net',
+    'demdex.net',
+    'everesttech.net'
+]
+ESTIMATED_BANDWIDTH = 2 * 1024 * 1024  # Bytes/sec used to estimate the time blocking saves
+READINESS_SELECTORS = ['h1', '.abstract', '.declaration', 'pre code']  # Any of these marks a rendered page
+READINESS_TIMEOUT = 10000  # Milliseconds to wait for a URL pattern with no readiness history
+READINESS_MIN_TIMEOUT = 1500  # Lower bound in milliseconds for learned readiness timeouts
+READINESS_TIMEOUT_FACTOR = 3.0  # Learned timeout = typical readiness time for the pattern * factor
+TRANSPORT_MODE = "live"  # Options: "live", "record" (capture to TRANSPORT_ARCHIVE), "replay" (serve offline)
+TRANSPORT_ARCHIVE = Path("data/cache/transport.har")  # HAR archive written by record mode, read by replay mode
+REPLAY_LATENCY = 0.0  # Seconds of latency injected into every replayed response
+REPLAY_LATENCY_JITTER = 0.0  # Extra uniform random seconds added per replayed response
+REPLAY_RECORDED_TIMING = False  # Also wait as long as each response originally took
+TRANSPORT_MAX_BODY = 20 * 1024 * 1024  # Larger responses (e.g. sample archives) are not recorded
 DOCUMENTATION_CACHE_DIR = Path("data/documentation_cache")
 DOCUMENTATION_CONTENT_DIR = DOCUMENTATION_CACHE_DIR / "content"
 DOCUMENTATION_CONTENT_CACHE = DOCUMENTATION_CACHE_DIR / "content_cache.json"
@@ -0,0 +1,214 @@
+from datetime import datetime, UTC
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import sqlite3
+import threading
+from utils.logging import logger
+
+
+class CrawlState(str, Enum):
+    """Lifecycle of a URL in the crawl journal"""
+    QUEUED = "queued"
+    FETCHED = "fetched"
+    EXTRACTED = "extracted"
+    FAILED = "failed"
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    category TEXT,
+    state TEXT NOT NULL,
+    depth INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    lastmod TEXT,
+    children TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_id INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_state ON urls(state);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class CrawlJournal:
+    """SQLite-backed journal of every URL's crawl state
+
+    Each URL is recorded with its category, depth, state (queued, fetched,
+    extracted, failed), content hash and child pages. Runs are numbered; a run
+    that never called ``finish_run`` is resumed by the next ``begin_run``, so
+    work already extracted in that run is not repeated after a crash.
+    """
+
+    def __init__(self, db_path: Path = Path('data/cache/crawl_journal.sqlite3')):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(urls)")}
+        if 'lastmod' not in columns:
+            self._conn.execute("ALTER TABLE urls ADD COLUMN lastmod TEXT")
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    @property
+    def run_id(self) -> int:
+        return int(self._get_meta('run_id') or 0)
+
+    @property
+    def active(self) -> bool:
+        """True while a run is in progress (begun and not finished)"""
+        return self._get_meta('run_status') == 'running'
+
+    def begin_run(self) -> bool:
+        """Start a run, resuming the previous one if it did not finish
+
+        Returns:
+            True when an interrupted run is being resumed
+        """
+        resuming = self.active
+        if not resuming:
+            self._set_meta('run_id', str(self.run_id + 1))
+            self._set_meta('run_status', 'running')
+        logger.info(f"{'Resuming' if resuming else 'Starting'} crawl run {self.run_id}: {self.counts()}")
+        return resuming
+
+    def finish_run(self):
+        """Mark the current run complete so the next run starts fresh"""
+        self._set_meta('run_status', 'complete')
+        self._set_meta('run_finished_at', datetime.now(UTC).isoformat())
+
+    def enqueue(self, url: str, category: Optional[str] = None, depth: int = 0):
+        """Record a URL as queued unless the journal already knows it"""
+        self.enqueue_many([url], category, depth)
+
+    def enqueue_many(self, urls: Iterable[str], category: Optional[str] = None, depth: int = 0):
+        now = datetime.now(UTC).isoformat()
+        run_id = self.run_id
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls(url, category, state, depth, run_id, updated_at) VALUES(?, ?, ?, ?, ?, ?)",
+                [(url, category, CrawlState.QUEUED.value, depth, run_id, now) for url in urls]
+            )
+
+    def mark(self, url: str, state: CrawlState, content_hash: Optional[str] = None,
+             children: Optional[List[str]] = None, error: Optional[str] = None,
+             category: Optional[str] = None, depth: Optional[int] = None, lastmod: Optional[str] = None):
+        """Move a URL to ``state``, recording whatever details are known"""
+        now = datetime.now(UTC).isoformat()
+        run_id = self.run_id
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO urls(url, category, state, depth, run_id, updated_at) VALUES(?, ?, ?, ?, ?, ?)",
+                (url, category, state.value, depth or 0, run_id, now)
+            )
+            self._conn.execute(
+                """UPDATE urls SET
+                       state = ?,
+                       content_hash = COALESCE(?, content_hash),
+                       lastmod = COALESCE(?, lastmod),
+                       children = COALESCE(?, children),
+                       error = ?,
+                       category = COALESCE(?, category),
+                       depth = COALESCE(?, depth),
+                       attempts = attempts + ?,
+                       run_id = ?,
+                       updated_at = ?
+                   WHERE url = ?""",
+                (state.value, content_hash, lastmod, json.dumps(children) if children is not None else None,
+                 error, category, depth, 1 if state in (CrawlState.FETCHED, CrawlState.FAILED) else 0,
+                 run_id, now, url)
+            )
+
+    def requeue(self, urls: Iterable[str]):
+        """Move URLs back to queued so the next run processes them again"""
+        now = datetime.now(UTC).isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE urls SET state = ?, content_hash = NULL, updated_at = ? WHERE url = ?",
+                [(CrawlState.QUEUED.value, now, url) for url in urls]
+            )
+
+    def set_lastmod(self, url: str, lastmod: str):
+        """Record a sitemap lastmod without changing the URL's state"""
+        with self._lock:
+            self._conn.execute("UPDATE urls SET lastmod = ? WHERE url = ?", (lastmod, url))
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the journal row for a URL as a dict"""
+        cursor = self._conn.execute("SELECT * FROM urls WHERE url = ?", (url,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        entry = dict(zip([col[0] for col in cursor.description], row))
+        entry['children'] = json.loads(entry['children']) if entry['children'] else []
+        return entry
+
+    def is_done(self, url: str, current_run: bool = True) -> bool:
+        """True if the URL was extracted (in this run, unless current_run is False)"""
+        row = self._conn.execute("SELECT state, run_id FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None or row[0] != CrawlState.EXTRACTED.value:
+            return False
+        return not current_run or row[1] == self.run_id
+
+    def urls(self, state: Optional[CrawlState] = None, category: Optional[str] = None) -> Set[str]:
+        query = "SELECT url FROM urls WHERE 1 = 1"
+        params = []
+        if state is not None:
+            query += " AND state = ?"
+            params.append(state.value)
+        if category is not None:
+            query += " AND category = ?"
+            params.append(category)
+        return {row[0] for row in self._conn.execute(query, params)}
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    def import_legacy_url_cache(self, url_cache: Path):
+        """One-time import of processed_urls from the old url_cache.json"""
+        if self._get_meta('legacy_url_cache_imported') or not url_cache.exists():
+            return
+        try:
+            processed = json.loads(url_cache.read_text()).get('processed_urls', [])
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Could not import legacy URL cache {url_cache}: {str(e)}")
+            processed = []
+        for url in processed:
+            self.mark(url, CrawlState.EXTRACTED)
+        self._set_meta('legacy_url_cache_imported', datetime.now(UTC).isoformat())
+        if processed:
+            logger.info(f"Imported {len(processed)} processed URLs from {url_cache}")
+
+    def reset(self):
+        """Forget all URLs and runs"""
+        with self._lock:
+            self._conn.execute("DELETE FROM urls")
+            self._conn.execute("DELETE FROM meta WHERE key IN ('run_status', 'run_finished_at')")
+            self._conn.execute(
+                "INSERT INTO meta(key, value) VALUES('legacy_url_cache_imported', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (datetime.now(UTC).isoformat(),)
+            )
+
+    def close(self):
+        self._conn.close()
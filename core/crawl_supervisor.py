@@ -0,0 +1,182 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import asyncio
+import multiprocessing
+import queue as queue_module
+import time
+from utils.logging import logger
+from core.config import (
+    CRAWL_PAGES_PER_PROCESS,
+    CRAWL_PROCESSES,
+    CRAWL_PROGRESS_INTERVAL,
+    MAX_CRAWL_DEPTH,
+    MAX_PAGES_PER_DEPTH
+)
+from core.crawler import CrawlStats
+from core.doc_index import DocumentationIndex
+from core.transport import configure_transport, get_transport
+from core.url_sources import DocumentationURLCollector
+from core.work_queue import WorkQueue
+
+
+def queue_path(base_dir: Path) -> Path:
+    return base_dir / 'cache' / 'crawl_queue.sqlite3'
+
+
+def run_worker(worker: str, base_dir: Path, max_depth: int,
+               max_pages_per_depth: Union[int, Dict[int, int], None], pages: int,
+               transport: Optional[Dict[str, Any]], results):
+    """Worker process entry point: crawl from the shared queue with a private browser"""
+    if transport is not None:
+        configure_transport(**transport)
+    collector = DocumentationURLCollector(base_dir=base_dir)
+    work = WorkQueue(queue_path(base_dir), max_depth=max_depth, max_pages_per_depth=max_pages_per_depth)
+    try:
+        stats = asyncio.run(collector.cache_documentation_queue(work, worker, pages=pages))
+        results.put((worker, stats))
+    finally:
+        collector.writer.close()
+        work.close()
+
+
+class CrawlSupervisor:
+    """Run the documentation crawl across worker processes, one browser each
+
+    Seeds go into a WorkQueue in ``data/cache``; each of ``processes`` workers
+    launches its own Chromium and leases pages from it with
+    ``pages_per_process`` concurrent pages, writing to the shared blob store,
+    journal and index log. The supervisor logs queue progress, hands the
+    leases of a worker that died back out (restarting it while work remains),
+    then merges the workers' statistics and compacts the index.
+    """
+
+    def __init__(self, base_dir: Path = Path('data'), processes: int = CRAWL_PROCESSES,
+                 pages_per_process: int = CRAWL_PAGES_PER_PROCESS, max_depth: int = MAX_CRAWL_DEPTH,
+                 max_pages_per_depth: Union[int, Dict[int, int], None] = MAX_PAGES_PER_DEPTH,
+                 progress_interval: float = CRAWL_PROGRESS_INTERVAL, max_restarts: Optional[int] = None):
+        self.base_dir = base_dir
+        self.processes = max(1, processes)
+        self.pages_per_process = max(1, pages_per_process)
+        self.max_depth = max_depth
+        self.max_pages_per_depth = max_pages_per_depth
+        self.progress_interval = progress_interval
+        self.max_restarts = self.processes if max_restarts is None else max_restarts
+        self.restarts = 0
+        # Spawned rather than forked: Playwright and SQLite handles must not cross a fork
+        self._context = multiprocessing.get_context('spawn')
+
+    def _transport_options(self) -> Optional[Dict[str, Any]]:
+        """Replay settings for the workers; recording needs a single process"""
+        transport = get_transport()
+        if transport.recording:
+            raise ValueError("Recording a transport archive needs a single crawl process")
+        if not transport.replaying:
+            return None
+        return {'mode': 'replay', 'archive_path': transport.archive.path, 'latency': transport.latency,
+                'jitter': transport.jitter, 'recorded_timing': transport.recorded_timing}
+
+    def _start(self, worker: str, transport: Optional[Dict[str, Any]], results):
+        process = self._context.Process(
+            target=run_worker, name=worker, daemon=True,
+            args=(worker, self.base_dir, self.max_depth, self.max_pages_per_depth,
+                  self.pages_per_process, transport, results)
+        )
+        process.start()
+        logger.info(f"Started crawl {worker} (pid {process.pid})")
+        return process
+
+    def run(self, seeds: Iterable[Tuple[str, str]]) -> CrawlStats:
+        """Crawl from (url, category) seeds and return the merged statistics"""
+        transport = self._transport_options()
+        work = WorkQueue(queue_path(self.base_dir), max_depth=self.max_depth,
+                         max_pages_per_depth=self.max_pages_per_depth)
+        work.reset()
+        by_category: Dict[str, list] = {}
+        for url, category in seeds:
+            by_category.setdefault(category, []).append(url)
+        for category, urls in by_category.items():
+            work.push_many(urls, category, depth=0)
+
+        stats = CrawlStats()
+        results = self._context.Queue()
+        workers = {f"worker-{n}": self._start(f"worker-{n}", transport, results) for n in range(self.processes)}
+        last_progress = time.monotonic()
+        try:
+            while workers:
+                try:
+                    worker, worker_stats = results.get(timeout=0.5)
+                    self._merge(stats, worker_stats)
+                except queue_module.Empty:
+                    pass
+                for worker, process in list(workers.items()):
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    del workers[worker]
+                    if process.exitcode == 0:
+                        continue
+                    logger.error(f"Crawl {worker} exited with code {process.exitcode}")
+                    work.release(worker)
+                    if not work.drained() and self.restarts < self.max_restarts:
+                        self.restarts += 1
+                        replacement = f"{worker}.{self.restarts}"
+                        workers[replacement] = self._start(replacement, transport, results)
+                if time.monotonic() - last_progress >= self.progress_interval:
+                    last_progress = time.monotonic()
+                    self._log_progress(work, stats)
+            # Statistics put just before a worker exited
+            while True:
+                try:
+                    worker, worker_stats = results.get_nowait()
+                except queue_module.Empty:
+                    break
+                self._merge(stats, worker_stats)
+        finally:
+            for process in workers.values():
+                process.terminate()
+                process.join()
+            for worker in workers:
+                work.release(worker, reason='crawl interrupted')
+
+        pending = work.counts().get('pending', 0)
+        if pending:
+            logger.warning(f"{pending} queued pages were not crawled: every worker exited "
+                           f"and the restart budget ({self.max_restarts}) is spent")
+        # Leases abandoned after the restart budget ran out count as failures
+        for url, error in work.failures().items():
+            stats.failed.add(url)
+            stats.errors.setdefault(url, error)
+        stats.finished_at = time.monotonic()
+        work.close()
+
+        # Fold every worker's index log entries into one snapshot
+        index = DocumentationIndex(self.base_dir / 'cache' / 'documentation_content.json')
+        index.load().checkpoint()
+        self._log_progress(None, stats)
+        return stats
+
+    @staticmethod
+    def _merge(stats: CrawlStats, worker_stats: CrawlStats):
+        stats.pages += worker_stats.pages
+        stats.resumed += worker_stats.resumed
+        stats.skipped += worker_stats.skipped
+        stats.unchanged += worker_stats.unchanged
+        stats.failed |= worker_stats.failed
+        stats.errors.update(worker_stats.errors)
+        stats.changed |= worker_stats.changed
+        for depth, urls in worker_stats.depth_pages.items():
+            stats.depth_pages[depth] |= urls
+
+    def _log_progress(self, work: Optional[WorkQueue], stats: CrawlStats):
+        if work is not None:
+            counts = work.counts()
+            done = counts.get('done', 0)
+            logger.info(f"Crawl progress: {done} done, {counts.get('failed', 0)} failed, "
+                        f"{counts.get('leased', 0)} in flight, {counts.get('pending', 0)} pending "
+                        f"({done / stats.elapsed:.2f} pages/sec across {self.processes} processes)")
+            return
+        logger.info(f"Crawl finished: {stats.pages} pages, {stats.resumed} resumed, {stats.failures} failed "
+                    f"in {stats.elapsed:.1f}s ({stats.pages_per_second:.2f} pages/sec, "
+                    f"{self.processes} processes, {self.restarts} restarts)")
+        for url, error in sorted(stats.errors.items()):
+            logger.debug(f"  failed {url}: {error}")
@@ -0,0 +1,229 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+import hashlib
+import json
+import time
+from playwright.async_api import Browser, Page
+from utils.logging import logger
+from core.config import MAX_CRAWL_DEPTH, CRAWL_WORKERS, MAX_PAGES_PER_DEPTH
+from core.page_pool import PagePool
+from core.crawl_journal import CrawlJournal, CrawlState
+from core.resource_blocker import ResourceBlocker
+from core.work_queue import WorkQueue
+
+# (page, url, category) -> extracted content dict with a 'child_pages' list
+PageHandler = Callable[[Page, str, str], Awaitable[Dict[str, Any]]]
+
+
+def content_hash(content: Optional[Dict[str, Any]]) -> str:
+    """Stable SHA-256 of extracted page content"""
+    return hashlib.sha256(json.dumps(content or {}, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class CrawlStats:
+    """Counters collected while a crawl is running"""
+    pages: int = 0
+    resumed: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    failed: Set[str] = field(default_factory=set)
+    errors: Dict[str, str] = field(default_factory=dict)
+    changed: Set[str] = field(default_factory=set)
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    depth_pages: Dict[int, Set[str]] = field(default_factory=lambda: defaultdict(set))
+
+    @property
+    def failures(self) -> int:
+        return len(self.failed)
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 1e-9)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed
+
+
+class DocumentationCrawler:
+    """Breadth-first documentation crawl engine sharing one browser
+
+    Each depth level of the frontier is drained by ``workers`` concurrent tasks
+    borrowing pages from a PagePool before the next level is scheduled, so
+    every page is visited at its shortest depth and per-depth limits hold.
+    With a journal, page states are checkpointed as they change and pages
+    already extracted in the active run are replayed from it instead of
+    being fetched again.
+    """
+
+    def __init__(self, handler: PageHandler, workers: int = CRAWL_WORKERS,
+                 max_depth: int = MAX_CRAWL_DEPTH,
+                 max_pages_per_depth: Union[int, Dict[int, int], None] = MAX_PAGES_PER_DEPTH,
+                 journal: Optional[CrawlJournal] = None,
+                 blocker: Optional[ResourceBlocker] = None):
+        self.handler = handler
+        self.journal = journal
+        self.blocker = blocker
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.max_pages_per_depth = max_pages_per_depth
+        self.visited: Set[str] = set()
+        self.stats = CrawlStats()
+
+    def _depth_limit(self, depth: int) -> Optional[int]:
+        """Return the page cap for a depth, or None when unlimited"""
+        if isinstance(self.max_pages_per_depth, dict):
+            return self.max_pages_per_depth.get(depth)
+        return self.max_pages_per_depth
+
+    async def crawl(self, browser: Browser, seeds: Iterable[Tuple[str, str]]) -> CrawlStats:
+        """Crawl from (url, category) seeds until the frontier or depth budget is exhausted"""
+        self.stats = CrawlStats()
+        frontier: List[Tuple[str, str]] = []
+        for url, category in seeds:
+            if url not in self.visited:
+                self.visited.add(url)
+                frontier.append((url, category))
+        if self.journal is not None:
+            for url, category in frontier:
+                self.journal.enqueue(url, category, depth=0)
+
+        async with PagePool(browser, size=self.workers, blocker=self.blocker) as pool:
+            depth = 0
+            while frontier and depth <= self.max_depth:
+                limit = self._depth_limit(depth)
+                if limit is not None and len(frontier) > limit:
+                    logger.debug(f"Depth {depth}: limiting frontier from {len(frontier)} to {limit} pages")
+                    self.stats.skipped += len(frontier) - limit
+                    frontier = frontier[:limit]
+
+                logger.info(f"Crawling depth {depth}/{self.max_depth}: {len(frontier)} pages")
+                frontier = await self._crawl_level(pool, frontier, depth)
+                depth += 1
+
+            if frontier:
+                logger.debug(f"Reached max depth ({self.max_depth}) with {len(frontier)} pages unvisited")
+
+        self.stats.finished_at = time.monotonic()
+        self._log_stats()
+        return self.stats
+
+    async def _crawl_level(self, pool: PagePool, level: List[Tuple[str, str]], depth: int) -> List[Tuple[str, str]]:
+        """Process one depth level and return the next frontier"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in level:
+            queue.put_nowait(item)
+        next_level: List[Tuple[str, str]] = []
+
+        async def worker():
+            while True:
+                try:
+                    url, category = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                children = await self._visit(pool, url, category, depth)
+                new_children = [child_url for child_url in children if child_url not in self.visited]
+                self.visited.update(new_children)
+                next_level.extend((child_url, category) for child_url in new_children)
+                if self.journal is not None and new_children:
+                    self.journal.enqueue_many(new_children, category, depth=depth + 1)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(level)))))
+        return next_level
+
+    async def _visit(self, pool: PagePool, url: str, category: str, depth: int) -> List[str]:
+        """Fetch a single page and return its child page URLs"""
+        if self.journal is not None and self.journal.active and self.journal.is_done(url):
+            entry = self.journal.get(url)
+            logger.debug(f"Resuming past already extracted page: {url}")
+            self.stats.resumed += 1
+            self.stats.depth_pages[depth].add(url)
+            return entry['children']
+
+        try:
+            logger.info(f"\nCaching documentation page ({category}) [Depth {depth}/{self.max_depth}]: {url}")
+            async with pool.page() as page:
+                content = await self.handler(page, url, category)
+            self.stats.pages += 1
+            self.stats.depth_pages[depth].add(url)
+            children = content.get('child_pages', []) if content else []
+            if self.journal is not None:
+                self._record_extracted(url, content, children, category, depth)
+            return children
+        except Exception as e:
+            self.stats.failed.add(url)
+            self.stats.errors[url] = str(e)
+            logger.error(f"Error caching documentation page {url}: {str(e)}")
+            logger.debug("Error details:", exc_info=True)
+            if self.journal is not None:
+                self.journal.mark(url, CrawlState.FAILED, error=str(e), category=category, depth=depth)
+            return []
+
+    async def crawl_queue(self, browser: Browser, queue: WorkQueue, worker: str,
+                          poll_interval: float = 0.2) -> CrawlStats:
+        """Crawl URLs leased from a WorkQueue shared with other worker processes
+
+        ``workers`` tasks claim pages until the queue is drained; child pages
+        are pushed back to the queue, which dedupes them against every URL any
+        worker has seen and applies the depth limits.
+        """
+        self.stats = CrawlStats()
+
+        async def drain(pool: PagePool):
+            while True:
+                item = queue.claim(worker)
+                if item is None:
+                    if queue.drained():
+                        return
+                    # Other workers are still expanding the current depth
+                    await asyncio.sleep(poll_interval)
+                    continue
+                url, category, depth = item
+                children = await self._visit(pool, url, category, depth)
+                queue.complete(url, error=self.stats.errors.get(url))
+                if children and depth < self.max_depth:
+                    added, skipped = queue.push_many(children, category, depth + 1)
+                    self.stats.skipped += skipped
+                    if self.journal is not None and added:
+                        self.journal.enqueue_many(children, category, depth=depth + 1)
+
+        async with PagePool(browser, size=self.workers, blocker=self.blocker) as pool:
+            await asyncio.gather(*(drain(pool) for _ in range(self.workers)))
+
+        self.stats.finished_at = time.monotonic()
+        self._log_stats()
+        return self.stats
+
+    def _record_extracted(self, url: str, content: Optional[Dict[str, Any]], children: List[str],
+                          category: str, depth: int):
+        """Checkpoint an extracted page, noting whether it is new or its content hash moved"""
+        new_hash = content_hash(content)
+        previous = self.journal.get(url)
+        if previous and previous['content_hash'] == new_hash:
+            self.stats.unchanged += 1
+        else:
+            self.stats.changed.add(url)
+        self.journal.mark(url, CrawlState.EXTRACTED, content_hash=new_hash,
+                          children=children, category=category, depth=depth)
+
+    def _log_stats(self):
+        """Log a per-depth summary and overall throughput"""
+        logger.info("\n=== Documentation Crawl Statistics ===")
+        logger.info(f"Total pages processed: {self.stats.pages}")
+        if self.stats.resumed:
+            logger.info(f"Resumed from journal: {self.stats.resumed} pages")
+        if self.stats.unchanged:
+            logger.info(f"New or changed content on {len(self.stats.changed)} pages, "
+                        f"{self.stats.unchanged} unchanged")
+        logger.info(f"Failures: {self.stats.failures}, skipped by depth limits: {self.stats.skipped}")
+        logger.info(f"Elapsed: {self.stats.elapsed:.1f}s ({self.stats.pages_per_second:.2f} pages/sec)")
+        for depth, urls in sorted(self.stats.depth_pages.items()):
+            logger.info(f"Depth {depth}: {len(urls)} pages")
+            for url in urls:
+                logger.debug(f"  - {url}")
+        logger.info("===================================\n")
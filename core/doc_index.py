@@ -0,0 +1,106 @@
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import os
+import threading
+from utils.logging import logger
+from core.config import INDEX_COMPACT_EVERY
+
+
+class DocumentationIndex:
+    """Documentation content index kept as a snapshot plus an append-only log
+
+    ``documentation_content.json`` stays the snapshot in its original
+    ``{'cached_at', 'pages'}`` format. Each update appends one JSON line to
+    ``documentation_content.log.jsonl`` instead of rewriting the snapshot;
+    loading replays the log over the snapshot, and every ``compact_every``
+    appends the log is folded into a new snapshot and truncated.
+    """
+
+    def __init__(self, snapshot_path: Path, log_path: Optional[Path] = None,
+                 compact_every: int = INDEX_COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or snapshot_path.with_name(f"{snapshot_path.stem}.log.jsonl")
+        self.compact_every = compact_every
+        self.cached_at = datetime.now(UTC).isoformat()
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self._appended = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def load(self) -> 'DocumentationIndex':
+        """Read the snapshot and replay any log entries written after it"""
+        with self._lock:
+            self.pages = {}
+            self._appended = 0
+            if self.snapshot_path.exists():
+                try:
+                    snapshot = json.loads(self.snapshot_path.read_text())
+                    self.cached_at = snapshot.get('cached_at', self.cached_at)
+                    self.pages = snapshot.get('pages', {})
+                except (json.JSONDecodeError, OSError) as e:
+                    logger.error(f"Error loading documentation index snapshot: {str(e)}")
+            if self.log_path.exists():
+                with open(self.log_path, encoding='utf-8') as log:
+                    for line in log:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.warning(f"Skipping truncated documentation index log entry in {self.log_path}")
+                            continue
+                        self.pages[record['url']] = record['entry']
+                        self._appended += 1
+            self._loaded = True
+            return self
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return self.pages.get(url)
+
+    def update(self, url: str, entry: Dict[str, Any]):
+        """Record one page: an O(1) log append, compacting periodically"""
+        with self._lock:
+            self._ensure_loaded()
+            self.pages[url] = entry
+            with open(self.log_path, 'a', encoding='utf-8') as log:
+                log.write(json.dumps({'url': url, 'entry': entry}) + '\n')
+            self._appended += 1
+            if self._appended >= self.compact_every:
+                self.compact()
+
+    def replace(self, pages: Dict[str, Dict[str, Any]]):
+        """Swap in a whole new set of pages"""
+        with self._lock:
+            self.pages = dict(pages)
+            self._loaded = True
+            self.compact()
+
+    def compact(self):
+        """Write a fresh snapshot and truncate the log"""
+        with self._lock:
+            self._ensure_loaded()
+            tmp_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.tmp")
+            tmp_path.write_text(json.dumps({'cached_at': self.cached_at, 'pages': self.pages}, indent=2))
+            os.replace(tmp_path, self.snapshot_path)
+            self.log_path.unlink(missing_ok=True)
+            logger.debug(f"Compacted documentation index: {len(self.pages)} pages, "
+                         f"{self._appended} log entries folded in")
+            self._appended = 0
+
+    def checkpoint(self):
+        """Compact only if entries were appended since the last snapshot"""
+        with self._lock:
+            if self._appended:
+                self.compact()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current index in the documentation_content.json format"""
+        with self._lock:
+            self._ensure_loaded()
+            return {'cached_at': self.cached_at, 'pages': dict(self.pages)}
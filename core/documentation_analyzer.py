@@ -5,6 +5,7 @@ from collections import defaultdict
 from typing import Dict, Set, List, Any, Optional
 import aiohttp
 from bs4 import BeautifulSoup
+from core.html_parser import parse_html
 import re
 from datetime import datetime, UTC
 
@@ -26,7 +27,7 @@ class DocumentationAnalyzer:
         patterns = []
         
         # Find code blocks
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = parse_html(content)
         code_blocks = soup.find_all('code')
         
         for block in code_blocks:
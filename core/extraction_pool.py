@@ -0,0 +1,182 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import multiprocessing
+import re
+import time
+from utils.logging import logger
+from core.config import EXTRACTION_WORKERS, EXTRACTION_QUEUE_SIZE
+from core.html_parser import parse_html
+from extractors import CodeBlockExtractor, DocumentationExtractor, PageVisitor, RelationshipExtractor
+from extractors.validation_extractor import ValidationExtractor
+from models.base import DocumentationPage
+
+# Code pattern types counted by analyze_patterns_from_docs
+DOC_PATTERN_TYPES = {
+    'ui_components': [
+        r'WindowGroup',
+        r'NavigationStack',
+        r'TabView',
+        r'View\s*{',
+        r'@main\s+struct.*App\s*:'
+    ],
+    'animation': [
+        r'withAnimation',
+        r'animation',
+        r'transition',
+        r'\.animate',
+        r'Animation'
+    ],
+    'gestures': [
+        r'gesture',
+        r'onTapGesture',
+        r'DragGesture',
+        r'LongPressGesture',
+        r'RotationGesture'
+    ],
+    '3d_content': [
+        r'RealityView',
+        r'Entity',
+        r'Model3D',
+        r'attachments',
+        r'\.load\(".*\.usd[z]?"'
+    ],
+    'spatial_audio': [
+        r'SpatialAudioEmitter',
+        r'AudioEngine',
+        r'playSound',
+        r'spatial\.audio',
+        r'\.audio\('
+    ],
+    'immersive_spaces': [
+        r'ImmersiveSpace',
+        r'immersiveSpace',
+        r'fullspace',
+        r'ornament',
+        r'WindowGroup\s*{\s*ImmersiveSpace'
+    ]
+}
+
+
+def pattern_matches(code: str, pattern_type: str) -> bool:
+    """Check if code matches a specific pattern type"""
+    type_patterns = DOC_PATTERN_TYPES.get(pattern_type, [])
+    return any(re.search(pattern, code, re.IGNORECASE) for pattern in type_patterns)
+
+
+def extract_page(html: str, url: str) -> DocumentationPage:
+    """Parse a documentation page and run every extractor over it (pool job)
+
+    Takes the raw HTML and returns a DocumentationPage, both of which pickle,
+    so it runs the same in a worker process or inline.
+    """
+    code_extractor = CodeBlockExtractor()
+    relationship_extractor = RelationshipExtractor()
+    visitor = PageVisitor()
+    code_blocks = code_extractor.attach(visitor)
+    outline = DocumentationExtractor().attach(visitor)
+    relationships = relationship_extractor.attach(visitor)
+    visitor.walk(parse_html(html))
+
+    code_patterns = code_extractor.extract_patterns(code_blocks, url)
+    relationships += relationship_extractor.pattern_relationships(code_patterns)
+    return DocumentationPage(
+        title=outline.title,
+        url=url,
+        code_blocks=code_blocks,
+        code_patterns=code_patterns,
+        relationships=relationships,
+        validation_tests=ValidationExtractor().generate_tests(code_patterns),
+        topics=outline.topics
+    )
+
+
+def match_code_patterns(html: str, url: str) -> Dict[str, List[Dict[str, str]]]:
+    """Code examples of each DOC_PATTERN_TYPES type found in a page's <code> blocks (pool job)"""
+    matches: Dict[str, List[Dict[str, str]]] = {}
+    for block in parse_html(html).find_all('code'):
+        code = block.get_text()
+        for pattern_type in DOC_PATTERN_TYPES:
+            if pattern_matches(code, pattern_type):
+                matches.setdefault(pattern_type, []).append({'code': code, 'source_url': url})
+    return matches
+
+
+class ExtractionPool:
+    """Process pool that parses and extracts pages off the event loop
+
+    Fetch coroutines hand raw HTML to ``run`` and await the structured result,
+    so parsing uses every core while the browser keeps fetching. Jobs and
+    their arguments and results must pickle (module-level functions, str and
+    pydantic models). At most ``max_pending`` jobs hold a slot at once. Fetch
+    loops ``reserve`` a slot before loading the next page and pass it on with
+    ``run(..., reserved=True)`` (or ``release`` it if nothing was fetched), so
+    fetching waits while the pool is full instead of piling up HTML.
+    ``pending`` is the number of held slots and its peak is reported by
+    ``log_stats``. With ``workers=0`` jobs run inline, which is easier to
+    debug.
+    """
+
+    def __init__(self, workers: int = EXTRACTION_WORKERS, max_pending: Optional[int] = EXTRACTION_QUEUE_SIZE):
+        self.workers = max(0, workers)
+        self.max_pending = max_pending or max(1, self.workers) * 4
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.pending = 0
+        self.stats: Counter = Counter()
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked: the parent holds Playwright and SQLite handles
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f"Started extraction pool with {self.workers} processes")
+        return self._executor
+
+    async def reserve(self):
+        """Wait for a free slot, holding it for a job that will be ``run`` with ``reserved=True``"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        if self._slots.locked():
+            self.stats['backpressure'] += 1
+        await self._slots.acquire()
+        self.pending += 1
+        self.stats['peak_pending'] = max(self.stats['peak_pending'], self.pending)
+
+    def release(self):
+        """Give back a reserved slot that no job will use"""
+        self.pending -= 1
+        self._slots.release()
+
+    async def run(self, fn: Callable[..., Any], *args, reserved: bool = False) -> Any:
+        """Run ``fn(*args)`` in a worker process and return its result"""
+        started = time.perf_counter()
+        if not reserved:
+            await self.reserve()
+        self.stats['submitted'] += 1
+        try:
+            if self.workers == 0:
+                result = fn(*args)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(self._ensure_executor(), fn, *args)
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        finally:
+            self.release()
+            self.stats['wait_ms'] += int((time.perf_counter() - started) * 1000)
+        self.stats['completed'] += 1
+        return result
+
+    def log_stats(self):
+        if self.stats['submitted']:
+            logger.info(f"Extraction pool: {self.stats['completed']} jobs on {self.workers or 'no'} worker processes, "
+                        f"peak queue depth {self.stats['peak_pending']}, {self.stats['backpressure']} backpressure "
+                        f"waits, {self.stats['errors']} errors, {self.stats['wait_ms'] / 1000:.1f}s awaiting results")
+
+    def close(self):
+        """Shut the worker processes down"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._slots = None
@@ -0,0 +1,358 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+import asyncio
+import json
+import aiohttp
+from bs4 import BeautifulSoup
+from playwright.async_api import Page
+from utils.logging import logger
+from core.http_client import HttpClient
+from core.html_parser import parse_html
+from core.page_readiness import PageReadiness
+
+
+@dataclass
+class FetchResult:
+    """Structured page content produced by one fetch strategy"""
+    url: str
+    strategy: str
+    content: Dict[str, Any]
+    raw: str = ''
+    raw_suffix: str = 'html'
+
+
+class FetchStrategy:
+    """Base class for one way of turning a documentation URL into content"""
+    name = 'base'
+
+    async def fetch(self, url: str, client: HttpClient,
+                    page: Optional[Page] = None) -> Optional[FetchResult]:
+        """Return a FetchResult, or None to let the next strategy try"""
+        raise NotImplementedError
+
+
+def _inline_text(items: Iterable[Dict[str, Any]], references: Dict[str, Any]) -> str:
+    """Flatten DocC inline content (text, code voice, references) to plain text"""
+    parts = []
+    for item in items or []:
+        kind = item.get('type')
+        if kind == 'text':
+            parts.append(item.get('text', ''))
+        elif kind == 'codeVoice':
+            parts.append(item.get('code', ''))
+        elif kind == 'reference':
+            ref = references.get(item.get('identifier', ''), {})
+            parts.append(ref.get('title', ''))
+        elif 'inlineContent' in item:
+            parts.append(_inline_text(item['inlineContent'], references))
+    return ''.join(parts)
+
+
+def docc_data_url(url: str) -> Optional[str]:
+    """Map a documentation page URL to its DocC render JSON endpoint"""
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/')
+    if not path.startswith(('/documentation/', '/design/')):
+        return None
+    return urlunsplit((parts.scheme, parts.netloc, f"/tutorials/data{path}.json", '', ''))
+
+
+def parse_docc_json(data: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """Convert a DocC render JSON document into the cached page content format"""
+    references = data.get('references', {})
+    metadata = data.get('metadata', {})
+    content: Dict[str, Any] = {}
+
+    if metadata.get('title'):
+        content['title'] = metadata['title']
+    if metadata.get('roleHeading'):
+        content['type'] = metadata['roleHeading']
+
+    abstract = _inline_text(data.get('abstract', []), references)
+    if abstract:
+        content['description'] = abstract
+
+    for section in data.get('primaryContentSections', []):
+        kind = section.get('kind')
+        if kind == 'declarations' and 'declaration' not in content:
+            declarations = section.get('declarations', [])
+            if declarations:
+                swift = ''.join(t.get('text', '') for t in declarations[0].get('tokens', []))
+                content['declaration'] = {'swift': swift.strip(), 'formatted': swift.strip()}
+        elif kind == 'parameters':
+            content['parameters'] = [
+                {
+                    'name': param.get('name', ''),
+                    'description': ' '.join(
+                        _inline_text(block.get('inlineContent', []), references)
+                        for block in param.get('content', [])
+                    ).strip()
+                }
+                for param in section.get('parameters', [])
+            ]
+
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    child_pages = []
+    for topic_section in data.get('topicSections', []):
+        for identifier in topic_section.get('identifiers', []):
+            ref_url = references.get(identifier, {}).get('url')
+            if ref_url and ref_url.startswith('/'):
+                child_url = origin + ref_url
+                if child_url not in child_pages:
+                    child_pages.append(child_url)
+    if child_pages:
+        content['child_pages'] = child_pages
+
+    return content
+
+
+# Links in a rendered page's topic sections that lead to its child pages
+CHILD_PAGE_SELECTOR = '.contenttable-section a[href]'
+# Code listings, excluding the declaration extracted on its own
+CODE_BLOCK_SELECTOR = 'pre'
+
+# Browser-side twin of extract_html_content: the whole payload in one evaluate call
+PAGE_CONTENT_SCRIPT = """
+({childSelector, codeSelector}) => {
+    const content = {};
+    const title = document.querySelector('h1');
+    if (title) content.title = title.textContent;
+    const description = document.querySelector('.description');
+    if (description) content.description = description.textContent;
+    const declaration = document.querySelector('.declaration, .swift');
+    if (declaration) {
+        content.declaration = {swift: declaration.textContent.trim(), formatted: declaration.innerHTML.trim()};
+    }
+    const params = document.querySelector('.parameters');
+    if (params) {
+        const parameters = [];
+        let current = null;
+        for (const item of params.querySelectorAll('dt, dd')) {
+            if (item.tagName.toLowerCase() === 'dt') {
+                if (current) parameters.push(current);
+                current = {name: item.textContent.trim()};
+            } else if (current) {
+                current.description = item.textContent.trim();
+            }
+        }
+        if (current) parameters.push(current);
+        content.parameters = parameters;
+    }
+    const childPages = [];
+    for (const link of document.querySelectorAll(childSelector)) {
+        const url = new URL(link.getAttribute('href'), document.baseURI);
+        const documentation = ['/documentation/', '/design/'].some(prefix => url.pathname.startsWith(prefix));
+        if (url.host !== location.host || !documentation) continue;
+        const childUrl = `${url.protocol}//${url.host}${url.pathname}`;
+        if (!childPages.includes(childUrl)) childPages.push(childUrl);
+    }
+    if (childPages.length) content.child_pages = childPages;
+    const codeBlocks = [];
+    for (const block of document.querySelectorAll(codeSelector)) {
+        if (block.closest('.declaration')) continue;
+        const listing = block.closest('[data-syntax]');
+        codeBlocks.push({code: block.textContent, language: listing ? listing.getAttribute('data-syntax') : ''});
+    }
+    if (codeBlocks.length) content.code_blocks = codeBlocks;
+    return content;
+}
+"""
+
+
+def child_page_url(href: str, base_url: str) -> Optional[str]:
+    """Absolute documentation URL for a topic link, or None if it leaves the docs"""
+    parts = urlsplit(urljoin(base_url, href))
+    if parts.netloc != urlsplit(base_url).netloc or not parts.path.startswith(('/documentation/', '/design/')):
+        return None
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+def extract_html_content(soup: BeautifulSoup, url: Optional[str] = None) -> Dict[str, Any]:
+    """Extract page content from rendered HTML, mirroring PAGE_CONTENT_SCRIPT
+
+    Child pages are only resolved when the page ``url`` is known.
+    """
+    content: Dict[str, Any] = {}
+
+    title_element = soup.select_one('h1')
+    if title_element:
+        content['title'] = title_element.get_text()
+
+    desc_element = soup.select_one('.description')
+    if desc_element:
+        content['description'] = desc_element.get_text()
+
+    decl_element = soup.select_one('.declaration, .swift')
+    if decl_element:
+        content['declaration'] = {
+            'swift': decl_element.get_text().strip(),
+            'formatted': decl_element.decode_contents().strip()
+        }
+
+    params_section = soup.select_one('.parameters')
+    if params_section:
+        parameters = []
+        current_param = None
+        for item in params_section.select('dt, dd'):
+            if item.name == 'dt':
+                if current_param:
+                    parameters.append(current_param)
+                current_param = {'name': item.get_text().strip()}
+            elif item.name == 'dd' and current_param:
+                current_param['description'] = item.get_text().strip()
+        if current_param:
+            parameters.append(current_param)
+        content['parameters'] = parameters
+
+    if url is not None:
+        child_pages = []
+        for link in soup.select(CHILD_PAGE_SELECTOR):
+            child_url = child_page_url(link['href'], url)
+            if child_url and child_url not in child_pages:
+                child_pages.append(child_url)
+        if child_pages:
+            content['child_pages'] = child_pages
+
+    code_blocks = []
+    for block in soup.select(CODE_BLOCK_SELECTOR):
+        if 'declaration' in block.get('class', []) or block.find_parent(class_='declaration'):
+            continue
+        listing = block if block.has_attr('data-syntax') else block.find_parent(attrs={'data-syntax': True})
+        code_blocks.append({'code': block.get_text(), 'language': listing['data-syntax'] if listing else ''})
+    if code_blocks:
+        content['code_blocks'] = code_blocks
+
+    return content
+
+
+class DocCJSONStrategy(FetchStrategy):
+    """Fetch Apple's DocC render JSON instead of rendering the page"""
+    name = 'json'
+
+    async def fetch(self, url, client, page=None):
+        data_url = docc_data_url(url)
+        if not data_url:
+            return None
+        async with client.get(data_url) as response:
+            if response.status != 200:
+                logger.debug(f"DocC JSON unavailable for {url} (status {response.status})")
+                return None
+            raw = await response.text()
+        content = parse_docc_json(json.loads(raw), url)
+        if not content.get('title'):
+            return None
+        return FetchResult(url=url, strategy=self.name, content=content, raw=raw, raw_suffix='json')
+
+
+class StaticHTMLStrategy(FetchStrategy):
+    """Plain HTTP GET, accepted only when the required selectors are present"""
+    name = 'html'
+
+    def __init__(self, required_selectors: Dict[str, List[str]]):
+        self.required_selectors = required_selectors
+
+    def has_required_selectors(self, soup: BeautifulSoup) -> bool:
+        """True when every required key matches at least one of its selectors"""
+        return all(
+            any(soup.select_one(selector) for selector in selectors)
+            for selectors in self.required_selectors.values()
+        )
+
+    async def fetch(self, url, client, page=None):
+        async with client.get(url) as response:
+            if response.status != 200:
+                return None
+            raw = await response.text()
+        soup = parse_html(raw)
+        if not self.has_required_selectors(soup):
+            logger.debug(f"Static HTML for {url} is missing required selectors")
+            return None
+        return FetchResult(url=url, strategy=self.name, content=extract_html_content(soup, url), raw=raw)
+
+
+class BrowserStrategy(FetchStrategy):
+    """Full Playwright render, used when no HTTP strategy produced content"""
+    name = 'browser'
+
+    def __init__(self, extractor: Callable[[Page, str], Awaitable[Dict[str, Any]]],
+                 readiness: Optional[PageReadiness] = None):
+        self.extractor = extractor
+        self.readiness = readiness or PageReadiness()
+
+    async def fetch(self, url, client, page=None):
+        if page is None:
+            return None
+        await self.readiness.goto(page, url)
+        raw = await page.content()
+        content = await self.extractor(page, url)
+        return FetchResult(url=url, strategy=self.name, content=content, raw=raw)
+
+
+class StrategyFetcher:
+    """Try fetch strategies in order and track how often each one succeeds"""
+
+    def __init__(self, strategies: List[FetchStrategy], client: Optional[HttpClient] = None):
+        self.strategies = strategies
+        self.attempts: Counter = Counter()
+        self.hits: Counter = Counter()
+        self.client = client
+        self._owns_client = client is None
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], required_selectors: Dict[str, List[str]],
+                   extractor: Callable[[Page, str], Awaitable[Dict[str, Any]]],
+                   readiness: Optional[PageReadiness] = None) -> 'StrategyFetcher':
+        """Build a fetcher from strategy names such as FETCH_STRATEGIES"""
+        available = {
+            'json': lambda: DocCJSONStrategy(),
+            'html': lambda: StaticHTMLStrategy(required_selectors),
+            'browser': lambda: BrowserStrategy(extractor, readiness),
+        }
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown fetch strategies: {', '.join(unknown)}")
+        return cls([available[name]() for name in names])
+
+    async def fetch(self, url: str, page: Optional[Page] = None) -> Optional[FetchResult]:
+        """Return the first successful strategy result for a URL"""
+        if self.client is None:
+            self.client = HttpClient()
+        for strategy in self.strategies:
+            self.attempts[strategy.name] += 1
+            try:
+                result = await strategy.fetch(url, self.client, page)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.debug(f"{strategy.name} fetch failed for {url}: {str(e)}")
+                result = None
+            if result is not None:
+                self.hits[strategy.name] += 1
+                logger.debug(f"Fetched {url} via {strategy.name}")
+                return result
+        return None
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Fraction of attempts that succeeded, per strategy"""
+        return {
+            strategy.name: (self.hits[strategy.name] / self.attempts[strategy.name]
+                            if self.attempts[strategy.name] else 0.0)
+            for strategy in self.strategies
+        }
+
+    def log_stats(self):
+        """Log per-strategy hit rates"""
+        total = sum(self.hits.values())
+        logger.info("Fetch strategy hit rates:")
+        for strategy in self.strategies:
+            name = strategy.name
+            share = self.hits[name] / total * 100 if total else 0.0
+            logger.info(f"- {name}: {self.hits[name]}/{self.attempts[name]} attempts succeeded "
+                        f"({share:.1f}% of fetched pages)")
+
+    async def close(self):
+        """Close the HTTP client if this fetcher created it"""
+        if self._owns_client and self.client is not None:
+            await self.client.close()
+            self.client = None
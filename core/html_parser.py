@@ -0,0 +1,36 @@
+from typing import Optional, Union
+from bs4 import BeautifulSoup
+from utils.logging import logger
+from core.config import HTML_PARSER
+
+try:
+    import lxml
+except ImportError:  # Optional dependency; html.parser is always available
+    lxml = None
+
+PARSERS = ('lxml', 'html.parser')
+
+_warned = False
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """BeautifulSoup parser to use for ``name`` (default HTML_PARSER)
+
+    lxml builds the same tree several times faster than html.parser; without
+    the lxml package this falls back to html.parser.
+    """
+    global _warned
+    name = name or HTML_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Unknown HTML parser {name!r} (expected one of {', '.join(PARSERS)})")
+    if name == 'lxml' and lxml is None:
+        if not _warned:
+            logger.warning("lxml is not installed, parsing HTML with html.parser")
+            _warned = True
+        return 'html.parser'
+    return name
+
+
+def parse_html(markup: Union[str, bytes], parser: Optional[str] = None) -> BeautifulSoup:
+    """Parse markup with the configured backend; every extractor works on the result"""
+    return BeautifulSoup(markup, resolve_parser(parser))
@@ -0,0 +1,282 @@
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import json
+import random
+import time
+import aiohttp
+from utils.logging import logger
+from core.transport import HOP_HEADERS, ArchivedResponse, Transport, get_transport
+from core.response_cache import ResponseCache, get_response_cache
+from core.config import (
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTIONS_PER_HOST,
+    HTTP_RATE_PER_HOST,
+    HTTP_BURST_PER_HOST,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    PAGE_TIMEOUT
+)
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Bytes read per chunk while buffering a response of unknown length
+BUFFER_CHUNK_SIZE = 64 * 1024
+
+
+class _PrefixedStream:
+    """Stream that replays bytes already read from ``content`` before the rest of it"""
+
+    def __init__(self, prefix: bytes, content: aiohttp.StreamReader):
+        self._prefix = prefix
+        self._content = content
+
+    async def read(self, n: int = -1) -> bytes:
+        if self._prefix:
+            if n < 0:
+                chunk, self._prefix = self._prefix + await self._content.read(), b''
+            else:
+                chunk, self._prefix = self._prefix[:n], self._prefix[n:]
+            return chunk
+        return await self._content.read(n)
+
+    async def iter_chunked(self, n: int):
+        while chunk := await self.read(n):
+            yield chunk
+
+
+class _PartlyReadResponse:
+    """A live response whose first bytes were read while trying to cache it"""
+
+    def __init__(self, response: aiohttp.ClientResponse, prefix: bytes):
+        self._response = response
+        self.content = _PrefixedStream(prefix, response.content)
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    async def read(self) -> bytes:
+        return await self.content.read()
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return (await self.read()).decode(encoding or self._response.get_encoding(), errors='replace')
+
+    async def json(self, **kwargs):
+        return json.loads(await self.text())
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to a single host"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpClient:
+    """Long-lived aiohttp session with per-host rate limiting and jittered retries
+
+    ``get`` is a drop-in for ``ClientSession.get``: it yields the response
+    inside an ``async with`` block, after transparently retrying connection
+    errors, 429 and 5xx responses with full-jitter exponential backoff.
+    Plain GETs are answered from the shared ResponseCache when fresh, and
+    responses are recorded or replayed by the process-wide Transport; either
+    can be passed explicitly instead.
+    """
+
+    def __init__(self, limit: int = HTTP_CONNECTION_LIMIT, limit_per_host: int = HTTP_CONNECTIONS_PER_HOST,
+                 rate_per_host: float = HTTP_RATE_PER_HOST, burst_per_host: int = HTTP_BURST_PER_HOST,
+                 max_retries: int = HTTP_MAX_RETRIES, backoff_base: float = HTTP_BACKOFF_BASE,
+                 backoff_max: float = HTTP_BACKOFF_MAX, timeout: float = PAGE_TIMEOUT / 1000,
+                 transport: Optional[Transport] = None, response_cache: Optional[ResponseCache] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.transport = transport or get_transport()
+        self.response_cache = response_cache or get_response_cache()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats: Counter = Counter()
+        self.started_at = time.monotonic()
+
+    async def __aenter__(self) -> 'HttpClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared session, created on first use inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=self.timeout)
+            )
+        return self._session
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_host, self.burst_per_host)
+        return self._buckets[host]
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @asynccontextmanager
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  cache: bool = True) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET ``url`` with rate limiting and retries, yielding the final response
+
+        Requests with extra headers (e.g. conditional revalidation) or
+        ``cache=False`` bypass the response cache. An expired cache entry is
+        revalidated with its ETag/Last-Modified, and a 304 Not Modified is
+        answered from the cache.
+        """
+        cacheable = cache and not headers
+        cached = self.response_cache.lookup(url) if cacheable else None
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            yield ArchivedResponse(url, *cached)
+            return
+        # Recordings need full bodies, so only live fetches revalidate
+        stale = self.response_cache.expired(url) if cacheable and self.transport.mode == 'live' else None
+        if stale is not None:
+            headers = self.response_cache.conditional_headers(stale[1])
+
+        if self.transport.replaying:
+            self.stats['requests'] += 1
+            response = await self.transport.replay_response(url)
+            if cacheable:
+                response = await self._store(url, response)
+            yield response
+            return
+
+        attempt = 0
+        while True:
+            await self._bucket(url).acquire()
+            self.stats['requests'] += 1
+            started = time.monotonic()
+            try:
+                response = await self.session.get(url, headers=headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.stats['connection_errors'] += 1
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.debug(f"Retrying {url} in {delay:.2f}s after {type(e).__name__}: {str(e)}")
+            else:
+                self.stats[f"status_{response.status}"] += 1
+                if response.status == 429:
+                    self.stats['throttled'] += 1
+                elif response.status >= 500:
+                    self.stats['server_errors'] += 1
+
+                if response.status == 304 and stale is not None:
+                    response.release()
+                    self.stats['revalidated'] += 1
+                    self.response_cache.revalidated(url, stale)
+                    yield ArchivedResponse(url, *stale)
+                    return
+
+                if response.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    try:
+                        final = response
+                        if self.transport.recording:
+                            final = await self.transport.record_response(response, time.monotonic() - started)
+                        if cacheable:
+                            final = await self._store(url, final)
+                        yield final
+                    finally:
+                        response.release()
+                    return
+
+                delay = self.backoff_delay(attempt, response.headers.get('Retry-After'))
+                response.release()
+                logger.debug(f"Retrying {url} in {delay:.2f}s after status {response.status}")
+
+            self.stats['retries'] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _store(self, url: str, response):
+        """Put a response in the response cache, returning a re-readable copy
+
+        A response without Content-Length (e.g. chunked) is buffered only up
+        to the cache's entry limit; past it, the live response is passed on
+        with the buffered bytes in front, so large bodies are never held whole.
+        """
+        if not self.response_cache.accepts(response.status, response.headers):
+            return response
+        if isinstance(response, ArchivedResponse) or 'Content-Length' in response.headers:
+            body = await response.read()
+        else:
+            buffered = bytearray()
+            while chunk := await response.content.read(BUFFER_CHUNK_SIZE):
+                buffered += chunk
+                if len(buffered) > self.response_cache.max_entry_bytes:
+                    self.stats['uncached_streams'] += 1
+                    return _PartlyReadResponse(response, bytes(buffered))
+            body = bytes(buffered)
+        headers = [(name, value) for name, value in response.headers.items() if name.lower() not in HOP_HEADERS]
+        self.response_cache.store(url, response.status, headers, body)
+        return ArchivedResponse(url, response.status, headers, body)
+
+    def log_stats(self):
+        """Log request throughput and throttling/server error counts"""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        requests = self.stats['requests']
+        logger.info(f"HTTP: {requests} requests in {elapsed:.1f}s ({requests / elapsed:.2f} req/sec), "
+                    f"{self.stats['retries']} retries, {self.stats['throttled']} throttled (429), "
+                    f"{self.stats['server_errors']} server errors (5xx), "
+                    f"{self.stats['connection_errors']} connection errors, "
+                    f"{self.stats['cache_hits']} served from the response cache, "
+                    f"{self.stats['revalidated']} revalidated (304)")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,108 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+from playwright.async_api import Browser, BrowserContext, Page
+from utils.logging import logger
+from core.config import MAX_CONCURRENT_PAGES
+from core.resource_blocker import ResourceBlocker
+from core.transport import Transport, get_transport
+from core.response_cache import ResponseCache, get_response_cache
+
+
+class PagePool:
+    """Reusable pool of Playwright pages with a bounded concurrency limit
+
+    Pages are created lazily inside a single browser context and handed back
+    to the pool after use, so a crawl never holds more than ``size`` pages open
+    at once and never pays for a fresh page per URL. An optional
+    ResourceBlocker is routed on the shared context, covering every page,
+    after the Transport and ResponseCache so blocked requests are neither
+    recorded, replayed nor cached.
+    """
+
+    def __init__(self, browser: Browser, size: int = MAX_CONCURRENT_PAGES,
+                 context_options: Optional[Dict[str, Any]] = None,
+                 blocker: Optional[ResourceBlocker] = None, transport: Optional[Transport] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        if size < 1:
+            raise ValueError("PagePool size must be at least 1")
+        self.browser = browser
+        self.size = size
+        self.context_options = context_options or {}
+        self.blocker = blocker
+        self.transport = transport
+        self.response_cache = response_cache
+        self._context: Optional[BrowserContext] = None
+        self._idle: List[Page] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._context_lock = asyncio.Lock()
+        self.pages_created = 0
+        self.acquisitions = 0
+
+    async def __aenter__(self) -> 'PagePool':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_context(self) -> BrowserContext:
+        """Create the shared browser context on first use"""
+        async with self._context_lock:
+            if self._context is None:
+                self._context = await self.browser.new_context(**self.context_options)
+                await (self.transport or get_transport()).install(self._context)
+                await (self.response_cache or get_response_cache()).install(self._context)
+                if self.blocker is not None:
+                    await self.blocker.install(self._context)
+            return self._context
+
+    async def acquire(self) -> Page:
+        """Wait for a free slot and return an idle or newly created page"""
+        await self._semaphore.acquire()
+        try:
+            while self._idle:
+                page = self._idle.pop()
+                if not page.is_closed():
+                    self.acquisitions += 1
+                    return page
+            context = await self._get_context()
+            page = await context.new_page()
+            self.pages_created += 1
+            self.acquisitions += 1
+            logger.debug(f"PagePool created page {self.pages_created}/{self.size}")
+            return page
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self, page: Page):
+        """Return a page to the pool, dropping it if it has been closed"""
+        if not page.is_closed():
+            self._idle.append(page)
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a page for the duration of the ``async with`` block"""
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            self.release(page)
+
+    async def close(self):
+        """Close all pooled pages and the shared context"""
+        for page in self._idle:
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Error closing pooled page: {str(e)}")
+        self._idle.clear()
+        if self._context is not None:
+            try:
+                await self._context.close()
+            except Exception as e:
+                logger.debug(f"Error closing pool context: {str(e)}")
+            self._context = None
+        logger.debug(f"PagePool closed after {self.acquisitions} acquisitions "
+                     f"using {self.pages_created} pages")
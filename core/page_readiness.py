@@ -0,0 +1,88 @@
+from collections import Counter
+from typing import Dict, Iterable
+from urllib.parse import urlsplit
+import time
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from utils.logging import logger
+from core.config import (
+    PAGE_TIMEOUT,
+    READINESS_SELECTORS,
+    READINESS_TIMEOUT,
+    READINESS_MIN_TIMEOUT,
+    READINESS_TIMEOUT_FACTOR
+)
+
+# Weight of the newest sample in each pattern's moving average
+SMOOTHING = 0.3
+
+
+class PageReadiness:
+    """Wait for extracted selectors to render instead of for network idle
+
+    ``goto`` returns as soon as any readiness selector is attached after
+    DOMContentLoaded. Readiness times are averaged per URL pattern (host plus
+    the first two path segments) and the next timeout for that pattern is a
+    multiple of its typical time, so slow sections keep their headroom while
+    fast ones stop paying for a worst-case wait.
+    """
+
+    def __init__(self, selectors: Iterable[str] = READINESS_SELECTORS,
+                 default_timeout: float = READINESS_TIMEOUT, min_timeout: float = READINESS_MIN_TIMEOUT,
+                 max_timeout: float = PAGE_TIMEOUT, factor: float = READINESS_TIMEOUT_FACTOR):
+        self.selector = ', '.join(selectors)
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.factor = factor
+        self.typical: Dict[str, float] = {}
+        self.stats: Counter = Counter()
+
+    @staticmethod
+    def pattern(url: str) -> str:
+        """Group URLs such as /documentation/realitykit/* under one key"""
+        parts = urlsplit(url)
+        segments = [segment for segment in parts.path.split('/') if segment][:2]
+        return '/'.join([parts.netloc] + segments)
+
+    def timeout_for(self, url: str) -> float:
+        """Milliseconds to wait for ``url`` given what its pattern has taken so far"""
+        typical = self.typical.get(self.pattern(url))
+        if typical is None:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, typical * self.factor))
+
+    def record(self, url: str, elapsed_ms: float):
+        key = self.pattern(url)
+        previous = self.typical.get(key)
+        self.typical[key] = elapsed_ms if previous is None else previous + SMOOTHING * (elapsed_ms - previous)
+
+    async def wait(self, page: Page, url: str) -> bool:
+        """Wait until a readiness selector is attached; False if the timeout passed first"""
+        timeout = self.timeout_for(url)
+        started = time.monotonic()
+        try:
+            await page.wait_for_selector(self.selector, state='attached', timeout=timeout)
+        except PlaywrightTimeoutError:
+            self.stats['timeouts'] += 1
+            self.record(url, timeout)
+            logger.debug(f"No readiness selector on {url} after {timeout:.0f}ms, extracting what rendered")
+            return False
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.record(url, elapsed_ms)
+        self.stats['ready'] += 1
+        self.stats['ready_ms'] += elapsed_ms
+        return True
+
+    async def goto(self, page: Page, url: str) -> bool:
+        """Navigate to ``url`` and wait for readiness rather than network idle"""
+        await page.goto(url, wait_until='domcontentloaded')
+        return await self.wait(page, url)
+
+    def log_stats(self):
+        """Log how many pages became ready and the average readiness time"""
+        ready = self.stats['ready']
+        if not ready and not self.stats['timeouts']:
+            return
+        average = self.stats['ready_ms'] / ready if ready else 0.0
+        logger.info(f"Page readiness: {ready} ready (avg {average:.0f}ms), "
+                    f"{self.stats['timeouts']} timed out, {len(self.typical)} URL patterns learned")
@@ -0,0 +1,245 @@
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import hashlib
+import json
+import os
+import shutil
+import zipfile
+from utils.logging import logger
+from core.config import ARCHIVE_EXTRACT_EXTENSIONS
+
+ARCHIVES_DIRNAME = '.archives'
+
+
+class ArchivePath:
+    """Read-only, path-like view of one file inside a project archive
+
+    Exposes the subset of ``pathlib.Path`` the analyzers use (``name``,
+    ``suffix``, ``parts``, ``read_text``) so archive members can be analyzed
+    without being written to disk.
+    """
+
+    def __init__(self, archive: 'ArchiveProject', member: str):
+        self.archive = archive
+        self.member = member
+        self._relative = PurePosixPath(member)
+
+    @property
+    def name(self) -> str:
+        return self._relative.name
+
+    @property
+    def suffix(self) -> str:
+        return self._relative.suffix
+
+    @property
+    def stem(self) -> str:
+        return self._relative.stem
+
+    @property
+    def parts(self) -> Tuple[str, ...]:
+        return self.archive.root.parts + self._relative.parts
+
+    def is_file(self) -> bool:
+        return True
+
+    def exists(self) -> bool:
+        return True
+
+    def match(self, pattern: str) -> bool:
+        return self._relative.match(pattern)
+
+    def read_bytes(self) -> bytes:
+        return self.archive.read_bytes(self.member)
+
+    def read_text(self, encoding: str = 'utf-8', errors: str = 'strict') -> str:
+        return self.read_bytes().decode(encoding, errors)
+
+    def __str__(self) -> str:
+        return str(self.archive.root / self._relative)
+
+    def __repr__(self) -> str:
+        return f"ArchivePath({self.archive.archive_path.name}!{self.member})"
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, ArchivePath)
+                and other.archive.archive_path == self.archive.archive_path
+                and other.member == self.member)
+
+    def __hash__(self) -> int:
+        return hash((self.archive.archive_path, self.member))
+
+
+class ArchiveProject:
+    """Project view backed by a sample ZIP archive
+
+    Files can either be extracted selectively (only ARCHIVE_EXTRACT_EXTENSIONS)
+    or served directly from the archive through an ``rglob``-compatible
+    iterator of ArchivePath objects.
+    """
+
+    def __init__(self, archive_path: Path, root: Path,
+                 extensions: Iterable[str] = ARCHIVE_EXTRACT_EXTENSIONS):
+        self.archive_path = archive_path
+        self.root = root
+        self.extensions = {ext.lower() for ext in extensions}
+        self._zip: Optional[zipfile.ZipFile] = None
+
+    def __enter__(self) -> 'ArchiveProject':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open(self) -> zipfile.ZipFile:
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.archive_path)
+        return self._zip
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def members(self) -> List[str]:
+        """Names of all file (non-directory) members, skipping macOS metadata"""
+        return [
+            info.filename for info in self._open().infolist()
+            if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+        ]
+
+    def is_selected(self, member: str) -> bool:
+        return PurePosixPath(member).suffix.lower() in self.extensions
+
+    def read_bytes(self, member: str) -> bytes:
+        return self._open().read(member)
+
+    def rglob(self, pattern: str) -> Iterator[ArchivePath]:
+        """Yield members whose file name matches ``pattern``, like Path.rglob"""
+        for member in self.members():
+            if fnmatch(PurePosixPath(member).name, pattern):
+                yield ArchivePath(self, member)
+
+    def glob(self, pattern: str) -> Iterator[ArchivePath]:
+        """Yield members matching a relative glob; ``**/`` prefixes behave like rglob"""
+        if pattern.startswith('**/'):
+            yield from self.rglob(pattern[3:])
+            return
+        pattern_parts = PurePosixPath(pattern).parts
+        for member in self.members():
+            parts = PurePosixPath(member).parts
+            if len(parts) == len(pattern_parts) and all(map(fnmatch, parts, pattern_parts)):
+                yield ArchivePath(self, member)
+
+    def extract_selected(self, dest: Path) -> int:
+        """Extract only whitelisted file types into ``dest`` and return the count"""
+        dest.mkdir(parents=True, exist_ok=True)
+        dest_root = dest.resolve()
+        zf = self._open()
+        count = 0
+        for member in self.members():
+            if not self.is_selected(member):
+                continue
+            target = (dest / member).resolve()
+            if dest_root not in target.parents:
+                logger.warning(f"Skipping archive member outside project directory: {member}")
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(member) as src, open(target, 'wb') as out:
+                shutil.copyfileobj(src, out)
+            count += 1
+        logger.debug(f"Extracted {count} selected files from {self.archive_path.name}")
+        return count
+
+
+def archive_for(project_dir: Path) -> Path:
+    """Location of the retained archive for a project directory"""
+    return project_dir.parent / ARCHIVES_DIRNAME / f"{project_dir.name}.zip"
+
+
+def manifest_path(project_dir: Path) -> Path:
+    """Location of a project's archive/file manifest, next to its retained archive"""
+    return project_dir.parent / ARCHIVES_DIRNAME / f"{project_dir.name}.manifest.json"
+
+
+def load_manifest(project_dir: Path) -> Dict[str, Any]:
+    """Return the project's manifest, or an empty one if it has none"""
+    path = manifest_path(project_dir)
+    try:
+        return json.loads(path.read_text()) if path.exists() else {}
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Ignoring unreadable manifest {path}: {str(e)}")
+        return {}
+
+
+def save_manifest(project_dir: Path, manifest: Dict[str, Any]):
+    path = manifest_path(project_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, path)
+
+
+def file_hashes(archive_path: Path, selected_only: bool = True,
+                extensions: Iterable[str] = ARCHIVE_EXTRACT_EXTENSIONS) -> Dict[str, str]:
+    """SHA-256 of each archive member (only whitelisted types when selected_only)"""
+    with ArchiveProject(archive_path, archive_path.parent, extensions) as archive:
+        return {
+            member: hashlib.sha256(archive.read_bytes(member)).hexdigest()
+            for member in archive.members()
+            if not selected_only or archive.is_selected(member)
+        }
+
+
+def diff_files(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """Members added, modified and removed between two file-hash maps"""
+    return {
+        'added': sorted(set(new) - set(old)),
+        'modified': sorted(member for member in set(new) & set(old) if new[member] != old[member]),
+        'removed': sorted(set(old) - set(new)),
+    }
+
+
+def changed_files(project_dir: Path, suffix: Optional[str] = '.swift') -> List[str]:
+    """Files added or modified by the project's last archive update
+
+    Lets analyzers rescan only what changed instead of the whole project.
+    """
+    changes = load_manifest(project_dir).get('changes', {})
+    members = changes.get('added', []) + changes.get('modified', [])
+    return [member for member in members if suffix is None or member.lower().endswith(suffix)]
+
+
+def project_source(project_dir: Path) -> Union[Path, ArchiveProject]:
+    """Return the archive view for lazily extracted projects, else the directory itself"""
+    archive_path = archive_for(project_dir)
+    has_files = project_dir.exists() and any(project_dir.iterdir())
+    if not has_files and archive_path.exists():
+        return ArchiveProject(archive_path, project_dir)
+    return project_dir
+
+
+def iter_project_files(root: Path, pattern: str) -> Iterator[Union[Path, ArchivePath]]:
+    """Yield files matching ``pattern`` under a project or projects directory
+
+    Extracted files come from the filesystem; projects kept only as archives
+    are read through ArchiveProject. Hidden working directories such as
+    ``.archives`` and ``.downloads`` are skipped.
+    """
+    source = project_source(root)
+    if isinstance(source, ArchiveProject):
+        yield from source.rglob(pattern)
+        return
+    if not root.exists():
+        return
+
+    for path in root.rglob(pattern):
+        if not any(part.startswith('.') for part in path.relative_to(root).parts):
+            yield path
+
+    for child in sorted(root.iterdir()):
+        if child.is_dir() and not child.name.startswith('.'):
+            child_source = project_source(child)
+            if isinstance(child_source, ArchiveProject):
+                yield from child_source.rglob(pattern)
@@ -0,0 +1,86 @@
+from collections import Counter
+from typing import Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
+from playwright.async_api import BrowserContext, Page, Request, Route
+from utils.logging import logger
+from core.config import BLOCK_RESOURCES, BLOCKED_RESOURCE_TYPES, BLOCKED_HOSTS, ESTIMATED_BANDWIDTH
+
+# Typical transfer sizes used to estimate what an aborted request would have cost
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 40_000,
+    'media': 500_000,
+    'font': 30_000,
+    'stylesheet': 20_000,
+    'script': 60_000,
+}
+DEFAULT_RESOURCE_BYTES = 5_000
+
+
+class ResourceBlocker:
+    """Playwright route handler aborting resources documentation extraction never reads
+
+    Requests of a blocked resource type, or to a blocked host or one of its
+    subdomains, are aborted; documents, scripts and XHR that build the DOM
+    continue. Aborted requests are counted per page with an estimate of the
+    bytes and time they would have cost.
+    """
+
+    def __init__(self, resource_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+                 hosts: Iterable[str] = BLOCKED_HOSTS, enabled: bool = BLOCK_RESOURCES,
+                 bandwidth: float = ESTIMATED_BANDWIDTH):
+        self.resource_types = set(resource_types)
+        self.hosts = {host.lower() for host in hosts}
+        self.enabled = enabled
+        self.bandwidth = bandwidth
+        self.totals: Counter = Counter()
+        self._pages: Dict[Optional[Page], Counter] = {}
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        host = (urlsplit(url).hostname or '').lower()
+        return any(host == blocked or host.endswith(f".{blocked}") for blocked in self.hosts)
+
+    async def install(self, target: Union[BrowserContext, Page]):
+        """Route every request of a context or page through the blocker"""
+        if self.enabled:
+            await target.route('**/*', self.handle)
+
+    async def handle(self, route: Route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self._record(request)
+            await route.abort('blockedbyclient')
+        else:
+            # Fall back rather than continue so a Transport routed earlier still sees it
+            await route.fallback()
+
+    def _record(self, request: Request):
+        try:
+            page = request.frame.page
+        except Exception:
+            page = None  # Service worker requests have no frame
+        stats = self._pages.setdefault(page, Counter())
+        stats['requests'] += 1
+        stats[request.resource_type] += 1
+        stats['bytes'] += ESTIMATED_RESOURCE_BYTES.get(request.resource_type, DEFAULT_RESOURCE_BYTES)
+
+    def report(self, page: Page, url: str) -> Counter:
+        """Log and reset what was blocked on ``page`` since the last report"""
+        stats = self._pages.pop(page, Counter())
+        if stats['requests']:
+            self.totals.update(stats)
+            self.totals['pages'] += 1
+            logger.info(f"Blocked {stats['requests']} requests on {url} "
+                        f"(~{stats['bytes'] / 1024:.0f} KB, ~{stats['bytes'] / self.bandwidth:.2f}s saved)")
+        return stats
+
+    def log_stats(self):
+        """Log blocked request totals across all reported pages"""
+        if not self.totals['requests']:
+            return
+        by_type = ", ".join(f"{resource_type}: {self.totals[resource_type]}"
+                            for resource_type in sorted(self.resource_types) if self.totals[resource_type])
+        logger.info(f"Resource blocking: {self.totals['requests']} requests over {self.totals['pages']} pages "
+                    f"(~{self.totals['bytes'] / 1024:.0f} KB, ~{self.totals['bytes'] / self.bandwidth:.1f}s saved) "
+                    f"[{by_type}]")
@@ -0,0 +1,199 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import time
+from playwright.async_api import BrowserContext, Page, Route
+from utils.logging import logger
+from core.config import (
+    CACHE_DURATION,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRY
+)
+from core.blob_store import BlobStore
+from core.transport import HOP_HEADERS, Transport, get_transport
+
+CachedResponse = Tuple[int, List[Tuple[str, str]], bytes]
+
+
+class ResponseCache:
+    """GET response cache shared by HttpClient and Playwright page routes
+
+    Successful responses are kept in the BlobStore under ``('response', url)``
+    with their status, headers and fetch time as metadata, so a URL costs one
+    network fetch per ``ttl`` whichever stage (HTTP strategy, discovery page,
+    crawler, scraper) asks for it. Reads refresh the reference timestamp and
+    the least recently used entries are evicted beyond ``max_bytes``. Expired
+    entries with an ETag or Last-Modified are kept for ``HttpClient`` to
+    revalidate with a conditional GET; a 304 makes them fresh again.
+    """
+
+    KIND = 'response'
+
+    def __init__(self, store: Optional[BlobStore] = None, ttl: int = CACHE_DURATION,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES, max_entry_bytes: int = RESPONSE_CACHE_MAX_ENTRY,
+                 enabled: bool = RESPONSE_CACHE_ENABLED, transport: Optional[Transport] = None):
+        self.blobs = store or BlobStore()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = enabled
+        self._transport = transport
+        self.stats: Counter = Counter()
+        self._bytes = self.blobs.total_size(self.KIND)
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport or get_transport()
+
+    def accepts(self, status: int, headers: Mapping[str, str], size: Optional[int] = None) -> bool:
+        """True when a response may be stored
+
+        Without ``size`` the Content-Length header is checked; when that is
+        missing too, the caller must stop reading past ``max_entry_bytes``.
+        """
+        if not self.enabled or status != 200:
+            return False
+        if 'no-store' in headers.get('Cache-Control', '').lower():
+            return False
+        if size is None:
+            length = headers.get('Content-Length', '')
+            if not length.isdigit():
+                return True
+            size = int(length)
+        return size <= self.max_entry_bytes
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Return a fresh cached (status, headers, body) and mark it recently used"""
+        if not self.enabled:
+            return None
+        entry = self.blobs.ref(self.KIND, url)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        if time.time() - entry['meta'].get('fetched_at', 0) >= self.ttl:
+            self.stats['expired'] += 1
+            return None
+        body = self.blobs.get_blob(entry['digest'])
+        if body is None:
+            self.stats['misses'] += 1
+            return None
+        self.blobs.touch(self.KIND, url)
+        self.stats['hits'] += 1
+        self.stats['bytes_served'] += len(body)
+        meta = entry['meta']
+        return meta['status'], [tuple(header) for header in meta['headers']], body
+
+    def expired(self, url: str) -> Optional[CachedResponse]:
+        """Return an expired entry that carries validators, for a conditional GET"""
+        if not self.enabled:
+            return None
+        entry = self.blobs.ref(self.KIND, url)
+        if entry is None or not self.conditional_headers(entry['meta']['headers']):
+            return None
+        body = self.blobs.get_blob(entry['digest'])
+        if body is None:
+            return None
+        meta = entry['meta']
+        return meta['status'], [tuple(header) for header in meta['headers']], body
+
+    @staticmethod
+    def conditional_headers(headers: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since matching a cached response's validators"""
+        conditional = {}
+        for name, value in headers:
+            if name.lower() == 'etag':
+                conditional['If-None-Match'] = value
+            elif name.lower() == 'last-modified':
+                conditional['If-Modified-Since'] = value
+        return conditional
+
+    def revalidated(self, url: str, cached: CachedResponse):
+        """Mark an expired entry fresh again after a 304 Not Modified"""
+        status, headers, body = cached
+        self.blobs.put(self.KIND, url, body, meta={
+            'status': status, 'headers': headers, 'fetched_at': time.time()
+        })
+        self.stats['revalidated'] += 1
+
+    def store(self, url: str, status: int, headers: Iterable[Tuple[str, str]], body: bytes):
+        """Cache a response if it qualifies, evicting old entries past max_bytes"""
+        headers = [(name, value) for name, value in headers if name.lower() not in HOP_HEADERS]
+        if not self.accepts(status, dict(headers), len(body)):
+            return
+        previous = self.blobs.ref(self.KIND, url)
+        self.blobs.put(self.KIND, url, body, meta={
+            'status': status, 'headers': headers, 'fetched_at': time.time()
+        })
+        self.stats['stored'] += 1
+        self._bytes += len(body) - (previous['size'] if previous else 0)
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def invalidate(self, url: str):
+        """Drop a URL's entry so the next GET for it goes to the network"""
+        entry = self.blobs.ref(self.KIND, url)
+        if entry is None:
+            return
+        self.blobs.delete(self.KIND, url)
+        self._bytes -= entry['size']
+        self.stats['invalidated'] += 1
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        for key, size in self.blobs.least_recent(self.KIND):
+            if self._bytes <= self.max_bytes:
+                break
+            self.blobs.delete(self.KIND, key)
+            self._bytes -= size
+            self.stats['evicted'] += 1
+
+    async def install(self, target: Union[BrowserContext, Page]):
+        """Serve a context's or page's GET requests through the cache
+
+        Install after the Transport and before a ResourceBlocker: misses are
+        resolved by the transport, so recording and replay keep working.
+        """
+        if self.enabled:
+            await target.route('**/*', self.handle)
+
+    async def handle(self, route: Route):
+        request = route.request
+        if request.method != 'GET':
+            await route.fallback()
+            return
+        cached = self.lookup(request.url)
+        if cached is None:
+            cached = await self.transport.fetch(route)
+            if cached is None:
+                await route.abort('internetdisconnected')
+                return
+            self.store(request.url, *cached)
+        status, headers, body = cached
+        await route.fulfill(status=status, headers=dict(headers), body=body)
+
+    def log_stats(self):
+        """Log hit rate, evictions and cache size"""
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['expired']
+        if not lookups:
+            return
+        logger.info(f"Response cache: {self.stats['hits']}/{lookups} hits ({self.stats['hits'] / lookups:.0%}), "
+                    f"{self.stats['expired']} expired, {self.stats['stored']} stored, "
+                    f"{self.stats['evicted']} evicted, {self._bytes / 1024 / 1024:.1f} MB cached")
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache shared by every HttpClient and page pool"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def configure_response_cache(cache: ResponseCache) -> ResponseCache:
+    """Replace the process-wide response cache, e.g. to point it at another store"""
+    global _response_cache
+    _response_cache = cache
+    return cache
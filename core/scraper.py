@@ -6,6 +6,13 @@ from models.base import DocumentationPage, Topic
 from extractors import CodeBlockExtractor, DocumentationExtractor
 from extractors.relationship_extractor import RelationshipExtractor
 from extractors.validation_extractor import ValidationExtractor
+from core.resource_blocker import ResourceBlocker
+from core.page_readiness import PageReadiness
+from core.blob_store import BlobStore
+from core.write_behind import WriteBehindQueue
+from core.transport import get_transport
+from core.response_cache import get_response_cache
+from core.extraction_pool import ExtractionPool, extract_page
 import logging
 import asyncio
 import json
@@ -15,12 +22,19 @@ logger = logging.getLogger(__name__)
 class DocumentationScraper:
     """Main documentation scraper class"""
     
-    def __init__(self, output_dir: Path = Path('data')):
+    def __init__(self, output_dir: Path = Path('data'), extraction: Optional[ExtractionPool] = None):
         self.output_dir = output_dir
         self.debug_dir = output_dir / 'debug'
         self.extracted_dir = output_dir / 'extracted'
         self.doc_extractor = DocumentationExtractor()
+        self.code_extractor = CodeBlockExtractor()
+        self.relationship_extractor = RelationshipExtractor()
         self.validation_extractor = ValidationExtractor()
+        self.blocker = ResourceBlocker()
+        self.readiness = PageReadiness()
+        self.blobs = BlobStore(output_dir / 'cache' / 'blobs')
+        self.writer = WriteBehindQueue()
+        self.extraction = extraction or ExtractionPool()
         
         # Create necessary directories
         self.output_dir.mkdir(exist_ok=True)
@@ -37,80 +51,93 @@ class DocumentationScraper:
                 viewport={'width': 1280, 'height': 720},
                 user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             )
+            await get_transport().install(context)
+            await get_response_cache().install(context)
+            await self.blocker.install(context)
             
             try:
                 page = await context.new_page()
                 
+                # Extraction of each page overlaps with fetching the next ones
+                extractions = []
                 for url in urls:
-                    doc_page = await self.scrape_url(page, url)
+                    # Wait for an extraction slot first, so fetched HTML cannot pile up
+                    await self.extraction.reserve()
+                    content = await self.fetch_url(page, url)
+                    if content:
+                        extractions.append(asyncio.create_task(self.extract_url(url, content, reserved=True)))
+                    else:
+                        self.extraction.release()
+                
+                for doc_page in await asyncio.gather(*extractions):
                     if doc_page:
                         pages.append(doc_page)
-                    await asyncio.sleep(2)  # Be nice to the server
                     
             finally:
                 await browser.close()
+                await self.writer.flush()
+                self.extraction.log_stats()
+                self.extraction.close()
+                self.blocker.log_stats()
+                self.readiness.log_stats()
+                self.blobs.log_stats()
                 
         return pages
     
     async def scrape_url(self, page: Page, url: str) -> Optional[DocumentationPage]:
         """Scrape a single documentation page with the new structure"""
+        content = await self.fetch_url(page, url)
+        return await self.extract_url(url, content) if content else None
+    
+    async def fetch_url(self, page: Page, url: str) -> Optional[str]:
+        """Load a page and return its rendered HTML"""
         try:
             logger.info(f"Scraping URL: {url}")
             # Navigate to the URL
-            await page.goto(url, wait_until='networkidle')
+            await self.readiness.goto(page, url)
+            self.blocker.report(page, url)
             content = await page.content()
             
             if not content:
                 logger.warning(f"No content found for {url}")
                 return None
-                
-            soup = BeautifulSoup(content, 'html.parser')
             
             # Save debug content
-            debug_file = self.debug_dir / f"raw_{url.split('/')[-1]}.html"
-            debug_file.write_text(content, encoding='utf-8')
-            logger.debug(f"Saved debug content to {debug_file}")
-            
-            # Extract code blocks and convert to patterns
-            code_blocks = CodeBlockExtractor.extract_code_blocks(soup)
-            logger.info(f"Found {len(code_blocks)} code blocks")
-            
-            code_patterns = CodeBlockExtractor().extract_patterns(code_blocks)
-            logger.info(f"Generated {len(code_patterns)} patterns")
+            await self.writer.submit(self.blobs.put, 'raw', url, content, meta={'source': 'scraper'})
+            logger.debug(f"Queued debug content for {url}")
+            return content
             
-            # Extract relationships
-            relationships = RelationshipExtractor().extract_relationships(soup, code_patterns)
-            logger.info(f"Found {len(relationships)} relationships")
-            
-            # Generate validation tests
-            validation_tests = self.validation_extractor.generate_tests(code_patterns)
-            logger.info(f"Generated {len(validation_tests)} validation tests")
-            
-            # Create page
-            doc_page = DocumentationPage(
-                title=self._extract_title(soup),
-                url=url,
-                code_blocks=code_blocks,
-                code_patterns=code_patterns,
-                relationships=relationships,
-                validation_tests=validation_tests,
-                topics=self._extract_topics(soup)
-            )
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {str(e)}", exc_info=True)
+            return None
+    
+    async def extract_url(self, url: str, content: str, reserved: bool = False) -> Optional[DocumentationPage]:
+        """Extract a fetched page in the extraction pool and queue the result for saving
+
+        ``reserved`` means the caller already holds an extraction pool slot for it.
+        """
+        try:
+            doc_page = await self.extraction.run(extract_page, content, url, reserved=reserved)
+            logger.info(f"Extracted {url}: {len(doc_page.code_blocks)} code blocks, "
+                        f"{len(doc_page.code_patterns)} patterns, {len(doc_page.relationships)} relationships, "
+                        f"{len(doc_page.validation_tests)} validation tests "
+                        f"({self.extraction.pending} pages awaiting extraction)")
             
             # Save extracted data
             output_file = self.extracted_dir / f"extracted_{url.split('/')[-1]}.json"
-            output_file.write_text(
-                doc_page.model_dump_json(indent=2),
-                encoding='utf-8'
-            )
-            logger.info(f"Saved extracted data to {output_file}")
+            await self.writer.submit(self._save_extracted, output_file, doc_page)
+            logger.info(f"Queued extracted data for {output_file}")
             
             return doc_page
             
         except Exception as e:
-            logger.error(f"Error scraping {url}: {str(e)}", exc_info=True)
+            logger.error(f"Error extracting {url}: {str(e)}", exc_info=True)
             return None
     
+    def _save_extracted(self, output_file: Path, doc_page: DocumentationPage):
+        """Serialize and write an extracted page (runs on the writer thread)"""
+        output_file.write_text(doc_page.model_dump_json(indent=2), encoding='utf-8')
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract title from the page"""
         return self.doc_extractor._extract_title(soup)
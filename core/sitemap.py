@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import gzip
+import xml.etree.ElementTree as ET
+from utils.logging import logger
+from core.config import SITEMAP_URLS, SITEMAP_MAX_FILES
+from core.http_client import HttpClient
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+@dataclass
+class SitemapEntry:
+    """One <url> of a sitemap"""
+    url: str
+    lastmod: Optional[str] = None
+
+
+def parse_sitemap(xml_text: str) -> Tuple[List[SitemapEntry], List[str]]:
+    """Parse a urlset or sitemapindex into (page entries, child sitemap URLs)"""
+    root = ET.fromstring(xml_text)
+    entries: List[SitemapEntry] = []
+    children: List[str] = []
+    for element in root:
+        loc = element.findtext(f'{SITEMAP_NS}loc') or element.findtext('loc')
+        if not loc:
+            continue
+        lastmod = element.findtext(f'{SITEMAP_NS}lastmod') or element.findtext('lastmod')
+        if element.tag.endswith('sitemap'):
+            children.append(loc.strip())
+        else:
+            entries.append(SitemapEntry(loc.strip(), lastmod.strip() if lastmod else None))
+    return entries, children
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime (date or full timestamp) as an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+async def fetch_sitemap_entries(client: HttpClient, sitemap_urls: Iterable[str] = SITEMAP_URLS,
+                                url_filter: Optional[Callable[[str], bool]] = None,
+                                max_files: int = SITEMAP_MAX_FILES) -> Dict[str, SitemapEntry]:
+    """Collect page entries from sitemaps, following sitemap indexes
+
+    Returns an empty dict when no sitemap could be read, so callers can fall
+    back to their stored crawl manifest.
+    """
+    pending = list(sitemap_urls)
+    seen = set()
+    entries: Dict[str, SitemapEntry] = {}
+    while pending and len(seen) < max_files:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        try:
+            # Never from the response cache: a stale copy would hide new lastmod values
+            async with client.get(sitemap_url, cache=False) as response:
+                if response.status != 200:
+                    logger.warning(f"Sitemap {sitemap_url} returned status {response.status}")
+                    continue
+                body = await response.read()
+            if sitemap_url.endswith('.gz'):
+                body = gzip.decompress(body)
+            page_entries, children = parse_sitemap(body.decode('utf-8'))
+        except Exception as e:
+            logger.warning(f"Could not read sitemap {sitemap_url}: {str(e)}")
+            continue
+        pending.extend(children)
+        for entry in page_entries:
+            if url_filter is None or url_filter(entry.url):
+                entries[entry.url] = entry
+    if pending:
+        logger.warning(f"Stopped after {max_files} sitemap files with {len(pending)} still queued")
+    logger.info(f"Read {len(entries)} relevant URLs from {len(seen)} sitemap files")
+    return entries
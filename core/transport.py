@@ -0,0 +1,322 @@
+from collections import Counter
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import atexit
+import base64
+import json
+import os
+import random
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from playwright.async_api import BrowserContext, Page, Route
+from yarl import URL
+from utils.logging import logger
+from core.config import (
+    TRANSPORT_MODE,
+    TRANSPORT_ARCHIVE,
+    REPLAY_LATENCY,
+    REPLAY_LATENCY_JITTER,
+    REPLAY_RECORDED_TIMING,
+    TRANSPORT_MAX_BODY
+)
+
+MODES = ('live', 'record', 'replay')
+
+# Recorded bodies are stored decoded, so these no longer describe them
+HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class TransportArchive:
+    """HAR 1.2 file of recorded responses, keyed by method and URL
+
+    Bodies are stored base64-encoded and already decompressed. The last
+    recording of a URL wins.
+    """
+
+    def __init__(self, path: Path = TRANSPORT_ARCHIVE):
+        self.path = path
+        self.entries: Dict[Tuple[str, str], Dict] = {}
+
+    def load(self) -> int:
+        """Read the archive if it exists and return the number of entries"""
+        if not self.path.exists():
+            return 0
+        data = json.loads(self.path.read_text())
+        for entry in data.get('log', {}).get('entries', []):
+            request = entry['request']
+            self.entries[(request['method'].upper(), request['url'])] = entry
+        return len(self.entries)
+
+    def add(self, method: str, url: str, status: int, headers: Iterable[Tuple[str, str]],
+            body: bytes, elapsed: float, status_text: str = ''):
+        headers = [(name, value) for name, value in headers if name.lower() not in HOP_HEADERS]
+        mime_type = next((value for name, value in headers if name.lower() == 'content-type'), '')
+        self.entries[(method.upper(), url)] = {
+            'startedDateTime': datetime.now(UTC).isoformat(),
+            'time': round(elapsed * 1000, 3),
+            'request': {
+                'method': method.upper(), 'url': url, 'httpVersion': 'HTTP/1.1',
+                'headers': [], 'queryString': [], 'cookies': [], 'headersSize': -1, 'bodySize': 0
+            },
+            'response': {
+                'status': status, 'statusText': status_text, 'httpVersion': 'HTTP/1.1',
+                'headers': [{'name': name, 'value': value} for name, value in headers],
+                'cookies': [],
+                'content': {
+                    'size': len(body), 'mimeType': mime_type,
+                    'text': base64.b64encode(body).decode('ascii'), 'encoding': 'base64'
+                },
+                'redirectURL': '', 'headersSize': -1, 'bodySize': len(body)
+            },
+            'cache': {},
+            'timings': {'send': 0, 'wait': round(elapsed * 1000, 3), 'receive': 0}
+        }
+
+    def find(self, method: str, url: str) -> Optional[Dict]:
+        return self.entries.get((method.upper(), url))
+
+    @staticmethod
+    def body(entry: Dict) -> bytes:
+        content = entry['response']['content']
+        text = content.get('text', '')
+        if content.get('encoding') == 'base64':
+            return base64.b64decode(text)
+        return text.encode('utf-8')
+
+    @staticmethod
+    def headers(entry: Dict) -> List[Tuple[str, str]]:
+        return [(header['name'], header['value']) for header in entry['response']['headers']]
+
+    def save(self):
+        """Atomically write every entry to the archive"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'log': {
+            'version': '1.2',
+            'creator': {'name': 'visionos-doc-scraper', 'version': '1.0'},
+            'entries': list(self.entries.values())
+        }}
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.path)
+
+
+class _BodyStream:
+    """The parts of aiohttp's StreamReader used by callers, over an in-memory body"""
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self._offset = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        end = len(self._body) if n < 0 else self._offset + n
+        chunk = self._body[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+    async def iter_chunked(self, n: int):
+        while self._offset < len(self._body):
+            yield await self.read(n)
+
+
+class ArchivedResponse:
+    """Stand-in for aiohttp.ClientResponse served from a transport archive"""
+
+    def __init__(self, url: str, status: int, headers: Iterable[Tuple[str, str]], body: bytes,
+                 method: str = 'GET'):
+        self.url = URL(url)
+        self.method = method
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.content = _BodyStream(body)
+        self.history = ()
+        self.request_info = aiohttp.RequestInfo(self.url, method, CIMultiDictProxy(CIMultiDict()), self.url)
+        self._body = body
+
+    @property
+    def charset(self) -> Optional[str]:
+        content_type = self.headers.get('Content-Type', '')
+        for param in content_type.split(';')[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'charset':
+                return value.strip('"')
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return self._body.decode(encoding or self.charset or 'utf-8', errors='replace')
+
+    async def json(self, **kwargs):
+        return json.loads(await self.text())
+
+    def release(self):
+        pass
+
+
+class Transport:
+    """Record or replay HTTP traffic for Playwright pages and HttpClient
+
+    In ``record`` mode every response is fetched live and captured into a HAR
+    archive; in ``replay`` mode responses are served from that archive with
+    injected latency and nothing reaches the network, which makes crawls
+    reproducible for benchmarks and profiling. ``live`` leaves traffic alone.
+    """
+
+    def __init__(self, mode: str = TRANSPORT_MODE, archive_path: Path = TRANSPORT_ARCHIVE,
+                 latency: float = REPLAY_LATENCY, jitter: float = REPLAY_LATENCY_JITTER,
+                 recorded_timing: bool = REPLAY_RECORDED_TIMING, max_body: int = TRANSPORT_MAX_BODY):
+        if mode not in MODES:
+            raise ValueError(f"Unknown transport mode {mode!r} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.archive = TransportArchive(archive_path)
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_timing = recorded_timing
+        self.max_body = max_body
+        self.stats: Counter = Counter()
+        self._unsaved = 0
+        if mode != 'live':
+            loaded = self.archive.load()
+            logger.info(f"Transport in {mode} mode with {loaded} archived responses from {archive_path}")
+        if mode == 'replay' and not self.archive.entries:
+            logger.warning(f"Transport archive {archive_path} is empty; every request will miss")
+        if mode == 'record':
+            atexit.register(self.save)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def replay_delay(self, entry: Dict) -> float:
+        """Seconds to wait before serving ``entry``"""
+        delay = self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if self.recorded_timing:
+            delay += entry.get('time', 0) / 1000
+        return delay
+
+    async def lookup(self, method: str, url: str) -> Optional[Dict]:
+        """Find a recorded response and wait out its injected latency"""
+        entry = self.archive.find(method, url)
+        if entry is None:
+            self.stats['misses'] += 1
+            logger.debug(f"No recorded response for {method} {url}")
+            return None
+        self.stats['hits'] += 1
+        delay = self.replay_delay(entry)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return entry
+
+    def record(self, method: str, url: str, status: int, headers: Iterable[Tuple[str, str]],
+               body: bytes, elapsed: float, status_text: str = '') -> bool:
+        if len(body) > self.max_body:
+            self.stats['too_large'] += 1
+            logger.debug(f"Not recording {url}: {len(body)} bytes exceeds {self.max_body}")
+            return False
+        self.archive.add(method, url, status, headers, body, elapsed, status_text)
+        self.stats['recorded'] += 1
+        self._unsaved += 1
+        return True
+
+    async def replay_response(self, url: str, method: str = 'GET') -> ArchivedResponse:
+        """Archived response for HttpClient, raising a connection error on a miss"""
+        entry = await self.lookup(method, url)
+        if entry is None:
+            raise aiohttp.ClientConnectionError(f"No recorded response for {method} {url}")
+        return ArchivedResponse(url, entry['response']['status'], TransportArchive.headers(entry),
+                                TransportArchive.body(entry), method)
+
+    async def record_response(self, response: aiohttp.ClientResponse,
+                              elapsed: float) -> Union[aiohttp.ClientResponse, ArchivedResponse]:
+        """Capture a live aiohttp response, returning a re-readable copy of it"""
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > self.max_body:
+            self.stats['too_large'] += 1
+            return response
+        body = await response.read()
+        url = str(response.url)
+        headers = list(response.headers.items())
+        if not self.record(response.method, url, response.status, headers, body, elapsed, response.reason or ''):
+            return response
+        return ArchivedResponse(url, response.status, headers, body, response.method)
+
+    async def install(self, target: Union[BrowserContext, Page]):
+        """Route every request of a context or page through the transport
+
+        Install before a ResourceBlocker so blocked requests never reach it.
+        """
+        if self.mode != 'live':
+            await target.route('**/*', self.handle)
+
+    async def fetch(self, route: Route) -> Optional[Tuple[int, List[Tuple[str, str]], bytes]]:
+        """Resolve a routed request to (status, headers, body), or None on a replay miss
+
+        Live and record modes fetch over the network, record mode also
+        capturing the response; replay mode serves it from the archive.
+        """
+        request = route.request
+        if self.replaying:
+            entry = await self.lookup(request.method, request.url)
+            if entry is None:
+                return None
+            return entry['response']['status'], TransportArchive.headers(entry), TransportArchive.body(entry)
+
+        started = asyncio.get_running_loop().time()
+        response = await route.fetch()
+        body = await response.body()
+        elapsed = asyncio.get_running_loop().time() - started
+        headers = [(header['name'], header['value']) for header in response.headers_array
+                   if header['name'].lower() not in HOP_HEADERS]
+        if self.recording:
+            self.record(request.method, request.url, response.status, headers, body, elapsed, response.status_text)
+        return response.status, headers, body
+
+    async def handle(self, route: Route):
+        result = await self.fetch(route)
+        if result is None:
+            await route.abort('internetdisconnected')
+            return
+        status, headers, body = result
+        await route.fulfill(status=status, headers=dict(headers), body=body)
+
+    def save(self):
+        """Write responses recorded since the last save to the archive"""
+        if self.recording and self._unsaved:
+            self.archive.save()
+            self._unsaved = 0
+            logger.info(f"Saved {len(self.archive.entries)} responses to {self.archive.path}")
+
+    def log_stats(self):
+        if self.mode == 'live':
+            return
+        logger.info(f"Transport ({self.mode}): {self.stats['hits']} replayed, {self.stats['misses']} missed, "
+                    f"{self.stats['recorded']} recorded, {self.stats['too_large']} too large to record")
+
+
+_transport: Optional[Transport] = None
+
+
+def get_transport() -> Transport:
+    """Process-wide transport shared by every HttpClient and page pool"""
+    global _transport
+    if _transport is None:
+        _transport = Transport()
+    return _transport
+
+
+def configure_transport(mode: str, archive_path: Path = TRANSPORT_ARCHIVE, **options) -> Transport:
+    """Replace the process-wide transport, e.g. from command-line flags"""
+    global _transport
+    if _transport is not None:
+        _transport.save()
+    _transport = Transport(mode, archive_path, **options)
+    return _transport
@@ -1,18 +1,60 @@
 from pathlib import Path
-from typing import Dict, Set, Optional, List, Any
+from typing import Dict, Set, Optional, List, Any, Tuple
 from bs4 import BeautifulSoup
 import aiohttp
 import re
 from dataclasses import dataclass
 import json
 from collections import defaultdict
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import async_playwright, Browser, Page
 import time
 import asyncio
 from utils.logging import logger
-from core.config import TEST_SAMPLE_COUNT, BASE_URLS, MAX_CRAWL_DEPTH
+from core.config import (
+    TEST_SAMPLE_COUNT,
+    BASE_URLS,
+    MAX_CRAWL_DEPTH,
+    MAX_CONCURRENT_PAGES,
+    DOWNLOAD_CHUNK_SIZE,
+    ARCHIVE_EXTRACT_MODE,
+    FETCH_STRATEGIES,
+    REQUIRED_DOCUMENTATION_SELECTORS,
+    SITEMAP_URLS,
+    CRAWL_PAGES_PER_PROCESS
+)
+from core.page_pool import PagePool
+from core.crawler import DocumentationCrawler, CrawlStats
+from core.crawl_journal import CrawlJournal, CrawlState
+from core.work_queue import WorkQueue
+from core.sitemap import fetch_sitemap_entries, parse_lastmod
+from core.resource_blocker import ResourceBlocker
+from core.page_readiness import PageReadiness
+from core.blob_store import BlobStore
+from core.write_behind import WriteBehindQueue
+from core.doc_index import DocumentationIndex
+from core.fetch_strategy import (
+    CHILD_PAGE_SELECTOR,
+    CODE_BLOCK_SELECTOR,
+    PAGE_CONTENT_SCRIPT,
+    StrategyFetcher,
+    docc_data_url
+)
+from core.http_client import HttpClient
+from core.transport import get_transport
+from core.response_cache import get_response_cache
+from core.html_parser import parse_html
+from core.project_archive import (
+    ArchiveProject,
+    archive_for,
+    diff_files,
+    file_hashes,
+    load_manifest,
+    save_manifest
+)
 import zipfile
-import io
+import hashlib
+import shutil
+import sys
 from datetime import datetime, UTC
 from models.base import ProjectResource
 from core.serialization import JSONSerializer
@@ -64,6 +106,7 @@ class DocumentationURLCollector:
         # Directory setup
         self.base_dir = base_dir
         self.projects_dir = base_dir / 'projects'
+        self.downloads_dir = self.projects_dir / '.downloads'
         self.debug_dir = base_dir / 'debug'
         self.cache_dir = base_dir / 'cache'
         
@@ -78,10 +121,19 @@ class DocumentationURLCollector:
             directory.mkdir(parents=True, exist_ok=True)
         
         # Initialize cache files
-        for cache_file in [self.url_cache, self.samples_cache, self.doc_cache, self.analysis_cache]:
+        for cache_file in [self.samples_cache, self.doc_cache, self.analysis_cache]:
             if not cache_file.exists():
                 cache_file.write_text('{}')
 
+        # Raw pages and debug dumps, compressed and deduplicated by content
+        self.blobs = BlobStore(self.cache_dir / 'blobs')
+        # Cache and debug writes run on a worker thread, off the event loop
+        self.writer = WriteBehindQueue()
+
+        # Per-URL crawl state, replacing processed_urls in url_cache.json
+        self.journal = CrawlJournal(self.cache_dir / 'crawl_journal.sqlite3')
+        self.journal.import_legacy_url_cache(self.url_cache)
+
         self.logged_samples = set()
 
         # Add new cache paths without modifying existing ones
@@ -95,6 +147,20 @@ class DocumentationURLCollector:
                 'cached_at': datetime.now(UTC).isoformat(),
                 'pages': {}
             }))
+        self.doc_index = DocumentationIndex(self.documentation_content_cache)
+
+        # Abort images, fonts, media and analytics on every browser page
+        self.blocker = ResourceBlocker()
+        # Wait for extracted selectors rather than network idle
+        self.readiness = PageReadiness()
+
+        # HTTP-first page fetching with browser fallback
+        self.fetcher = StrategyFetcher.from_names(
+            FETCH_STRATEGIES,
+            {key: self.DOCUMENTATION_SELECTORS[key] for key in REQUIRED_DOCUMENTATION_SELECTORS},
+            lambda page, url: self._extract_page_content(page, url, 'documentation'),
+            self.readiness
+        )
 
     def is_relevant_url(self, url: str) -> bool:
         """Check if URL is relevant for visionOS development"""
@@ -128,8 +194,12 @@ class DocumentationURLCollector:
                 
         return False
 
-    async def get_documentation_links(self, base_url: str) -> Dict[str, Set[str]]:
-        """Get documentation links and cache pages"""
+    async def get_documentation_links(self, base_url: str, concurrency: int = MAX_CONCURRENT_PAGES) -> Dict[str, Set[str]]:
+        """Get documentation links and cache pages
+        
+        Relevant URLs found on the base page are pushed onto an asyncio work
+        queue and processed by ``concurrency`` workers sharing a PagePool.
+        """
         links = defaultdict(set)
         processed_urls = set()
         
@@ -139,140 +209,44 @@ class DocumentationURLCollector:
                 browser = await p.chromium.launch()
                 logger.debug("Browser launched successfully")
                 
-                # Step 1: Initial page setup
-                collector_page = await browser.new_page()
-                try:
-                    logger.debug(f"Navigating to base URL: {base_url}")
-                    await collector_page.goto(base_url)
-                    await collector_page.wait_for_load_state('networkidle')
+                async with PagePool(browser, size=concurrency, blocker=self.blocker) as pool:
+                    # Step 1: Initial page setup
+                    async with pool.page() as collector_page:
+                        logger.debug(f"Navigating to base URL: {base_url}")
+                        await self.readiness.goto(collector_page, base_url)
+                        self.blocker.report(collector_page, base_url)
+                        
+                        # Collect initial URLs
+                        all_links = await collector_page.query_selector_all('a[href]')
+                        urls_to_process = set()
+                        
+                        for link in all_links:
+                            href = await link.get_attribute('href')
+                            if href:
+                                abs_url = self._make_absolute_url(href)
+                                if self.is_relevant_url(abs_url):
+                                    urls_to_process.add(abs_url)
+                                    if 'introductory-visionos-samples' in abs_url:
+                                        logger.debug(f"Found intro samples page: {abs_url}")
                     
-                    # Collect initial URLs
-                    all_links = await collector_page.query_selector_all('a[href]')
-                    urls_to_process = set()
+                        logger.info(f"Found {len(urls_to_process)} relevant URLs to process")
                     
-                    for link in all_links:
-                        href = await link.get_attribute('href')
-                        if href:
-                            abs_url = self._make_absolute_url(href)
-                            if self.is_relevant_url(abs_url):
-                                urls_to_process.add(abs_url)
-                                if 'introductory-visionos-samples' in abs_url:
-                                    logger.debug(f"Found intro samples page: {abs_url}")
-                
-                    logger.info(f"Found {len(urls_to_process)} relevant URLs to process")
+                    # Step 2: Process URLs in parallel through a work queue
+                    queue: asyncio.Queue = asyncio.Queue()
+                    scheduled = set(urls_to_process)
+                    for url in urls_to_process:
+                        queue.put_nowait(('page', url))
                     
-                finally:
-                    await collector_page.close()
-
-                # Step 2: Process each URL with its own page
-                for url in urls_to_process:
-                    if url in processed_urls:
-                        logger.debug(f"Skipping already processed URL: {url}")
-                        continue
-                        
-                    logger.debug(f"\nProcessing URL: {url}")
-                    page = await browser.new_page()
+                    workers = [
+                        asyncio.create_task(self._link_worker(pool, queue, links, processed_urls, scheduled))
+                        for _ in range(concurrency)
+                    ]
                     try:
-                        logger.debug(f"Navigating to: {url}")
-                        await page.goto(url)
-                        await page.wait_for_load_state('networkidle')
-                        
-                        # Special handling for intro samples page
-                        if 'introductory-visionos-samples' in url:
-                            logger.info(f"Processing intro samples page: {url}")
-                            
-                            # Debug: Save the page content
-                            content = await page.content()
-                            debug_path = self.debug_dir / "intro_samples_page.html"
-                            debug_path.write_text(content)
-                            logger.debug(f"Saved intro page content to {debug_path}")
-                            
-                            # Find all sample page links
-                            sample_page_links = await page.query_selector_all('div.section-content a.link')
-                            logger.debug(f"Found {len(sample_page_links)} sample page links")
-                            
-                            # Visit each sample page
-                            for link in sample_page_links:
-                                href = await link.get_attribute('href')
-                                if href:
-                                    sample_page_url = self._make_absolute_url(href)
-                                    logger.debug(f"Visiting sample page: {sample_page_url}")
-                                    
-                                    # Create new page for each sample
-                                    sample_page = await browser.new_page()
-                                    try:
-                                        await sample_page.goto(sample_page_url)
-                                        await sample_page.wait_for_load_state('networkidle')
-                                        
-                                        # Use the same selector that works for other samples
-                                        download_buttons = await sample_page.query_selector_all('a.button-cta.sample-download')
-                                        for button in download_buttons:
-                                            download_href = await button.get_attribute('href')
-                                            if download_href and 'docs-assets.developer.apple.com' in download_href and download_href.endswith('.zip'):
-                                                logger.info(f"Found sample download from intro page: {download_href}")
-                                                links['samples'].add(self._make_absolute_url(download_href))
-                                    finally:
-                                        await sample_page.close()
-                        
-                        # Also get links with {} icons
-                        nav_items = await page.query_selector_all('article.article-content a')
-                        for item in nav_items:
-                            text = await item.text_content()
-                            if text and '{' in text:
-                                href = await item.get_attribute('href')
-                                if href:
-                                    sample_url = self._make_absolute_url(href)
-                                    if sample_url not in processed_urls:
-                                        # Create a new page for each sample
-                                        sample_page = await browser.new_page()
-                                        try:
-                                            await sample_page.goto(sample_url)
-                                            await sample_page.wait_for_load_state('networkidle')
-                                            
-                                            # Now look for the actual download button on the sample page
-                                            download_buttons = await sample_page.query_selector_all('a.button-cta.sample-download')
-                                            for button in download_buttons:
-                                                download_href = await button.get_attribute('href')
-                                                if download_href and 'docs-assets.developer.apple.com' in download_href and download_href.endswith('.zip'):
-                                                    logger.info(f"Found sample download from intro page: {download_href}")
-                                                    links['samples'].add(self._make_absolute_url(download_href))
-                                        finally:
-                                            await sample_page.close()
-                        
-                        # Look for sample download buttons
-                        download_buttons = await page.query_selector_all('a.button-cta.sample-download')
-                        for button in download_buttons:
-                            href = await button.get_attribute('href')
-                            if href and 'docs-assets.developer.apple.com' in href and href.endswith('.zip'):
-                                logger.info(f"Found sample download: {href}")
-                                links['samples'].add(self._make_absolute_url(href))
-                        
-                        # Track frameworks and tools
-                        if "/documentation/visionos" in url.lower():
-                            links['documentation'].add(url)
-                            logger.debug(f"Added to documentation: {url}")
-                        
-                        for framework in self.ESSENTIAL_FRAMEWORKS:
-                            if f"/documentation/{framework.lower()}" in url.lower():
-                                links['frameworks'].add(url)
-                                logger.debug(f"Added to frameworks: {url}")
-                                break
-                        
-                        if any(term in url.lower() for term in self.REALITY_COMPOSER_TERMS):
-                            links['tools'].add(url)
-                            logger.debug(f"Added to tools: {url}")
-                        
-                        processed_urls.add(url)
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing URL {url}: {str(e)}")
-                        logger.debug("Error details:", exc_info=True)
+                        await queue.join()
                     finally:
-                        logger.debug(f"Closing page for URL: {url}")
-                        await page.close()
-                
-                logger.debug("Closing browser")
-                await browser.close()
+                        for worker in workers:
+                            worker.cancel()
+                        await asyncio.gather(*workers, return_exceptions=True)
                 
                 # Log summary
                 logger.info("\nURL Discovery Summary:")
@@ -281,11 +255,21 @@ class DocumentationURLCollector:
                     for url in urls:
                         logger.debug(f"  {category}: {url}")
                 
-                # Add caching for discovered URLs:
-                for category, urls in links.items():
-                    if category in ['documentation', 'frameworks', 'tools']:
-                        for url in urls:
-                            await self.cache_documentation_page(url, category)
+                # Add caching for discovered URLs, reusing the same browser
+                seeds = [
+                    (url, category)
+                    for category, urls in links.items()
+                    if category in ['documentation', 'frameworks', 'tools']
+                    for url in sorted(urls)
+                ]
+                if seeds:
+                    await self.cache_documentation_pages(seeds, browser=browser)
+                self.blocker.log_stats()
+                self.readiness.log_stats()
+                await self.writer.flush()
+                
+                logger.debug("Closing browser")
+                await browser.close()
                         
                 return dict(links)
                 
@@ -294,6 +278,104 @@ class DocumentationURLCollector:
             logger.debug("Error details:", exc_info=True)
             return dict(links)
 
+    async def _link_worker(self, pool: PagePool, queue: asyncio.Queue, links: Dict[str, Set[str]],
+                           processed_urls: Set[str], scheduled: Set[str]):
+        """Pull URLs off the discovery queue until cancelled"""
+        while True:
+            kind, url = await queue.get()
+            try:
+                async with pool.page() as page:
+                    if kind == 'sample':
+                        await self._collect_sample_downloads(page, url, links)
+                    else:
+                        await self._process_discovered_url(page, url, queue, links, processed_urls, scheduled)
+            except Exception as e:
+                logger.error(f"Error processing URL {url}: {str(e)}")
+                logger.debug("Error details:", exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def _process_discovered_url(self, page: Page, url: str, queue: asyncio.Queue, links: Dict[str, Set[str]],
+                                      processed_urls: Set[str], scheduled: Set[str]):
+        """Categorize a relevant URL and queue the sample pages it links to"""
+        if url in processed_urls:
+            logger.debug(f"Skipping already processed URL: {url}")
+            return
+            
+        logger.debug(f"\nProcessing URL: {url}")
+        logger.debug(f"Navigating to: {url}")
+        await self.readiness.goto(page, url)
+        self.blocker.report(page, url)
+        
+        sample_page_urls = []
+        
+        # Special handling for intro samples page
+        if 'introductory-visionos-samples' in url:
+            logger.info(f"Processing intro samples page: {url}")
+            
+            # Debug: Save the page content
+            content = await page.content()
+            await self.writer.submit(self.blobs.put, 'raw', url, content, meta={'source': 'intro_samples_page'})
+            logger.debug(f"Queued intro page content for {url}")
+            
+            # Find all sample page links
+            sample_page_links = await page.query_selector_all('div.section-content a.link')
+            logger.debug(f"Found {len(sample_page_links)} sample page links")
+            for link in sample_page_links:
+                href = await link.get_attribute('href')
+                if href:
+                    sample_page_urls.append(self._make_absolute_url(href))
+        
+        # Also get links with {} icons
+        nav_items = await page.query_selector_all('article.article-content a')
+        for item in nav_items:
+            text = await item.text_content()
+            if text and '{' in text:
+                href = await item.get_attribute('href')
+                if href:
+                    sample_page_urls.append(self._make_absolute_url(href))
+        
+        # Visit each sample page through the shared queue
+        for sample_url in sample_page_urls:
+            if sample_url not in processed_urls and sample_url not in scheduled:
+                scheduled.add(sample_url)
+                logger.debug(f"Queueing sample page: {sample_url}")
+                queue.put_nowait(('sample', sample_url))
+        
+        # Look for sample download buttons
+        await self._collect_sample_downloads(page, None, links)
+        
+        # Track frameworks and tools
+        if "/documentation/visionos" in url.lower():
+            links['documentation'].add(url)
+            logger.debug(f"Added to documentation: {url}")
+        
+        for framework in self.ESSENTIAL_FRAMEWORKS:
+            if f"/documentation/{framework.lower()}" in url.lower():
+                links['frameworks'].add(url)
+                logger.debug(f"Added to frameworks: {url}")
+                break
+        
+        if any(term in url.lower() for term in self.REALITY_COMPOSER_TERMS):
+            links['tools'].add(url)
+            logger.debug(f"Added to tools: {url}")
+        
+        processed_urls.add(url)
+
+    async def _collect_sample_downloads(self, page: Page, url: Optional[str], links: Dict[str, Set[str]]):
+        """Record sample ZIP download buttons, navigating to ``url`` first if given"""
+        if url is not None:
+            logger.debug(f"Visiting sample page: {url}")
+            await self.readiness.goto(page, url)
+            self.blocker.report(page, url)
+            
+        download_buttons = await page.query_selector_all('a.button-cta.sample-download')
+        for button in download_buttons:
+            href = await button.get_attribute('href')
+            if href and 'docs-assets.developer.apple.com' in href and href.endswith('.zip'):
+                logger.info(f"Found sample download: {href}")
+                links['samples'].add(self._make_absolute_url(href))
+
     async def _process_page_for_samples(self, page, url: str, links: Dict[str, Set[str]], processed_urls: Set[str]):
         """Process a single page for sample downloads"""
         if url in processed_urls:
@@ -323,11 +405,10 @@ class DocumentationURLCollector:
             
             # Save debug content
             content = await page.content()
-            debug_path = self.debug_dir / f"raw_{url.split('/')[-1]}.html"
-            debug_path.write_text(content)
+            await self.writer.submit(self.blobs.put, 'raw', url, content, meta={'source': 'samples_page'})
             
             # Process documentation structure
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = parse_html(content)
             self._analyze_documentation_structure(soup, links)
             
         except Exception as e:
@@ -381,7 +462,11 @@ class DocumentationURLCollector:
             async with async_playwright() as p:
                 browser = await p.chromium.launch()
                 page = await browser.new_page()
-                await page.goto(url)
+                await get_transport().install(page)
+                await get_response_cache().install(page)
+                await self.blocker.install(page)
+                await self.readiness.goto(page, url)
+                self.blocker.report(page, url)
                 
                 # Get the documentation page title
                 title_elem = await page.query_selector('h1')
@@ -451,42 +536,239 @@ class DocumentationURLCollector:
             return 'design'
         return 'other'
 
-    async def download_project(self, project: ProjectResource) -> bool:
-        """Download and extract a project"""
+    async def download_project(self, project: ProjectResource, client: Optional[HttpClient] = None,
+                               refresh: bool = False) -> bool:
+        """Download and extract a project
+        
+        The archive is streamed to ``projects/.downloads/<name>.zip.part`` in
+        DOWNLOAD_CHUNK_SIZE chunks, so memory use does not grow with archive
+        size. An interrupted download is resumed with an HTTP Range request on
+        the next attempt (guarded by If-Range, see ``_stream_archive``), and
+        the archive's SHA-256 is stored on the project. An archive that fails
+        to extract is deleted rather than resumed or reused.
+        
+        Depending on ARCHIVE_EXTRACT_MODE only ARCHIVE_EXTRACT_EXTENSIONS are
+        extracted, nothing is (analyzers read from the ZIP), or everything is.
+        Only the ``lazy`` mode keeps the archive, in ``projects/.archives``;
+        otherwise it is deleted once extracted.
+        
+        A manifest in ``projects/.archives`` records the archive's ETag,
+        Last-Modified and SHA-256 plus a hash per project file. With
+        ``refresh`` an existing project is revalidated with a conditional GET;
+        it is only re-extracted when the archive's hash changed, and the
+        manifest then lists the added, modified and removed files.
+        """
         if not project.download_url:
             return False
             
-        # Check if already downloaded
         project_name = re.sub(r'[^\w\-_]', '_', project.title)
         project_dir = self.projects_dir / project_name
-        if project_dir.exists():
+        archive_path = archive_for(project_dir)
+        manifest = load_manifest(project_dir)
+        present = project_dir.exists() and (
+            any(project_dir.iterdir()) or archive_path.exists() or 'archive' in manifest
+        )
+        if present and not refresh:
+            project.checksum = project.checksum or manifest.get('archive', {}).get('sha256')
             project.mark_downloaded(project_dir)
             logger.debug(f"Project already downloaded: {project_dir}")
             return True
             
+        archive_info = manifest.get('archive', {})
+        validators = {}
+        if present:
+            if archive_info.get('etag'):
+                validators['If-None-Match'] = archive_info['etag']
+            if archive_info.get('last_modified'):
+                validators['If-Modified-Since'] = archive_info['last_modified']
+            
+        part_path = self.downloads_dir / f"{project_name}.zip.part"
+        source = part_path
+        downloaded = False
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(project.download_url) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        
-                        # Create project directory
-                        project_dir = self.projects_dir / project_name
-                        project_dir.mkdir(exist_ok=True)
-                        
-                        # Extract zip content
-                        with zipfile.ZipFile(io.BytesIO(content)) as zip_ref:
-                            zip_ref.extractall(project_dir)
-                            
-                        project.mark_downloaded(project_dir)
-                        self._cache_doc_relationship(project)
-                        return True
+            if client is None:
+                async with HttpClient() as own_client:
+                    result = await self._stream_archive(own_client, project.download_url, part_path, validators)
+            else:
+                result = await self._stream_archive(client, project.download_url, part_path, validators)
+            
+            checked_at = datetime.now(UTC).isoformat()
+            if result is None:
+                logger.info(f"Sample archive not modified: {project.title}")
+                manifest['archive'] = {**archive_info, 'checked_at': checked_at}
+                manifest['changes'] = {'added': [], 'modified': [], 'removed': []}
+                save_manifest(project_dir, manifest)
+                project.checksum = archive_info.get('sha256')
+                project.mark_downloaded(project_dir)
+                return True
+            
+            checksum, response_validators = result
+            downloaded = True
+            manifest['archive'] = {
+                'url': project.download_url,
+                'sha256': checksum,
+                'etag': response_validators.get('ETag'),
+                'last_modified': response_validators.get('Last-Modified'),
+                'checked_at': checked_at,
+            }
+            project.checksum = checksum
+            if present and checksum == archive_info.get('sha256'):
+                # Same bytes under new validators: keep the extracted files
+                logger.info(f"Sample archive unchanged (same SHA-256): {project.title}")
+                part_path.unlink(missing_ok=True)
+                manifest['changes'] = {'added': [], 'modified': [], 'removed': []}
+                save_manifest(project_dir, manifest)
+                project.mark_downloaded(project_dir)
+                return True
+                
+            if ARCHIVE_EXTRACT_MODE == 'lazy':
+                # Analyzers read this project straight from the retained archive
+                archive_path.parent.mkdir(parents=True, exist_ok=True)
+                part_path.replace(archive_path)
+                source = archive_path
+            
+            # Extract into a working directory, then swap it in for the old files
+            tmp_dir = self.projects_dir / f".{project_name}.extracting"
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir)
+            tmp_dir.mkdir()
+            if ARCHIVE_EXTRACT_MODE == 'full':
+                with zipfile.ZipFile(source) as zip_ref:
+                    zip_ref.extractall(tmp_dir)
+            elif ARCHIVE_EXTRACT_MODE == 'selective':
+                with ArchiveProject(source, project_dir) as archive:
+                    archive.extract_selected(tmp_dir)
+            files = file_hashes(source, selected_only=ARCHIVE_EXTRACT_MODE != 'full')
+            if project_dir.exists():
+                shutil.rmtree(project_dir)
+            tmp_dir.rename(project_dir)
+            if source is part_path:
+                # Refreshes compare the manifest's SHA-256 and file hashes, not the ZIP
+                self._discard_part(part_path)
+                archive_path.unlink(missing_ok=True)
+            
+            manifest['changes'] = diff_files(manifest.get('files', {}), files)
+            manifest['files'] = files
+            save_manifest(project_dir, manifest)
+            changes = manifest['changes']
+            logger.info(f"Extracted {project.title}: {len(changes['added'])} added, "
+                        f"{len(changes['modified'])} modified, {len(changes['removed'])} removed files")
+            
+            project.mark_downloaded(project_dir)
+            self._cache_doc_relationship(project)
+            return True
                         
         except Exception as e:
             logger.error(f"Error downloading project: {str(e)}")
+            if downloaded:
+                # A complete but unusable archive must not be resumed or reused
+                self._discard_part(part_path)
+                if source is archive_path:
+                    archive_path.unlink(missing_ok=True)
+                shutil.rmtree(self.projects_dir / f".{project_name}.extracting", ignore_errors=True)
             
         return False
 
+    async def _stream_archive(self, client: HttpClient, url: str, part_path: Path,
+                              validators: Optional[Dict[str, str]] = None) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Stream ``url`` into ``part_path``, resuming a partial file
+        
+        The ETag and Last-Modified of the response that started ``part_path``
+        are kept next to it, and a resume sends them as If-Range so a changed
+        archive comes back whole (200) instead of being appended to old bytes;
+        a 206 whose validators differ anyway is not appended either. A partial
+        file without validators, or one the server rejects with 416, is
+        downloaded again from the start.
+        
+        Returns the archive's SHA-256 and its ETag/Last-Modified headers, or
+        None when the conditional ``validators`` got a 304 Not Modified.
+        """
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        part_validators = self._load_part_validators(part_path) if offset else {}
+        if_range = part_validators.get('ETag') or part_validators.get('Last-Modified')
+        if offset and not if_range:
+            logger.debug(f"Discarding partial download without validators: {part_path}")
+            self._discard_part(part_path)
+            offset = 0
+        headers = dict(validators or {})
+        if offset:
+            headers.update({'Range': f"bytes={offset}-", 'If-Range': if_range})
+        
+        async with client.get(url, headers=headers) as response:
+            if response.status == 304 and validators:
+                # The extracted project is current, so a partial newer download is moot
+                self._discard_part(part_path)
+                return None
+            if response.status == 416 and offset:
+                # The partial file is not a prefix of the current archive
+                logger.info(f"Server rejected resume of {url}, downloading it again")
+                self._discard_part(part_path)
+                return await self._stream_archive(client, url, part_path, validators)
+            
+            resumed = (
+                response.status == 206
+                and response.headers.get('Content-Range', '').startswith(f"bytes {offset}-")
+            )
+            if resumed and any(response.headers.get(name, value) != value
+                               for name, value in part_validators.items()):
+                # Servers that ignore If-Range still name the archive they sent
+                logger.info(f"Archive changed since the partial download of {url}, downloading it again")
+                self._discard_part(part_path)
+                return await self._stream_archive(client, url, part_path, validators)
+            if response.status not in (200, 206) or (response.status == 206 and not resumed):
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history,
+                    status=response.status, message=f"Unexpected response for {url}"
+                )
+            
+            if resumed:
+                logger.info(f"Resuming download of {url} at byte {offset}")
+                response_validators = part_validators
+                digest = self._file_digest(part_path)
+                mode = 'ab'
+            else:
+                response_validators = {name: response.headers[name] for name in ('ETag', 'Last-Modified')
+                                       if name in response.headers}
+                self._part_validators_path(part_path).write_text(json.dumps(response_validators))
+                digest = hashlib.sha256()
+                mode = 'wb'
+            
+            with open(part_path, mode) as f:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    
+        self._part_validators_path(part_path).unlink(missing_ok=True)
+        return digest.hexdigest(), response_validators
+
+    @staticmethod
+    def _part_validators_path(part_path: Path) -> Path:
+        return part_path.with_name(f"{part_path.name}.json")
+
+    def _load_part_validators(self, part_path: Path) -> Dict[str, str]:
+        try:
+            return json.loads(self._part_validators_path(part_path).read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _discard_part(self, part_path: Path):
+        """Remove a partial download and the validators recorded for it"""
+        part_path.unlink(missing_ok=True)
+        self._part_validators_path(part_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def _file_digest(path: Path):
+        """Hash an existing file in chunks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest
+
+    def _file_checksum(self, path: Path) -> str:
+        return self._file_digest(path).hexdigest()
+
     def _normalize_url(self, url: str) -> str:
         """Normalize a URL by removing fragments and query parameters"""
         # Remove fragment
@@ -580,6 +862,8 @@ class DocumentationURLCollector:
             if cache_file.exists():
                 logger.info(f"Removing {cache_file}")
                 cache_file.unlink()
+        logger.info(f"Resetting crawl journal {self.journal.db_path}")
+        self.journal.reset()
         logger.info("Cache cleared")
 
     def inspect_cache(self):
@@ -673,161 +957,272 @@ class DocumentationURLCollector:
         return relationships
 
     async def cache_documentation_page(self, url: str, category: str = 'documentation', visited_urls: Set[str] = None, current_depth: int = 0, max_depth: int = None) -> bool:
-        """Cache a documentation page with full dynamic content and recursively process child pages
+        """Cache a documentation page with full dynamic content and crawl its child pages
         
         Args:
             url: The documentation page URL to cache
             category: The category of documentation
             visited_urls: Set of already visited URLs to prevent loops
-            current_depth: Current recursion depth
+            current_depth: Depth of ``url`` within an enclosing crawl
             max_depth: Maximum depth to traverse (default MAX_CRAWL_DEPTH)
         """
         if max_depth is None:
             max_depth = MAX_CRAWL_DEPTH
             
-        if visited_urls is None:
-            visited_urls = set()
-            self.depth_stats = defaultdict(set)  # Track URLs at each depth
-            
-        if url in visited_urls:
-            logger.debug(f"Skipping already visited URL: {url}")
-            return True
-            
         if current_depth > max_depth:
             logger.debug(f"Reached max depth ({max_depth}) at URL: {url}")
             return True
             
-        visited_urls.add(url)
-        self.depth_stats[current_depth].add(url)
+        if visited_urls is not None and url in visited_urls:
+            logger.debug(f"Skipping already visited URL: {url}")
+            return True
+            
+        stats = await self.cache_documentation_pages(
+            [(url, category)],
+            visited_urls=visited_urls,
+            max_depth=max_depth - current_depth
+        )
+        return url not in stats.failed
+
+    async def cache_documentation_pages(self, seeds: List[Tuple[str, str]], browser: Browser = None,
+                                        visited_urls: Set[str] = None, max_depth: int = None) -> CrawlStats:
+        """Crawl (url, category) seeds breadth-first with a single shared browser
         
-        try:
-            logger.info(f"\nCaching documentation page ({category}) [Depth {current_depth}/{max_depth}]: {url}")
-            safe_name = re.sub(r'[^\w\-_]', '_', url.split('/')[-1])
-            file_path = self.documentation_content_dir / f"{safe_name}.json"
+        Args:
+            seeds: Pages to start from and the category recorded for them and their children
+            browser: Already running browser to reuse; one is launched if omitted
+            visited_urls: Set of already visited URLs, updated in place
+            max_depth: Maximum depth to traverse (default MAX_CRAWL_DEPTH)
+        """
+        crawler = DocumentationCrawler(
+            self._cache_page_content,
+            max_depth=MAX_CRAWL_DEPTH if max_depth is None else max_depth,
+            journal=self.journal,
+            blocker=self.blocker
+        )
+        if visited_urls is not None:
+            crawler.visited = visited_urls
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch()
-                page = await browser.new_page()
-                
-                try:
-                    # Navigate and wait for dynamic content
-                    logger.debug(f"Navigating to: {url}")
-                    await page.goto(url)
-                    await page.wait_for_load_state('networkidle')
-                    
-                    # Save raw HTML for debugging
-                    debug_path = self.debug_dir / f"doc_page_{safe_name}.html"
-                    debug_path.write_text(await page.content())
-                    logger.debug(f"Saved raw HTML to {debug_path}")
-                    
-                    # Extract current page content
-                    content = await self._extract_page_content(page, url, category)
-                    
-                    # Save the content
-                    file_path.write_text(json.dumps(content, indent=2))
-                    
-                    # Update cache index
-                    cache_data = self._load_doc_content_cache()
-                    cache_data['pages'][url] = {
-                        'local_path': str(file_path),
-                        'category': category,
-                        'cached_at': datetime.now(UTC).isoformat(),
-                        'title': content.get('title', ''),
-                        'type': content.get('type', ''),
-                        'description': content.get('description', ''),
-                        'child_pages': content.get('child_pages', [])
-                    }
-                    self._save_doc_content_cache(cache_data)
-                    
-                    # Visit each child page
-                    for child_url in content.get('child_pages', []):
-                        if child_url not in visited_urls:
-                            logger.debug(f"Visiting child page: {child_url}")
-                            child_page = await browser.new_page()
-                            try:
-                                await self.cache_documentation_page(
-                                    child_url, 
-                                    category, 
-                                    visited_urls,
-                                    current_depth + 1,
-                                    max_depth
-                                )
-                            finally:
-                                await child_page.close()
-                    
-                    logger.info(f"Successfully cached documentation page: {content.get('title', url)}")
-                    logger.debug(f"Content extracted: {json.dumps(content, indent=2)}")
-                    return True
-                    
-                finally:
-                    await page.close()
-                    await browser.close()
+        try:
+            if browser is not None:
+                stats = await crawler.crawl(browser, seeds)
+            else:
+                async with async_playwright() as p:
+                    browser = await p.chromium.launch()
+                    try:
+                        stats = await crawler.crawl(browser, seeds)
+                    finally:
+                        await browser.close()
+                        self.blocker.log_stats()
+                        self.readiness.log_stats()
+        finally:
+            await self.writer.submit(self.doc_index.checkpoint)
+            await self.writer.flush()
+            self.fetcher.log_stats()
+            self.blobs.log_stats()
+            await self.fetcher.close()
                     
-        except Exception as e:
-            logger.error(f"Error caching documentation page {url}: {str(e)}")
-            logger.debug("Error details:", exc_info=True)
-            return False
+        self.depth_stats = stats.depth_pages
+        return stats
 
-        # After processing all child pages, log depth statistics if we're at the root
-        if current_depth == 0:
-            logger.info("\n=== Documentation Crawl Statistics ===")
-            total_pages = sum(len(urls) for urls in self.depth_stats.values())
-            logger.info(f"Total pages processed: {total_pages}")
-            for depth, urls in sorted(self.depth_stats.items()):
-                logger.info(f"Depth {depth}: {len(urls)} pages")
-                for url in urls:
-                    logger.debug(f"  - {url}")
-            logger.info("===================================\n")
+    async def cache_documentation_queue(self, queue: WorkQueue, worker: str, browser: Browser = None,
+                                        pages: int = CRAWL_PAGES_PER_PROCESS) -> CrawlStats:
+        """Crawl pages leased from a WorkQueue shared with other worker processes
+        
+        Index entries are only appended to the log here; compacting it while
+        other workers append would drop their entries, so the supervisor
+        checkpoints the index once every worker has exited.
+        """
+        self.doc_index.compact_every = sys.maxsize
+        crawler = DocumentationCrawler(
+            self._cache_page_content,
+            workers=pages,
+            max_depth=MAX_CRAWL_DEPTH if queue.max_depth is None else queue.max_depth,
+            journal=self.journal,
+            blocker=self.blocker
+        )
+        try:
+            if browser is not None:
+                stats = await crawler.crawl_queue(browser, queue, worker)
+            else:
+                async with async_playwright() as p:
+                    browser = await p.chromium.launch()
+                    try:
+                        stats = await crawler.crawl_queue(browser, queue, worker)
+                    finally:
+                        await browser.close()
+                        self.blocker.log_stats()
+                        self.readiness.log_stats()
+        finally:
+            await self.writer.flush()
+            self.fetcher.log_stats()
+            self.blobs.log_stats()
+            await self.fetcher.close()
+        return stats
+
+    def _crawl_category(self, url: str) -> str:
+        """Crawl category for a page first seen outside discovery (e.g. in a sitemap)"""
+        url_lower = url.lower()
+        if any(term in url_lower for term in self.REALITY_COMPOSER_TERMS):
+            return 'tools'
+        if any(f"/documentation/{framework.lower()}" in url_lower for framework in self.ESSENTIAL_FRAMEWORKS):
+            return 'frameworks'
+        return 'documentation'
+
+    async def plan_incremental_crawl(self, sitemap_urls: List[str] = SITEMAP_URLS,
+                                     client: Optional[HttpClient] = None) -> Dict[str, Dict[str, Optional[str]]]:
+        """Split sitemap URLs into new, changed and unchanged pages using the crawl journal
+        
+        A known page is changed when its sitemap ``lastmod`` is newer than the
+        lastmod recorded for it, or than its last extraction when none was
+        recorded. Pages without a lastmod are revalidated by content hash.
+        Without a readable sitemap every journaled documentation page is
+        revalidated that way.
+        
+        Returns:
+            Dict of 'new', 'changed' and 'unchanged' mapping URL -> lastmod
+        """
+        if client is None:
+            async with HttpClient() as own_client:
+                return await self.plan_incremental_crawl(sitemap_urls, own_client)
+        
+        plan: Dict[str, Dict[str, Optional[str]]] = {'new': {}, 'changed': {}, 'unchanged': {}}
+        entries = await fetch_sitemap_entries(client, sitemap_urls, self.is_relevant_url)
+        if not entries:
+            logger.warning("No sitemap entries available, revalidating journaled pages by content hash")
+            for category in ['documentation', 'frameworks', 'tools']:
+                for url in self.journal.urls(category=category):
+                    plan['changed'][url] = None
+            return plan
+        
+        for url, entry in entries.items():
+            known = self.journal.get(url)
+            if known is None:
+                plan['new'][url] = entry.lastmod
+                continue
+            lastmod = parse_lastmod(entry.lastmod)
+            seen_at = parse_lastmod(known['lastmod']) or parse_lastmod(known['updated_at'])
+            if known['state'] != CrawlState.EXTRACTED.value or lastmod is None or seen_at is None or lastmod > seen_at:
+                plan['changed'][url] = entry.lastmod
+            else:
+                plan['unchanged'][url] = entry.lastmod
+        
+        logger.info(f"Incremental plan: {len(plan['new'])} new, {len(plan['changed'])} changed, "
+                    f"{len(plan['unchanged'])} unchanged pages")
+        return plan
+
+    async def refresh_changed_pages(self, sitemap_urls: List[str] = SITEMAP_URLS,
+                                    browser: Browser = None) -> CrawlStats:
+        """Re-crawl only new and changed pages and invalidate what was derived from them"""
+        plan = await self.plan_incremental_crawl(sitemap_urls)
+        refresh = {**plan['new'], **plan['changed']}
+        for url, lastmod in plan['unchanged'].items():
+            if lastmod:
+                self.journal.set_lastmod(url, lastmod)
+        if not refresh:
+            logger.info("No new or changed documentation pages")
+            return CrawlStats(finished_at=time.monotonic())
+        
+        # Changed pages (and their DocC JSON) must come from the network, not the response cache
+        response_cache = get_response_cache()
+        for url in plan['changed']:
+            response_cache.invalidate(url)
+            data_url = docc_data_url(url)
+            if data_url:
+                response_cache.invalidate(data_url)
+        
+        seeds = []
+        for url in sorted(refresh):
+            known = self.journal.get(url)
+            seeds.append((url, known['category'] if known and known['category'] else self._crawl_category(url)))
+        
+        # Unchanged pages count as visited, so only new child pages are followed
+        stats = await self.cache_documentation_pages(seeds, browser=browser,
+                                                     visited_urls=set(plan['unchanged']))
+        for url, lastmod in refresh.items():
+            if lastmod and url not in stats.failed:
+                self.journal.set_lastmod(url, lastmod)
+        logger.info(f"Incremental refresh: {stats.pages} pages fetched, "
+                    f"{len(stats.changed)} with changed content, {stats.unchanged} unchanged")
+        return stats
+
+    async def discover_sample_downloads(self, urls: Set[str], concurrency: int = MAX_CONCURRENT_PAGES) -> Set[str]:
+        """Sample archive URLs behind the download buttons of ``urls``
+
+        Incremental runs skip full discovery; new sample projects can only
+        appear on new or changed pages, so those are the ones visited.
+        """
+        links: Dict[str, Set[str]] = defaultdict(set)
+        if not urls:
+            return set()
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            try:
+                async with PagePool(browser, size=concurrency, blocker=self.blocker) as pool:
+                    async def visit(url: str):
+                        try:
+                            async with pool.page() as page:
+                                await self._collect_sample_downloads(page, url, links)
+                        except Exception as e:
+                            logger.error(f"Error looking for sample downloads on {url}: {str(e)}")
+
+                    await asyncio.gather(*(visit(url) for url in sorted(urls)))
+            finally:
+                await browser.close()
+                self.blocker.log_stats()
+                self.readiness.log_stats()
+
+        logger.info(f"Found {len(links['samples'])} sample downloads on {len(urls)} new or changed pages")
+        return set(links['samples'])
+
+    async def _cache_page_content(self, page: Page, url: str, category: str) -> Dict[str, Any]:
+        """Load a documentation page, store its extracted content and update the cache index"""
+        safe_name = re.sub(r'[^\w\-_]', '_', url.split('/')[-1])
+        file_path = self.documentation_content_dir / f"{safe_name}.json"
+        
+        # Fetch over HTTP when possible, rendering in the browser only as a fallback
+        result = await self.fetcher.fetch(url, page)
+        if result is None:
+            raise RuntimeError(f"No fetch strategy produced content for {url}")
+        content = result.content
+        if result.strategy == 'browser':
+            self.blocker.report(page, url)
+        
+        # Save raw response for debugging
+        await self.writer.submit(self.blobs.put, 'raw', url, result.raw,
+                                 meta={'strategy': result.strategy, 'suffix': result.raw_suffix})
+        
+        # Save the content
+        await self.writer.write_json(file_path, content)
+        
+        # Update cache index
+        await self.writer.submit(self.doc_index.update, url, {
+            'local_path': str(file_path),
+            'category': category,
+            'cached_at': datetime.now(UTC).isoformat(),
+            'title': content.get('title', ''),
+            'type': content.get('type', ''),
+            'description': content.get('description', ''),
+            'child_pages': content.get('child_pages', [])
+        })
+        
+        logger.info(f"Successfully cached documentation page: {content.get('title', url)}")
+        logger.debug(f"Content extracted from {url} via {result.strategy}: {sorted(content)}")
+        return content
 
     async def _extract_page_content(self, page: Page, url: str, category: str) -> Dict[str, Any]:
-        """Extract all relevant content from a documentation page."""
+        """Extract all relevant content from a documentation page.
+        
+        Title, description, declaration, parameters, child pages and code
+        blocks come back from a single ``page.evaluate`` call instead of one
+        Playwright round trip per element.
+        """
         try:
-            content = {}
-            
-            # Extract title
-            title_element = await page.query_selector('h1')
-            if title_element:
-                content['title'] = await title_element.text_content()
-                
-            # Extract description
-            desc_element = await page.query_selector('.description')
-            if desc_element:
-                content['description'] = await desc_element.text_content()
-                
-            # Extract declaration
-            decl_element = await page.query_selector('.declaration, .swift')
-            if decl_element:
-                swift_text = await decl_element.text_content()
-                formatted_html = await decl_element.inner_html()
-                content['declaration'] = {
-                    'swift': swift_text.strip() if swift_text else '',
-                    'formatted': formatted_html.strip() if formatted_html else ''
-                }
-                
-            # Extract parameters
-            params_section = await page.query_selector('.parameters')
-            if params_section:
-                parameters = []
-                param_items = await params_section.query_selector_all('dt, dd')
-                
-                current_param = None
-                for item in param_items:
-                    tag_name = await (await item.get_property('tagName')).json_value()
-                    text_content = await item.text_content()
-                    
-                    if tag_name.lower() == 'dt':
-                        if current_param:
-                            parameters.append(current_param)
-                        current_param = {'name': text_content.strip()}
-                    elif tag_name.lower() == 'dd' and current_param:
-                        current_param['description'] = text_content.strip()
-                
-                if current_param:
-                    parameters.append(current_param)
-                    
-                content['parameters'] = parameters
-            
-            return content
+            return await page.evaluate(PAGE_CONTENT_SCRIPT, {
+                'childSelector': CHILD_PAGE_SELECTOR,
+                'codeSelector': CODE_BLOCK_SELECTOR
+            })
             
         except Exception as e:
             logger.error(f"Error extracting page content: {str(e)}")
@@ -836,18 +1231,12 @@ class DocumentationURLCollector:
 
     def _load_doc_content_cache(self) -> dict:
         """Load documentation content cache"""
-        try:
-            if self.documentation_content_cache.exists():
-                return json.loads(self.documentation_content_cache.read_text())
-        except Exception as e:
-            logger.error(f"Error loading documentation cache: {str(e)}")
-        
-        return {'cached_at': datetime.now(UTC).isoformat(), 'pages': {}}
+        return self.doc_index.snapshot()
 
     def _save_doc_content_cache(self, cache_data: dict):
         """Save documentation content cache"""
         try:
-            self.documentation_content_cache.write_text(json.dumps(cache_data, indent=2))
+            self.doc_index.replace(cache_data.get('pages', {}))
         except Exception as e:
             logger.error(f"Error saving documentation cache: {str(e)}")
 
@@ -0,0 +1,167 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import sqlite3
+import threading
+import time
+from utils.logging import logger
+from core.config import CRAWL_LEASE_ATTEMPTS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    category TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    leased_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS queue_state ON queue(state, depth, seq);
+"""
+
+# (url, category, depth)
+WorkItem = Tuple[str, str, int]
+
+
+class WorkQueue:
+    """SQLite-backed crawl frontier shared by crawl worker processes
+
+    Every URL ever pushed keeps its row, so the table doubles as the shared
+    seen-set: pushing a known URL is a no-op. Workers lease the next pending
+    URL in depth order, and a deeper URL is only handed out once no
+    shallower one is still being fetched, so pages keep their shortest depth
+    and per-depth limits hold as in the in-process crawl.
+    """
+
+    def __init__(self, db_path: Path = Path('data/cache/crawl_queue.sqlite3'), max_depth: Optional[int] = None,
+                 max_pages_per_depth: Union[int, Dict[int, int], None] = None,
+                 max_attempts: int = CRAWL_LEASE_ATTEMPTS):
+        self.db_path = db_path
+        self.max_depth = max_depth
+        self.max_pages_per_depth = max_pages_per_depth
+        self.max_attempts = max_attempts
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _depth_limit(self, depth: int) -> Optional[int]:
+        if isinstance(self.max_pages_per_depth, dict):
+            return self.max_pages_per_depth.get(depth)
+        return self.max_pages_per_depth
+
+    def push_many(self, urls: Iterable[str], category: Optional[str] = None, depth: int = 0) -> Tuple[int, int]:
+        """Queue unseen URLs at ``depth``
+
+        Returns:
+            (added, skipped): URLs queued and new URLs dropped by the depth limits
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0, 0
+        if self.max_depth is not None and depth > self.max_depth:
+            return 0, 0
+        limit = self._depth_limit(depth)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                seen = set()
+                for start in range(0, len(urls), 500):
+                    chunk = urls[start:start + 500]
+                    seen.update(row[0] for row in self._conn.execute(
+                        f"SELECT url FROM queue WHERE url IN ({', '.join('?' * len(chunk))})", chunk))
+                new_urls = [url for url in urls if url not in seen]
+                skipped = 0
+                if limit is not None:
+                    queued = self._conn.execute("SELECT COUNT(*) FROM queue WHERE depth = ?", (depth,)).fetchone()[0]
+                    room = max(limit - queued, 0)
+                    skipped = max(len(new_urls) - room, 0)
+                    new_urls = new_urls[:room]
+                self._conn.executemany(
+                    "INSERT INTO queue(url, category, depth) VALUES(?, ?, ?)",
+                    [(url, category, depth) for url in new_urls]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(new_urls), skipped
+
+    def claim(self, worker: str) -> Optional[WorkItem]:
+        """Lease the next URL to ``worker``, or None if nothing is claimable right now"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """SELECT seq, url, category, depth FROM queue
+                       WHERE state = 'pending'
+                         AND depth <= COALESCE((SELECT MIN(depth) FROM queue WHERE state = 'leased'), depth)
+                       ORDER BY depth, seq LIMIT 1"""
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE queue SET state = 'leased', worker = ?, leased_at = ? WHERE seq = ?",
+                        (worker, time.time(), row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return None if row is None else (row[1], row[2], row[3])
+
+    def complete(self, url: str, error: Optional[str] = None):
+        """Finish a leased URL, as failed when ``error`` is given"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE queue SET state = ?, error = ?, attempts = attempts + 1 WHERE url = ?",
+                ('failed' if error is not None else 'done', error, url)
+            )
+
+    def release(self, worker: str, reason: str = 'worker exited') -> List[str]:
+        """Hand a dead worker's leases back out, failing URLs that used up their attempts"""
+        with self._lock:
+            leased = [row[0] for row in self._conn.execute(
+                "SELECT url FROM queue WHERE state = 'leased' AND worker = ?", (worker,))]
+            self._conn.execute(
+                """UPDATE queue SET attempts = attempts + 1,
+                       state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END,
+                       error = CASE WHEN attempts + 1 >= ? THEN ? ELSE error END,
+                       worker = NULL, leased_at = NULL
+                   WHERE state = 'leased' AND worker = ?""",
+                (self.max_attempts, self.max_attempts, reason, worker)
+            )
+        if leased:
+            logger.warning(f"Released {len(leased)} URLs leased by {worker} ({reason})")
+        return leased
+
+    def drained(self) -> bool:
+        """True when nothing is pending or leased"""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM queue WHERE state IN ('pending', 'leased')").fetchone()
+        return row[0] == 0
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT state, COUNT(*) FROM queue GROUP BY state").fetchall())
+
+    def failures(self) -> Dict[str, str]:
+        """Failed URLs and their last error"""
+        return dict(self._conn.execute("SELECT url, COALESCE(error, '') FROM queue WHERE state = 'failed'"))
+
+    def depth_pages(self) -> Dict[int, List[str]]:
+        """Completed URLs by depth"""
+        pages: Dict[int, List[str]] = {}
+        for url, depth in self._conn.execute("SELECT url, depth FROM queue WHERE state = 'done' ORDER BY seq"):
+            pages.setdefault(depth, []).append(url)
+        return pages
+
+    def reset(self):
+        """Forget every queued and seen URL"""
+        with self._lock:
+            self._conn.execute("DELETE FROM queue")
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,103 @@
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Optional
+import asyncio
+import atexit
+import json
+import queue
+import threading
+from utils.logging import logger
+from core.config import WRITE_QUEUE_SIZE
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Bounded queue of serialization and disk writes drained by one worker thread
+
+    Coroutines hand jobs to ``submit`` and carry on; the worker runs them in
+    submission order, so writes to the same file never reorder. When the queue
+    is full, ``submit`` waits off the event loop until the worker catches up,
+    and later submits queue up behind it rather than overtaking it.
+    ``flush`` waits for every queued job and the queue drains itself at
+    interpreter exit.
+    """
+
+    def __init__(self, maxsize: int = WRITE_QUEUE_SIZE, name: str = 'write-behind'):
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+        self._submit_lock: Optional[asyncio.Lock] = None
+        self._submit_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats: Counter = Counter()
+
+    def _ensure_worker(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                fn, args, kwargs = job
+                fn(*args, **kwargs)
+                self.stats['completed'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Write-behind job failed: {str(e)}")
+                logger.debug("Error details:", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def submit(self, fn: Callable[..., Any], *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` to run on the writer thread"""
+        self._ensure_worker()
+        self.stats['submitted'] += 1
+        job = (fn, args, kwargs)
+        # asyncio.Lock wakes waiters in arrival order, so a submit waiting for
+        # room cannot be overtaken; it is created per event loop it serves
+        loop = asyncio.get_running_loop()
+        if self._submit_loop is not loop:
+            self._submit_lock, self._submit_loop = asyncio.Lock(), loop
+        async with self._submit_lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.stats['backpressure'] += 1
+                await asyncio.to_thread(self._queue.put, job)
+
+    async def write_text(self, path: Path, text: str):
+        await self.submit(path.write_text, text, encoding='utf-8')
+
+    async def write_json(self, path: Path, data: Any, indent: Optional[int] = 2):
+        """Serialize and write ``data`` on the writer thread"""
+        await self.submit(_dump_json, path, data, indent)
+
+    async def flush(self):
+        """Wait until every job submitted so far has run"""
+        if self._thread is not None:
+            await asyncio.to_thread(self._queue.join)
+
+    def close(self):
+        """Drain the queue and stop the worker thread"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        if self.stats['submitted']:
+            logger.debug(f"Write-behind queue closed: {self.stats['completed']} writes, "
+                         f"{self.stats['backpressure']} backpressure waits, {self.stats['errors']} errors")
+
+
+def _dump_json(path: Path, data: Any, indent: Optional[int]):
+    path.write_text(json.dumps(data, indent=indent), encoding='utf-8')
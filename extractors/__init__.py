@@ -2,10 +2,12 @@ from .code_extractor import CodeBlockExtractor
 from .doc_extractor import DocumentationExtractor
 from .relationship_extractor import RelationshipExtractor
 from .validation_extractor import ValidationExtractor
+from .page_visitor import PageVisitor
 
 __all__ = [
     'CodeBlockExtractor',
     'DocumentationExtractor',
     'RelationshipExtractor',
-    'ValidationExtractor'
+    'ValidationExtractor',
+    'PageVisitor'
 ]
@@ -3,6 +3,7 @@ from typing import List, Optional
 from datetime import datetime, UTC
 from models.base import CodeExample, DocumentationEntry
 from utils.logging import logger
+from core.html_parser import parse_html
 
 class BaseExtractor:
     def extract(self, content: Tag) -> Optional[DocumentationEntry]:
@@ -10,7 +11,7 @@ class BaseExtractor:
         try:
             # Convert string content to BeautifulSoup if needed
             if isinstance(content, str):
-                content = BeautifulSoup(content, 'html.parser')
+                content = parse_html(content)
             
             title = self._extract_title(content)
             if not title:
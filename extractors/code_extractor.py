@@ -5,6 +5,7 @@ import logging
 import re
 from pathlib import Path
 from core.documentation_analyzer import DocumentationAnalyzer
+from extractors.page_visitor import PageVisitor
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +24,31 @@ class CodeBlockExtractor:
     
     def extract_code_blocks(self, soup: BeautifulSoup) -> List[CodeBlock]:
         """Extract all code blocks from the page"""
+        visitor = PageVisitor()
+        code_blocks = self.attach(visitor)
+        visitor.walk(soup)
+        return code_blocks
+    
+    def attach(self, visitor: PageVisitor) -> List[CodeBlock]:
+        """Collect the page's code listings during the visitor's walk into the returned list"""
         code_blocks = []
         
-        # Find all code listings
-        listings = soup.find_all('div', class_='code-listing')
-        
-        for listing in listings:
+        def on_div(listing: Tag, visitor: PageVisitor):
+            if 'code-listing' not in listing.get('class', []):
+                return
+            # The preceding paragraph or list describes a listing inside a <section>
+            description = visitor.last('p', 'ul', 'ol') if visitor.inside('section') else None
             try:
-                code_block = self._process_code_block(listing)
+                code_block = self._process_code_block(listing, description.get_text(strip=True) if description else '')
                 if code_block:
                     code_blocks.append(code_block)
             except Exception as e:
                 logger.error(f"Error processing code block: {str(e)}")
-                
+        
+        visitor.register(on_div, 'div')
         return code_blocks
     
-    def _process_code_block(self, block: Tag) -> Optional[CodeBlock]:
+    def _process_code_block(self, block: Tag, description: Optional[str] = None) -> Optional[CodeBlock]:
         """Process a single code block"""
         try:
             # Get the code content
@@ -49,8 +59,8 @@ class CodeBlockExtractor:
             # Get the full code text
             code_text = code_content.get_text(strip=True)
             
-            # Use instance doc_analyzer instead of creating new one
-            context = self.doc_analyzer._get_code_context(block)  # Use instance variable
+            if description is None:
+                description = self.doc_analyzer._get_code_context(block).get('description', '')
             
             # Get language (defaulting to swift)
             language = block.get('data-syntax', 'swift')
@@ -61,10 +71,10 @@ class CodeBlockExtractor:
             # Create CodeBlock with validation
             code_block = CodeBlock(
                 code=code_text,
-                description=context.get('description', ''),
+                description=description,
                 language=language,
                 preview=code_text[:200],
-                frameworks=list(frameworks),
+                frameworks=sorted(frameworks),
                 type=self._determine_code_type(code_text, frameworks)
             )
             
@@ -129,8 +139,8 @@ class CodeBlockExtractor:
         
         return 'other'
     
-    def extract_patterns(self, code_blocks: List[CodeBlock]) -> Dict[str, CodePattern]:
-        """Convert code blocks to reusable patterns"""
+    def extract_patterns(self, code_blocks: List[CodeBlock], source_file: str = '') -> Dict[str, CodePattern]:
+        """Convert code blocks to reusable patterns found in ``source_file`` (e.g. the page URL)"""
         patterns = {}
         
         for i, block in enumerate(code_blocks):
@@ -140,6 +150,7 @@ class CodeBlockExtractor:
             pattern = CodePattern(
                 pattern_type=pattern_type,
                 code=block.code,
+                source_file=source_file,
                 frameworks=block.frameworks,
                 prerequisites=[],  # Will be populated by relationship extractor
                 related_concepts=[],  # Will be populated by relationship extractor
@@ -1,74 +1,132 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from dataclasses import dataclass, field
 from models.base import DocumentationPage, Topic, CodeBlock
 from extractors.code_extractor import CodeBlockExtractor
-from typing import List, Optional
+from extractors.page_visitor import PageVisitor
+from typing import Any, Dict, Iterable, List, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+HEADINGS = ['h1', 'h2', 'h3', 'h4']
+
+
+@dataclass
+class TopicNode:
+    """A topic and the topics nested under it"""
+    topic: Topic
+    children: List['TopicNode'] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.topic.model_dump(), 'children': [child.to_dict() for child in self.children]}
+
+
+def build_topic_tree(topics: Iterable[Union[Topic, Dict[str, Any]]]) -> List[TopicNode]:
+    """Nest topics (in page order) under the nearest preceding lower-level heading
+
+    One pass with a stack of open headings, so it stays linear however many
+    headings a page has. Accepts Topic objects or their serialized dicts.
+    """
+    roots: List[TopicNode] = []
+    stack: List[TopicNode] = []
+    for topic in topics:
+        node = TopicNode(topic if isinstance(topic, Topic) else Topic(**topic))
+        while stack and stack[-1].topic.level >= node.topic.level:
+            stack.pop()
+        (stack[-1].children if stack else roots).append(node)
+        stack.append(node)
+    return roots
+
+
+@dataclass
+class PageOutline:
+    """Title, topics and topic tree of a page, filled in by DocumentationExtractor.attach"""
+    title: str = "Untitled"
+    topics: List[Topic] = field(default_factory=list)
+    tree: List[TopicNode] = field(default_factory=list)
+
+
 class DocumentationExtractor:
     """Extracts structured documentation from HTML"""
-    
+
     def extract(self, soup: BeautifulSoup) -> DocumentationPage:
         """Extract documentation page content"""
-        title = self._extract_title(soup)
-        topics = self._extract_topics(soup)
-        code_blocks = CodeBlockExtractor.extract_code_blocks(soup)
-        
+        visitor = PageVisitor()
+        outline = self.attach(visitor)
+        code_blocks = CodeBlockExtractor().attach(visitor)
+        visitor.walk(soup)
+
         return DocumentationPage(
-            title=title,
+            title=outline.title,
             url="",  # URL will be set by scraper
-            topics=topics,
+            topics=outline.topics,
             code_blocks=code_blocks,
             code_patterns={},  # New functionality will be populated later
             relationships=[],
             validation_tests=[]
         )
-    
+
+    def attach(self, visitor: PageVisitor) -> PageOutline:
+        """Collect the page title and topics during the visitor's walk
+
+        A topic's path lists the headings it is nested under (each nearest
+        preceding heading of a lower level) and its own title; its content is
+        the paragraphs following it among its siblings, up to the next sibling
+        heading. Open headings are kept on a level stack, so the walk stays
+        linear in the number of headings.
+        """
+        outline = PageOutline()
+        found_title = False
+        open_topics: List[Topic] = []
+        # Paragraphs of the latest heading under each parent element
+        sections: Dict[int, List[str]] = {}
+        paragraphs: List[List[str]] = []
+
+        def on_title(elem: Tag, visitor: PageVisitor):
+            nonlocal found_title
+            if not found_title:
+                outline.title = elem.get_text(strip=True)
+                found_title = True
+
+        def on_heading(header: Tag, visitor: PageVisitor):
+            title = header.get_text(strip=True)
+            level = int(header.name[1])
+            while open_topics and open_topics[-1].level >= level:
+                open_topics.pop()
+            topic = Topic(title=title, level=level, path=[parent.title for parent in open_topics] + [title])
+            open_topics.append(topic)
+            outline.topics.append(topic)
+            paragraphs.append([])
+            sections[id(header.parent)] = paragraphs[-1]
+
+        def on_paragraph(paragraph: Tag, visitor: PageVisitor):
+            section = sections.get(id(paragraph.parent))
+            if section is not None:
+                section.append(paragraph.get_text(strip=True))
+
+        def finish():
+            for topic, content in zip(outline.topics, paragraphs):
+                topic.content = "\n".join(content) if content else None
+            outline.tree = build_topic_tree(outline.topics)
+
+        visitor.register(on_title, 'h1', 'title')
+        visitor.register(on_heading, *HEADINGS)
+        visitor.register(on_paragraph, 'p')
+        visitor.on_finish(finish)
+        return outline
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract page title"""
         title_elem = soup.find(['h1', 'title'])
         return title_elem.get_text(strip=True) if title_elem else "Untitled"
-    
+
     def _extract_topics(self, soup: BeautifulSoup) -> List[Topic]:
         """Extract topics from the page"""
-        topics = []
-        headers = soup.find_all(['h1', 'h2', 'h3', 'h4'])
-        
-        for header in headers:
-            level = int(header.name[1])  # Get numeric level from h1, h2, etc.
-            content = self._extract_section_content(header)
-            
-            topic = Topic(
-                title=header.get_text(strip=True),
-                level=level,
-                content=content,
-                path=self._get_topic_path(header)
-            )
-            topics.append(topic)
-        
-        return topics
-    
-    def _extract_section_content(self, header_elem) -> Optional[str]:
-        """Extract content belonging to a section"""
-        content = []
-        elem = header_elem.find_next_sibling()
-        
-        while elem and not elem.name in ['h1', 'h2', 'h3', 'h4']:
-            if elem.name == 'p':
-                content.append(elem.get_text(strip=True))
-            elem = elem.find_next_sibling()
-        
-        return "\n".join(content) if content else None
-    
-    def _get_topic_path(self, elem) -> List[str]:
-        """Get hierarchical path to topic"""
-        path = []
-        current = elem
-        
-        while current:
-            if current.name in ['h1', 'h2', 'h3', 'h4']:
-                path.insert(0, current.get_text(strip=True))
-            current = current.find_previous(['h1', 'h2', 'h3', 'h4'])
-        
-        return path
\ No newline at end of file
+        return self.extract_outline(soup).topics
+
+    def extract_outline(self, soup: BeautifulSoup) -> PageOutline:
+        """Title, flat topics and nested topic tree of a page in one walk"""
+        visitor = PageVisitor()
+        outline = self.attach(visitor)
+        visitor.walk(soup)
+        return outline
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from bs4 import BeautifulSoup, Tag
+
+# (element, visitor) -> None, called when the walk reaches the element
+NodeHandler = Callable[[Tag, 'PageVisitor'], None]
+
+
+class PageVisitor:
+    """Walk a parsed page once and dispatch elements to registered extractors
+
+    Handlers are registered per tag name and called in document order. While
+    a handler runs, ``ancestors`` holds the open elements above the current
+    one and ``last`` answers "the nearest preceding element named ..."
+    (what ``find_previous`` would return), so extractors never re-traverse
+    the tree. Finish callbacks run once the walk is complete.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[NodeHandler]] = defaultdict(list)
+        self._finishers: List[Callable[[], None]] = []
+        self._seen: Dict[str, Tuple[int, Tag]] = {}
+        self.ancestors: List[Tag] = []
+        self.elements = 0
+
+    def register(self, handler: NodeHandler, *names: str):
+        """Call ``handler`` for every element with one of ``names``"""
+        for name in names:
+            self._handlers[name].append(handler)
+
+    def on_finish(self, callback: Callable[[], None]):
+        self._finishers.append(callback)
+
+    def inside(self, name: str) -> bool:
+        """True when the current element has an ancestor called ``name``"""
+        return any(ancestor.name == name for ancestor in self.ancestors)
+
+    def last(self, *names: str) -> Optional[Tag]:
+        """Most recent element with one of ``names`` that started before the current one"""
+        found = [self._seen[name] for name in names if name in self._seen]
+        return max(found, key=lambda item: item[0])[1] if found else None
+
+    def walk(self, root: BeautifulSoup):
+        """Visit every element under ``root`` once, then run the finish callbacks"""
+        self._seen = {}
+        self.ancestors = []
+        self.elements = 0
+        stack: List[Iterable] = [iter(root.children)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                if self.ancestors:
+                    self.ancestors.pop()
+                continue
+            if not isinstance(node, Tag):
+                continue
+            for handler in self._handlers.get(node.name, ()):
+                handler(node, self)
+            self._seen[node.name] = (self.elements, node)
+            self.elements += 1
+            self.ancestors.append(node)
+            stack.append(iter(node.children))
+        for callback in self._finishers:
+            callback()
@@ -1,4 +1,4 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from models.base import ConceptRelationship, CodePattern
 from typing import List, Dict, Any
 import logging
@@ -6,12 +6,51 @@ import re
 import json
 from pathlib import Path
 import aiohttp
+from extractors.page_visitor import PageVisitor
 
 logger = logging.getLogger(__name__)
 
 class RelationshipExtractor:
     """Extracts relationships between concepts in documentation"""
     
+    def extract_relationships(self, soup: BeautifulSoup,
+                              code_patterns: Dict[str, CodePattern]) -> List[ConceptRelationship]:
+        """Extract concept references from the page and framework use from its patterns"""
+        visitor = PageVisitor()
+        relationships = self.attach(visitor)
+        visitor.walk(soup)
+        return relationships + self.pattern_relationships(code_patterns)
+    
+    def attach(self, visitor: PageVisitor) -> List[ConceptRelationship]:
+        """Collect documentation links during the visitor's walk into the returned list
+        
+        Each link to another documentation page relates the nearest preceding
+        heading (the page's topic at that point) to the linked concept.
+        """
+        relationships = []
+        seen = set()
+        
+        def on_link(link: Tag, visitor: PageVisitor):
+            if '/documentation/' not in link.get('href', ''):
+                return
+            heading = visitor.last('h1', 'h2', 'h3', 'h4')
+            source = heading.get_text(strip=True) if heading else ''
+            target = link.get_text(strip=True)
+            if source and target and source != target and (source, target) not in seen:
+                seen.add((source, target))
+                relationships.append(ConceptRelationship(source=source, target=target, relationship_type='references'))
+        
+        visitor.register(on_link, 'a')
+        return relationships
+    
+    def pattern_relationships(self, code_patterns: Dict[str, CodePattern]) -> List[ConceptRelationship]:
+        """Relate each code pattern to the frameworks it uses"""
+        return [
+            ConceptRelationship(source=pattern_id, target=framework, relationship_type='uses_framework')
+            for pattern_id, pattern in code_patterns.items()
+            for framework in pattern.frameworks
+        ]
+    
     def verify_relationships(self, doc_cache_path: Path) -> Dict[str, Any]:
         """Verify and analyze relationships between samples and documentation"""
         verification_results = {
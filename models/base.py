@@ -82,7 +82,7 @@ class DocumentationPage(BaseModel):
         for pattern in data.get('code_patterns', {}).values():
             frameworks.update(pattern.frameworks)
             
-        self.frameworks_used = list(frameworks)
+        self.frameworks_used = sorted(frameworks)
         self._determine_category()
     
     def _determine_category(self):
@@ -123,6 +123,7 @@ class ProjectResource(BaseModel):
     documentation_title: Optional[str] = None
     local_path: Optional[Path] = None
     downloaded: bool = False
+    checksum: Optional[str] = None  # SHA-256 of the downloaded archive
 
     def mark_downloaded(self, path: Path):
         """Mark project as downloaded and set local path"""
@@ -13,7 +13,12 @@ from core.config import (
     TEST_SAMPLE_COUNT,
     TEST_PATTERN_VALIDATION,
     TEST_SAMPLE_STRATEGY,
-    ARKIT_SAMPLES
+    ARKIT_SAMPLES,
+    MAX_CONCURRENT_DOWNLOADS,
+    TRANSPORT_MODE,
+    TRANSPORT_ARCHIVE,
+    REPLAY_LATENCY,
+    CACHE_GC_AFTER_RUN
 )
 from utils.logging import logger
 
@@ -35,13 +40,21 @@ from analyzers.relationship_tracker import RelationshipTracker
 from typing import Optional
 import aiohttp
 from core.documentation_analyzer import DocumentationAnalyzer
-import hashlib
-from datetime import datetime, UTC
+from core.http_client import HttpClient
+from core.project_archive import changed_files, iter_project_files
+from core.crawl_journal import CrawlState
+from core.resource_blocker import ResourceBlocker
+from core.page_readiness import PageReadiness
+from core.transport import configure_transport, get_transport
+from core.response_cache import get_response_cache
+from core.extraction_pool import ExtractionPool, match_code_patterns
+from core.cache_budget import CacheBudget
 from rich.progress import Progress
 import random
 from core.llm_interface import VisionOSCodeGenerator
 from analyzers.component_analyzer import ComponentAnalyzer
 import argparse
+import time
 
 console = Console()
 
@@ -52,60 +65,77 @@ project_analyzer = ProjectAnalyzer()
 relationship_tracker = RelationshipTracker(Path('data/knowledge'))
 component_analyzer = ComponentAnalyzer()
 
-async def process_url(url: str, url_collector: DocumentationURLCollector, skip_downloads: bool = SKIP_DOWNLOADS):
+async def process_url(url: str, url_collector: DocumentationURLCollector, skip_downloads: bool = SKIP_DOWNLOADS,
+                      client: Optional[HttpClient] = None, refresh: bool = False):
     """Process a single URL with improved error handling"""
+    if client is None:
+        async with HttpClient() as own_client:
+            return await process_url(url, url_collector, skip_downloads, own_client, refresh)
+    
     retries = 3
+    attempt = 0
     while retries > 0:
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                console.print(f"\n[cyan]Processing URL: {url}")
+            console.print(f"\n[cyan]Processing URL: {url}")
+            
+            # Handle ZIP URLs differently from documentation URLs
+            if url.endswith('.zip'):
+                project = ProjectResource(
+                    title=url.split('/')[-1].replace('.zip', ''),
+                    url=url,
+                    download_url=url
+                )
                 
-                # Handle ZIP URLs differently from documentation URLs
-                if url.endswith('.zip'):
-                    project = ProjectResource(
-                        title=url.split('/')[-1].replace('.zip', ''),
-                        url=url,
-                        download_url=url
-                    )
-                    
-                    # Check if project is already downloaded
-                    project_name = re.sub(r'[^\w\-_]', '_', project.title)
-                    project_dir = url_collector.projects_dir / project_name
-                    if project_dir.exists():
-                        project.mark_downloaded(project_dir)
-                        console.print(f"[green]Project already downloaded: {project_dir}")
-                        return project
-                    
-                    if not skip_downloads:
-                        console.print(f"[yellow]Attempting download to {url_collector.projects_dir}...")
-                        success = await url_collector.download_project(project)
-                        if success:
-                            console.print(f"[green]Downloaded to: {project.local_path}")
-                            url_collector._update_cache([project])
-                            console.print(f"[green]Project cached: {project.title}")
-                        else:
-                            console.print(f"[red]Download failed")
-                            retries -= 1
-                            if retries > 0:
-                                await asyncio.sleep(2)  # Add delay between retries
-                            continue
+                # Check if project is already downloaded
+                project_name = re.sub(r'[^\w\-_]', '_', project.title)
+                project_dir = url_collector.projects_dir / project_name
+                if project_dir.exists() and (skip_downloads or not refresh):
+                    project.mark_downloaded(project_dir)
+                    console.print(f"[green]Project already downloaded: {project_dir}")
+                    url_collector.journal.mark(url, CrawlState.FETCHED, category='samples')
                     return project
                 
+                if not skip_downloads:
+                    console.print(f"[yellow]Attempting download to {url_collector.projects_dir}...")
+                    success = await url_collector.download_project(project, client, refresh=refresh)
+                    if success:
+                        console.print(f"[green]Downloaded to: {project.local_path}")
+                        changed = changed_files(project.local_path)
+                        if changed:
+                            console.print(f"[cyan]{len(changed)} Swift files added or changed")
+                        url_collector._update_cache([project])
+                        url_collector.journal.mark(url, CrawlState.FETCHED, content_hash=project.checksum,
+                                                   category='samples')
+                        console.print(f"[green]Project cached: {project.title}")
+                    else:
+                        console.print(f"[red]Download failed")
+                        retries -= 1
+                        if retries > 0:
+                            await asyncio.sleep(client.backoff_delay(attempt))  # Jittered delay between retries
+                            attempt += 1
+                        continue
+                return project
+                
         except aiohttp.ClientError as e:
             retries -= 1
             if retries == 0:
                 logger.error(f"Network error processing {url}: {str(e)}")
+                url_collector.journal.mark(url, CrawlState.FAILED, error=str(e), category='samples')
                 return None
-            await asyncio.sleep(2)  # Wait before retry
+            await asyncio.sleep(client.backoff_delay(attempt))  # Wait before retry
+            attempt += 1
         except Exception as e:
             logger.error(f"Error processing {url}: {str(e)}")
+            url_collector.journal.mark(url, CrawlState.FAILED, error=str(e), category='samples')
             return None
+    url_collector.journal.mark(url, CrawlState.FAILED, error="Download failed", category='samples')
     return None
 
-async def discover_urls():
+async def discover_urls(url_collector: Optional[DocumentationURLCollector] = None):
     """Discover all relevant URLs from base documentation"""
     logger.debug("Starting URL discovery process")
-    url_collector = DocumentationURLCollector()
+    if url_collector is None:
+        url_collector = DocumentationURLCollector()
     discovered_urls = defaultdict(set)
     
     # Track per-base-url discoveries
@@ -152,97 +182,57 @@ async def discover_urls():
         
     return dict(discovered_urls)
 
-def pattern_matches(code: str, pattern_type: str) -> bool:
-    """Check if code matches a specific pattern type"""
-    patterns = {
-        'ui_components': [
-            r'WindowGroup',
-            r'NavigationStack',
-            r'TabView',
-            r'View\s*{',
-            r'@main\s+struct.*App\s*:'
-        ],
-        'animation': [
-            r'withAnimation',
-            r'animation',
-            r'transition',
-            r'\.animate',
-            r'Animation'
-        ],
-        'gestures': [
-            r'gesture',
-            r'onTapGesture',
-            r'DragGesture',
-            r'LongPressGesture',
-            r'RotationGesture'
-        ],
-        '3d_content': [
-            r'RealityView',
-            r'Entity',
-            r'Model3D',
-            r'attachments',
-            r'\.load\(".*\.usd[z]?"'
-        ],
-        'spatial_audio': [
-            r'SpatialAudioEmitter',
-            r'AudioEngine',
-            r'playSound',
-            r'spatial\.audio',
-            r'\.audio\('
-        ],
-        'immersive_spaces': [
-            r'ImmersiveSpace',
-            r'immersiveSpace',
-            r'fullspace',
-            r'ornament',
-            r'WindowGroup\s*{\s*ImmersiveSpace'
-        ]
-    }
-    
-    # Get patterns for the specified type
-    type_patterns = patterns.get(pattern_type, [])
-    
-    # Check if any pattern matches
-    return any(re.search(pattern, code, re.IGNORECASE) for pattern in type_patterns)
-
 async def analyze_patterns_from_docs(discovered_urls: Dict[str, Set[str]], url_collector: DocumentationURLCollector) -> Dict[str, Dict]:
     """Analyze patterns from documentation pages"""
     pattern_data = defaultdict(lambda: {'count': 0, 'examples': [], 'keywords': set()})
+    extraction = ExtractionPool()
+    
+    async def analyze(url: str, content: str):
+        # Code blocks are parsed and matched in the extraction pool while the next page loads
+        try:
+            matches = await extraction.run(match_code_patterns, content, url, reserved=True)
+        except Exception as e:
+            logger.error(f"Error analyzing patterns in {url}: {str(e)}")
+            return
+        for pattern_type, examples in matches.items():
+            pattern_data[pattern_type]['count'] += len(examples)
+            pattern_data[pattern_type]['examples'].extend(examples)
     
     try:
         async with async_playwright() as p:
             browser = await p.chromium.launch()
             page = await browser.new_page()
+            blocker = ResourceBlocker()
+            await get_transport().install(page)
+            await get_response_cache().install(page)
+            await blocker.install(page)
+            readiness = PageReadiness()
+            analyses = []
             
             for url in discovered_urls.get('documentation', set()):
+                # Hold an extraction slot before loading the page, so HTML cannot pile up
+                await extraction.reserve()
                 try:
-                    await page.goto(url)
-                    await page.wait_for_load_state('networkidle')
+                    await readiness.goto(page, url)
+                    blocker.report(page, url)
                     content = await page.content()
-                    
-                    soup = BeautifulSoup(content, 'html.parser')
-                    code_blocks = soup.find_all('code')
-                    
-                    for block in code_blocks:
-                        code = block.get_text()
-                        
-                        # Analyze code to identify patterns
-                        for pattern_type in ['ui_components', 'animation', 'gestures', '3d_content', 'spatial_audio', 'immersive_spaces']:
-                            if pattern_matches(code, pattern_type):
-                                pattern_data[pattern_type]['count'] += 1
-                                pattern_data[pattern_type]['examples'].append({
-                                    'code': code,
-                                    'source_url': url
-                                })
+                    analyses.append(asyncio.create_task(analyze(url, content)))
                                 
                 except Exception as e:
+                    extraction.release()
                     logger.error(f"Error analyzing patterns in {url}: {str(e)}")
                     continue
                     
+            await asyncio.gather(*analyses)
             await browser.close()
+            blocker.log_stats()
+            readiness.log_stats()
             
     except Exception as e:
         logger.error(f"Error in pattern analysis: {str(e)}")
+    finally:
+        extraction.log_stats()
+        extraction.close()
     
     return pattern_data
 
@@ -301,37 +291,6 @@ def extract_technical_terms(text: str) -> Set[str]:
     
     return terms
 
-async def fetch_content(url: str) -> Optional[str]:
-    """Fetch content from a URL with improved caching"""
-    cache_key = hashlib.md5(url.encode()).hexdigest()
-    cache_file = Path('data/cache/content') / f"{cache_key}.html"
-    
-    # Check cache age
-    if cache_file.exists():
-        age = datetime.now(UTC) - datetime.fromtimestamp(cache_file.stat().st_mtime, UTC)
-        if age.days < 1:  # Cache is fresh
-            return cache_file.read_text(encoding='utf-8')
-    
-    # Fetch new content
-    content = await _fetch_url_content(url)
-    if content:
-        cache_file.parent.mkdir(exist_ok=True)
-        cache_file.write_text(content, encoding='utf-8')
-    return content
-
-async def _fetch_url_content(url: str) -> Optional[str]:
-    """Internal function to fetch URL content"""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                logger.warning(f"Got status {response.status} for {url}")
-                return None
-    except Exception as e:
-        logger.error(f"Error fetching URL {url}: {str(e)}")
-        return None
-
 def select_test_samples(samples: List[str], strategy: str = TEST_SAMPLE_STRATEGY) -> List[str]:
     """Select samples based on strategy"""
     if strategy == "arkit_first":
@@ -359,11 +318,14 @@ def select_test_samples(samples: List[str], strategy: str = TEST_SAMPLE_STRATEGY
     else:  # diverse
         return samples[:TEST_SAMPLE_COUNT]
 
-async def main(clear_cache: bool = False):
+async def main(clear_cache: bool = False, incremental: bool = False, refresh_samples: bool = False):
     """Main scraper function.
     
     Args:
         clear_cache: If True, clear the cache before running
+        incremental: If True, re-crawl only pages the sitemap reports as new or changed
+        refresh_samples: If True, revalidate already processed sample archives and
+            re-extract those whose content changed
     """
     logger.debug("Starting documentation scraper")
     url_collector = DocumentationURLCollector()
@@ -380,17 +342,47 @@ async def main(clear_cache: bool = False):
     else:
         all_samples = url_collector._load_from_cache()
     
-    # Discover new URLs
-    discovered_urls = await discover_urls()
+    # Resume an interrupted run from the crawl journal, or start a new one
+    journal = url_collector.journal
+    if journal.begin_run():
+        console.print(f"[yellow]Resuming interrupted run: {journal.counts()}")
+    
+    incremental = incremental and not clear_cache
+    if incremental:
+        # Only new and changed pages are re-fetched, and only they can link new samples
+        refresh = await url_collector.refresh_changed_pages()
+        console.print(f"[cyan]Incremental refresh: {len(refresh.changed)} changed, "
+                      f"{refresh.unchanged} unchanged, {refresh.failures} failed pages")
+        sample_urls = await url_collector.discover_sample_downloads(set(refresh.changed))
+        # Samples queued again after their project was evicted by the cache budget
+        sample_urls |= journal.urls(CrawlState.QUEUED, category='samples')
+        if refresh_samples:
+            sample_urls |= journal.urls(category='samples')
+        discovered_urls = {
+            'documentation': set(refresh.changed),
+            'samples': sample_urls,
+        }
+    else:
+        # Discover new URLs
+        discovered_urls = await discover_urls(url_collector)
+    for category, urls in discovered_urls.items():
+        journal.enqueue_many(urls, category)
     
     if not clear_cache:
-        # Filter out already processed URLs
-        new_urls = {category: urls - url_collector.processed_urls for category, urls in discovered_urls.items()}
+        # Filter out already processed URLs; refreshed pages were extracted in this run
+        # and still need their downstream analysis
+        processed_urls = journal.urls(CrawlState.EXTRACTED)
+        new_urls = {
+            category: urls if (refresh_samples and category == 'samples') or (incremental and category != 'samples')
+            else urls - processed_urls
+            for category, urls in discovered_urls.items()
+        }
         if not any(new_urls.values()):
             logger.info("No new URLs to process")
             if all_samples:  # If we have cached samples, continue with analysis
                 discovered_urls = {}
             else:
+                journal.finish_run()
                 return
         else:
             logger.info("Found new URLs to process:")
@@ -419,25 +411,32 @@ async def main(clear_cache: bool = False):
         test_urls = discovered_urls.get('samples', set())
     
     # Process URLs concurrently
-    processed_projects = await process_urls_concurrent(test_urls, url_collector)
+    processed_projects = await process_urls_concurrent(test_urls, url_collector, refresh=refresh_samples)
     processed_projects = [p for p in processed_projects if p is not None]
     
     console.print(f"\nSuccessfully processed: {len(processed_projects)} projects")
     all_samples = processed_projects
     
-    # Update processed URLs cache
-    if not clear_cache:
-        for urls in discovered_urls.values():
-            url_collector.processed_urls.update(urls)
-        url_collector.url_cache.write_text(json.dumps({
-            'processed_urls': list(url_collector.processed_urls),
-            'last_updated': datetime.now(UTC).isoformat()
-        }))
+    # Non-sample URLs are fully handled by discovery and the documentation crawl
+    for category, urls in discovered_urls.items():
+        if category != 'samples':
+            for url in urls:
+                if not journal.is_done(url):
+                    journal.mark(url, CrawlState.EXTRACTED, category=category)
     
     # Analyze results
     console.print("\n[bold cyan]Analysis Summary:")
     pattern_data = defaultdict(lambda: {'count': 0, 'examples': [], 'files': []})
     
+    if incremental and discovered_urls.get('documentation'):
+        # Code on the refreshed pages is re-analyzed; unchanged pages keep their earlier results
+        doc_patterns = await analyze_patterns_from_docs(discovered_urls, url_collector)
+        for pattern_type, data in doc_patterns.items():
+            pattern_data[pattern_type]['count'] += data['count']
+            pattern_data[pattern_type]['examples'].extend(data['examples'])
+            pattern_data[pattern_type]['files'].extend(example['source_url'] for example in data['examples'])
+            console.print(f"[green]Found {data['count']} {pattern_type} patterns on changed pages")
+    
     with Progress() as progress:
         task = progress.add_task("[cyan]Analyzing projects...", total=len(all_samples))
         
@@ -446,6 +445,7 @@ async def main(clear_cache: bool = False):
                 progress.update(task, advance=1, description=f"Analyzing {project.title}")
                 console.print(f"\nAnalyzing {project.title}:")
                 analysis = project_analyzer.analyze_project(project.local_path)
+                journal.mark(project.url, CrawlState.EXTRACTED)
                 
                 # Track patterns with context
                 for pattern_type, pattern_info in analysis.get('patterns', {}).items():
@@ -542,26 +542,48 @@ async def main(clear_cache: bool = False):
     # Initialize knowledge base with refined patterns
     knowledge_base = VisionOSKnowledgeBase()
     knowledge_base.build_from_analysis(pattern_data)
+    journal.finish_run()
+    
+    if CACHE_GC_AFTER_RUN:
+        await collect_cache_garbage(url_collector)
     
     # Initialize code generator
     code_generator = VisionOSCodeGenerator()
     
     return code_generator
 
-async def process_urls_concurrent(urls: Set[str], url_collector: DocumentationURLCollector):
+async def collect_cache_garbage(url_collector: DocumentationURLCollector) -> Dict:
+    """Keep data/ within its disk budget once every queued write has landed
+
+    Projects the knowledge base uses are pinned.
+    """
+    await url_collector.writer.flush()
+    return CacheBudget(url_collector.base_dir).collect()
+
+async def process_urls_concurrent(urls: Set[str], url_collector: DocumentationURLCollector,
+                                  concurrency: int = MAX_CONCURRENT_DOWNLOADS, refresh: bool = False):
+    """Process URLs with at most ``concurrency`` in flight over one shared HTTP client"""
     processed = set()
-    tasks = []
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.monotonic()
     
-    async def process_with_limit(url: str):
-        if url in processed:
-            return None
-        processed.add(url)
-        return await process_url(url, url_collector)
-    
-    for url in urls:
-        tasks.append(process_with_limit(url))
+    async with HttpClient() as client:
+        async def process_with_limit(url: str):
+            if url in processed:
+                return None
+            processed.add(url)
+            async with semaphore:
+                return await process_url(url, url_collector, client=client, refresh=refresh)
+        
+        results = await asyncio.gather(*(process_with_limit(url) for url in urls))
+        
+        elapsed = max(time.monotonic() - started, 1e-9)
+        completed = sum(1 for result in results if result is not None)
+        logger.info(f"Processed {completed}/{len(processed)} URLs in {elapsed:.1f}s "
+                    f"({completed / elapsed:.2f} URLs/sec, concurrency {concurrency})")
+        client.log_stats()
     
-    return await asyncio.gather(*tasks)
+    return results
 
 async def analyze_real_samples():
     """Analyze patterns in downloaded samples"""
@@ -570,7 +592,7 @@ async def analyze_real_samples():
     # Get real sample paths
     sample_paths = []
     for ext in ['*.swift']:
-        sample_paths.extend(list(Path('data/projects').rglob(ext)))
+        sample_paths.extend(list(iter_project_files(Path('data/projects'), ext)))
     
     console.print(f"\nFound [green]{len(sample_paths)}[/] Swift files to analyze")
     
@@ -735,6 +757,20 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run the VisionOS documentation scraper')
     parser.add_argument('--clear-cache', action='store_true', help='Clear the cache before running')
     parser.add_argument('--no-prompt', action='store_true', help='Run without prompting')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-crawl only pages the sitemap reports as new or changed')
+    parser.add_argument('--refresh-samples', action='store_true',
+                        help='Revalidate downloaded sample archives and re-extract changed ones')
+    parser.add_argument('--transport', choices=['live', 'record', 'replay'], default=TRANSPORT_MODE,
+                        help='Record responses to a HAR archive, or replay them without network access')
+    parser.add_argument('--archive', type=Path, default=TRANSPORT_ARCHIVE, help='HAR archive for --transport')
+    parser.add_argument('--replay-latency', type=float, default=REPLAY_LATENCY,
+                        help='Seconds of latency injected into each replayed response')
     args = parser.parse_args()
     
-    asyncio.run(main(clear_cache=args.clear_cache))
\ No newline at end of file
+    transport = configure_transport(args.transport, args.archive, latency=args.replay_latency)
+    asyncio.run(main(clear_cache=args.clear_cache, incremental=args.incremental,
+                     refresh_samples=args.refresh_samples))
+    transport.log_stats()
+    transport.save()
+    get_response_cache().log_stats()
\ No newline at end of file
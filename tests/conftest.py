@@ -1,4 +1,6 @@
 import pytest
+import pytest_asyncio
+from aiohttp import web
 from pathlib import Path
 import sys
 
@@ -7,6 +9,19 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
+from core import response_cache
+from core.blob_store import BlobStore
+from core.response_cache import ResponseCache, configure_response_cache
+
+@pytest.fixture(autouse=True)
+def isolated_response_cache(tmp_path):
+    """Keep tests off the on-disk response cache; tests that need one pass it explicitly"""
+    previous = response_cache._response_cache
+    configure_response_cache(ResponseCache(BlobStore(tmp_path / 'responses'), enabled=False))
+    yield
+    response_cache._response_cache = previous
+
+
 @pytest.fixture
 def sample_data():
     """Provide sample test data"""
@@ -16,4 +31,70 @@ def sample_data():
         'nested': {
             'set_data': {'item1', 'item2'}
         }
-    } 
\ No newline at end of file
+    }
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def fake_browser():
+    """Provide a minimal stand-in for a Playwright browser"""
+    return FakeBrowser()
+
+
+@pytest_asyncio.fixture
+async def http_server():
+    """Start local aiohttp stand-in servers; call with a list of routes, get back the base URL"""
+    runners = []
+
+    async def start(routes):
+        app = web.Application()
+        app.add_routes(routes)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        runners.append(runner)
+        port = runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
@@ -0,0 +1,90 @@
+import pytest
+import json
+import core.blob_store as blob_store
+from core.blob_store import BlobStore, migrate_raw_files
+
+PAGE = "<html><body><h1>RealityView</h1>" + "<p>A SwiftUI view for RealityKit content.</p>" * 200 + "</body></html>"
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    store = BlobStore(tmp_path / 'blobs', compression='gzip')
+    first = store.put('raw', 'https://developer.apple.com/documentation/realitykit/realityview', PAGE)
+    second = store.put('raw', 'https://developer.apple.com/documentation/realitykit/realityview/', PAGE)
+
+    assert first == second
+    assert store.stats['deduplicated'] == 1
+    assert len(list(store.objects_dir.rglob('*.gz'))) == 1
+    assert store.disk_usage() < len(PAGE) / 4
+    assert store.get_text('raw', 'https://developer.apple.com/documentation/realitykit/realityview/') == PAGE
+
+
+def test_references_carry_metadata_and_timestamps(tmp_path):
+    store = BlobStore(tmp_path / 'blobs', compression='gzip')
+    store.put('content', 'https://example.com/a', PAGE, meta={'validators': {'ETag': '"v1"'}})
+    store.touch('content', 'https://example.com/a', at=1000.0)
+
+    entry = store.ref('content', 'https://example.com/a')
+    assert entry['meta'] == {'validators': {'ETag': '"v1"'}}
+    assert entry['updated_at'] == 1000.0
+    assert entry['size'] == len(PAGE)
+    assert store.ref('raw', 'https://example.com/a') is None
+
+
+def test_blob_is_deleted_with_its_last_reference(tmp_path):
+    store = BlobStore(tmp_path / 'blobs', compression='gzip')
+    store.put('raw', 'a', PAGE)
+    store.put('raw', 'b', PAGE)
+
+    store.delete('raw', 'a')
+    assert store.get_text('raw', 'b') == PAGE
+    store.delete('raw', 'b')
+    assert list(store.objects_dir.rglob('*.gz')) == []
+
+
+def test_zstd_falls_back_to_gzip_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, 'zstandard', None)
+    store = BlobStore(tmp_path / 'blobs', compression='zstd')
+    assert store.codec == 'gzip'
+    with pytest.raises(ValueError):
+        BlobStore(tmp_path / 'other', compression='brotli')
+
+
+def test_legacy_raw_files_are_migrated(tmp_path):
+    content_dir = tmp_path / 'cache' / 'content'
+    content_dir.mkdir(parents=True)
+    (content_dir / 'abc.html').write_text(PAGE)
+    (content_dir / 'abc.meta.json').write_text(json.dumps({
+        'url': 'https://example.com/a', 'validators': {'ETag': '"v1"'}
+    }))
+    (content_dir / 'def.html').write_text('<p>no metadata</p>')
+    debug_dir = tmp_path / 'debug'
+    debug_dir.mkdir()
+    (debug_dir / 'raw_a.html').write_text(PAGE)
+
+    store = BlobStore(tmp_path / 'cache' / 'blobs', compression='gzip')
+    assert migrate_raw_files(tmp_path, store) == 3
+    assert store.get_text('content', 'def') == '<p>no metadata</p>'
+    assert not any(content_dir.iterdir())
+
+    assert store.get_text('content', 'https://example.com/a') == PAGE
+    assert store.ref('content', 'https://example.com/a')['meta']['validators'] == {'ETag': '"v1"'}
+    assert store.get_text('debug', 'debug/raw_a.html') == PAGE
+    assert not (debug_dir / 'raw_a.html').exists()
+    assert len(list(store.objects_dir.rglob('*.gz'))) == 2
+
+
+def test_put_restores_an_object_deleted_after_deduplication(tmp_path, monkeypatch):
+    store = BlobStore(tmp_path / 'blobs', compression='gzip')
+    store.put('raw', 'a', PAGE)
+    put_blob = store.put_blob
+
+    def put_blob_then_delete(data):
+        # The last other reference goes away between deduplication and the new reference
+        digest = put_blob(data)
+        store.delete('raw', 'a')
+        return digest
+
+    monkeypatch.setattr(store, 'put_blob', put_blob_then_delete)
+    store.put('content', 'b', PAGE)
+    assert store.get_text('content', 'b') == PAGE
+    store.close()
@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from types import SimpleNamespace
+import pytest
+from core.blob_store import BlobStore
+from core.cache_budget import CacheBudget
+from core.crawl_journal import CrawlJournal, CrawlState
+
+
+def make_file(path, size, age):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def build_data_dir(base):
+    pinned = make_file(base / 'projects' / 'Pinned' / 'App.swift', 4000, age=9000)
+    make_file(base / 'projects' / 'Stale' / 'App.swift', 4000, age=8000)
+    make_file(base / 'projects' / 'Recent' / 'App.swift', 4000, age=10)
+    make_file(base / 'projects' / '.Broken.extracting' / 'App.swift', 100, age=7200)
+    make_file(base / 'debug' / 'raw_page.html', 1000, age=5000)
+    make_file(base / 'cache' / 'documentation' / 'visionos.json', 500, age=9000)
+
+    knowledge = base / 'knowledge'
+    knowledge.mkdir(parents=True)
+    (knowledge / 'patterns.json').write_text(json.dumps({
+        'ui_components': {'count': 1, 'files': [str(pinned)], 'examples': []}
+    }))
+
+    store = BlobStore(base / 'cache' / 'blobs', compression='gzip')
+    store.put('raw', 'https://example.com/a', os.urandom(3000))
+    store.put('response', 'https://example.com/b', b'shared')
+    store.put('content', 'https://example.com/b', b'shared')
+    store.touch('raw', 'https://example.com/a', at=time.time() - 6000)
+    store.close()
+
+
+def test_dry_run_reports_without_deleting(tmp_path):
+    build_data_dir(tmp_path)
+    budget = CacheBudget(tmp_path, budget=9000)
+
+    report = budget.collect(dry_run=True)
+
+    assert report['pinned'] == 1
+    assert report['evicted'][0] == 'project .Broken.extracting'
+    assert 'project Stale' in report['evicted']
+    assert (tmp_path / 'projects' / 'Stale').exists()
+    assert (tmp_path / 'projects' / '.Broken.extracting').exists()
+
+
+def test_evicts_least_recently_used_down_to_budget(tmp_path):
+    build_data_dir(tmp_path)
+    report = CacheBudget(tmp_path, budget=9000).collect()
+
+    assert report['after'] <= 9000
+    assert (tmp_path / 'projects' / 'Pinned').exists()
+    assert (tmp_path / 'projects' / 'Recent').exists()
+    assert not (tmp_path / 'projects' / 'Stale').exists()
+    assert not (tmp_path / 'projects' / '.Broken.extracting').exists()
+    # Documentation page content is not cache-managed
+    assert (tmp_path / 'cache' / 'documentation' / 'visionos.json').exists()
+
+    store = BlobStore(tmp_path / 'cache' / 'blobs', compression='gzip')
+    assert store.ref('raw', 'https://example.com/a') is None
+    # Both references to the recently used shared blob survive
+    assert store.get('content', 'https://example.com/b') == b'shared'
+    store.close()
+
+
+def test_oldest_policy_ignores_recent_access(tmp_path):
+    build_data_dir(tmp_path)
+    recent = tmp_path / 'projects' / 'Stale' / 'App.swift'
+    os.utime(recent, (time.time(), recent.stat().st_mtime))  # read just now, written long ago
+
+    lru = CacheBudget(tmp_path, budget=12000, policy='lru').plan()
+    oldest = CacheBudget(tmp_path, budget=12000, policy='oldest').plan()
+    assert 'project Stale' not in [entry.name for entry in lru]
+    assert 'project Stale' in [entry.name for entry in oldest]
+
+
+def test_evicted_project_is_forgotten_and_requeued(tmp_path):
+    build_data_dir(tmp_path)
+    make_file(tmp_path / 'cache' / 'documentation' / 'visionos.html', 20000, age=9000)
+    url = 'https://example.com/Stale.zip'
+    samples_cache = tmp_path / 'cache' / 'discovered_samples.json'
+    samples_cache.write_text(json.dumps({'cached_at': 'now', 'samples': [
+        {'url': url, 'download_url': url, 'local_path': str(tmp_path / 'projects' / 'Stale')},
+        {'url': 'https://example.com/Recent.zip', 'local_path': str(tmp_path / 'projects' / 'Recent')},
+    ]}))
+    journal = CrawlJournal(tmp_path / 'cache' / 'crawl_journal.sqlite3')
+    journal.enqueue_many([url], 'samples')
+    journal.mark(url, CrawlState.EXTRACTED)
+    journal.close()
+
+    report = CacheBudget(tmp_path, budget=9000).collect()
+
+    assert 'project Stale' in report['evicted']
+    # The tracked documentation corpus is never an eviction candidate
+    assert not any('visionos.html' in name for name in report['evicted'])
+    assert (tmp_path / 'cache' / 'documentation' / 'visionos.html').exists()
+    samples = json.loads(samples_cache.read_text())['samples']
+    assert [sample['url'] for sample in samples] == ['https://example.com/Recent.zip']
+    journal = CrawlJournal(tmp_path / 'cache' / 'crawl_journal.sqlite3')
+    assert journal.get(url)['state'] == CrawlState.QUEUED.value
+    journal.close()
+
+
+@pytest.mark.asyncio
+async def test_end_of_run_gc_waits_for_pending_writes(tmp_path, monkeypatch):
+    from core.write_behind import WriteBehindQueue
+    import run_scraper
+    monkeypatch.setattr(run_scraper, 'CacheBudget', lambda base_dir: CacheBudget(base_dir, budget=0))
+
+    writer = WriteBehindQueue()
+    dump = tmp_path / 'debug' / 'late_dump.html'
+
+    def slow_write():
+        time.sleep(0.1)
+        make_file(dump, 1000, age=5000)
+
+    await writer.submit(slow_write)
+    report = await run_scraper.collect_cache_garbage(SimpleNamespace(writer=writer, base_dir=tmp_path))
+    writer.close()
+
+    # The dump was written before the collection, so it was seen and evicted
+    assert 'debug late_dump.html' in report['evicted']
+    assert not dump.exists()
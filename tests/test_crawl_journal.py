@@ -0,0 +1,90 @@
+import pytest
+import json
+from core.crawl_journal import CrawlJournal, CrawlState
+from core.crawler import DocumentationCrawler
+
+SITE = {
+    'root': ['a', 'b'],
+    'a': ['a1'],
+    'b': ['b1'],
+}
+
+
+def test_states_survive_reopening(tmp_path):
+    """Every state change is persisted immediately, not at the end of a run"""
+    db_path = tmp_path / 'journal.sqlite3'
+    journal = CrawlJournal(db_path)
+    journal.begin_run()
+    journal.enqueue_many(['https://example.com/a.zip', 'https://example.com/b.zip'], 'samples')
+    journal.mark('https://example.com/a.zip', CrawlState.FETCHED, content_hash='abc')
+    journal.mark('https://example.com/b.zip', CrawlState.FAILED, error='Download failed')
+    journal.close()
+
+    reopened = CrawlJournal(db_path)
+    a = reopened.get('https://example.com/a.zip')
+    assert a['state'] == CrawlState.FETCHED.value
+    assert a['content_hash'] == 'abc'
+    assert a['category'] == 'samples'
+    assert a['attempts'] == 1
+    assert reopened.get('https://example.com/b.zip')['error'] == 'Download failed'
+    assert reopened.counts() == {'fetched': 1, 'failed': 1}
+
+
+def test_unfinished_run_is_resumed(tmp_path):
+    journal = CrawlJournal(tmp_path / 'journal.sqlite3')
+    assert journal.begin_run() is False
+    journal.mark('root', CrawlState.EXTRACTED)
+    assert journal.is_done('root')
+
+    # Crash: no finish_run, so the next run picks up the same run id
+    assert journal.begin_run() is True
+    assert journal.is_done('root')
+
+    journal.finish_run()
+    assert journal.begin_run() is False
+    assert not journal.is_done('root')
+    assert journal.is_done('root', current_run=False)
+
+
+def test_legacy_url_cache_is_imported_once(tmp_path):
+    url_cache = tmp_path / 'url_cache.json'
+    url_cache.write_text(json.dumps({'processed_urls': ['https://example.com/old.zip']}))
+    journal = CrawlJournal(tmp_path / 'journal.sqlite3')
+
+    journal.import_legacy_url_cache(url_cache)
+    assert journal.urls(CrawlState.EXTRACTED) == {'https://example.com/old.zip'}
+
+    journal.reset()
+    journal.import_legacy_url_cache(url_cache)
+    assert journal.urls() == set()
+
+
+@pytest.mark.asyncio
+async def test_crawl_resumes_from_journal(tmp_path, fake_browser):
+    """Pages extracted before a crash are replayed from the journal, not refetched"""
+    journal = CrawlJournal(tmp_path / 'journal.sqlite3')
+    journal.begin_run()
+
+    visits = []
+    crashing = {'b'}
+
+    async def handler(page, url, category):
+        visits.append(url)
+        if url in crashing:
+            raise RuntimeError("browser crashed")
+        return {'title': url, 'child_pages': SITE.get(url, [])}
+
+    first = DocumentationCrawler(handler, workers=1, max_depth=2, journal=journal)
+    await first.crawl(fake_browser, [('root', 'documentation')])
+    assert journal.get('b')['state'] == CrawlState.FAILED.value
+    assert journal.get('a1')['depth'] == 2
+    assert journal.get('root')['children'] == ['a', 'b']
+
+    visits.clear()
+    crashing.clear()
+    second = DocumentationCrawler(handler, workers=1, max_depth=2, journal=journal)
+    stats = await second.crawl(fake_browser, [('root', 'documentation')])
+
+    assert visits == ['b', 'b1']
+    assert stats.resumed == 3
+    assert journal.urls(CrawlState.EXTRACTED) == {'root', 'a', 'b', 'a1', 'b1'}
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from core.crawler import DocumentationCrawler
+from core.work_queue import WorkQueue
+
+# Small documentation graph: each URL maps to its child pages
+SITE = {
+    'root': ['a', 'b'],
+    'a': ['a1', 'a2', 'b'],
+    'b': ['b1', 'root'],
+    'a1': ['deep'],
+    'a2': [],
+    'b1': [],
+    'deep': ['deeper'],
+}
+
+
+def make_handler(visits):
+    async def handler(page, url, category):
+        visits.append(url)
+        if url == 'broken':
+            raise RuntimeError("navigation failed")
+        return {'title': url, 'child_pages': SITE.get(url, [])}
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_crawl_is_breadth_first_and_depth_bounded(fake_browser):
+    """Pages are visited level by level, once each, up to max_depth"""
+    visits = []
+    crawler = DocumentationCrawler(make_handler(visits), workers=2, max_depth=2, max_pages_per_depth=None)
+    stats = await crawler.crawl(fake_browser, [('root', 'documentation')])
+
+    assert visits[0] == 'root'
+    assert set(visits[1:3]) == {'a', 'b'}
+    assert set(visits[3:]) == {'a1', 'a2', 'b1'}
+    assert stats.pages == 6
+    assert {d: len(urls) for d, urls in stats.depth_pages.items()} == {0: 1, 1: 2, 2: 3}
+    assert 'deep' not in visits
+    assert stats.pages_per_second > 0
+    # One shared context means one browser session for the whole crawl
+    assert len(fake_browser.contexts) == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_respects_per_depth_limits_and_failures(fake_browser):
+    """Per-depth caps trim the frontier and failed pages are recorded"""
+    visits = []
+    crawler = DocumentationCrawler(make_handler(visits), workers=3, max_depth=3,
+                                   max_pages_per_depth={1: 1})
+    stats = await crawler.crawl(fake_browser, [('root', 'documentation'), ('broken', 'tools')])
+
+    assert stats.failed == {'broken'}
+    assert len(stats.depth_pages[1]) == 1
+    assert stats.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_a_queue_visit_each_page_once(tmp_path, fake_browser):
+    visits = []
+
+    async def handler(page, url, category):
+        visits.append(url)
+        await asyncio.sleep(0)
+        return {'title': url, 'child_pages': SITE.get(url, [])}
+
+    path = tmp_path / 'queue.sqlite3'
+    WorkQueue(path).push_many(['root'], 'documentation', depth=0)
+    crawlers = [DocumentationCrawler(handler, workers=2, max_depth=2) for _ in range(2)]
+    results = await asyncio.gather(*(
+        crawler.crawl_queue(fake_browser, WorkQueue(path, max_depth=2), f"worker-{n}", poll_interval=0.01)
+        for n, crawler in enumerate(crawlers)
+    ))
+
+    assert sorted(visits) == ['a', 'a1', 'a2', 'b', 'b1', 'root']
+    assert sum(stats.pages for stats in results) == 6
+    depths = {}
+    for stats in results:
+        for depth, urls in stats.depth_pages.items():
+            depths.setdefault(depth, set()).update(urls)
+    assert depths == {0: {'root'}, 1: {'a', 'b'}, 2: {'a1', 'a2', 'b1'}}
+    assert WorkQueue(path).counts() == {'done': 6}
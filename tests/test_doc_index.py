@@ -0,0 +1,52 @@
+import json
+from core.doc_index import DocumentationIndex
+
+
+def entry(title):
+    return {'local_path': f"data/cache/documentation/{title}.json", 'category': 'documentation', 'title': title}
+
+
+def test_updates_append_without_rewriting_the_snapshot(tmp_path):
+    snapshot = tmp_path / 'documentation_content.json'
+    snapshot.write_text(json.dumps({'cached_at': '2024-11-17T10:48:48+00:00', 'pages': {
+        'https://developer.apple.com/documentation/visionos': entry('visionOS')
+    }}))
+    before = snapshot.read_text()
+
+    index = DocumentationIndex(snapshot, compact_every=100)
+    index.update('https://developer.apple.com/documentation/realitykit', entry('RealityKit'))
+    index.update('https://developer.apple.com/documentation/visionos', entry('visionOS 2'))
+
+    assert snapshot.read_text() == before
+    assert len(index.log_path.read_text().splitlines()) == 2
+
+    reloaded = DocumentationIndex(snapshot).load()
+    assert reloaded.cached_at == '2024-11-17T10:48:48+00:00'
+    assert reloaded.get('https://developer.apple.com/documentation/visionos')['title'] == 'visionOS 2'
+    assert len(reloaded.pages) == 2
+
+
+def test_compaction_folds_the_log_into_the_snapshot(tmp_path):
+    snapshot = tmp_path / 'documentation_content.json'
+    index = DocumentationIndex(snapshot, compact_every=3)
+    for i in range(4):
+        index.update(f"https://developer.apple.com/documentation/page{i}", entry(f"page{i}"))
+
+    # Three appends triggered a compaction; the fourth is in a fresh log
+    assert len(json.loads(snapshot.read_text())['pages']) == 3
+    assert len(index.log_path.read_text().splitlines()) == 1
+
+    index.checkpoint()
+    assert not index.log_path.exists()
+    assert len(json.loads(snapshot.read_text())['pages']) == 4
+
+
+def test_truncated_log_line_is_skipped(tmp_path):
+    snapshot = tmp_path / 'documentation_content.json'
+    index = DocumentationIndex(snapshot)
+    index.update('https://developer.apple.com/documentation/arkit', entry('ARKit'))
+    with open(index.log_path, 'a') as log:
+        log.write('{"url": "https://developer.apple.com/documentation/cut')
+
+    reloaded = DocumentationIndex(snapshot).load()
+    assert list(reloaded.pages) == ['https://developer.apple.com/documentation/arkit']
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from core.extraction_pool import ExtractionPool, extract_page, match_code_patterns
+
+URL = 'https://developer.apple.com/documentation/visionos'
+
+PAGE = """<html><body><h1>RealityView</h1>
+<div class="code-listing"><pre><code>RealityView { content in content.add(Entity()) }</code></pre></div>
+<div class="code-listing"><pre><code>WindowGroup { ContentView() }.gesture(TapGesture())</code></pre></div>
+<p><code>let x = 1</code></p>
+</body></html>"""
+
+
+@pytest.mark.asyncio
+async def test_pool_results_match_inline_extraction():
+    pool = ExtractionPool(workers=2, max_pending=3)
+    pages = [PAGE.replace('RealityView', f'RealityView{n}') for n in range(6)]
+    try:
+        results = await asyncio.gather(*(pool.run(extract_page, html, f"{URL}/{n}") for n, html in enumerate(pages)))
+    finally:
+        pool.close()
+
+    assert [page.model_dump(exclude={'scraped_at'}) for page in results] == [
+        extract_page(html, f"{URL}/{n}").model_dump(exclude={'scraped_at'}) for n, html in enumerate(pages)
+    ]
+    assert results[3].title == 'RealityView3'
+    assert len(results[3].code_blocks) == 2
+    assert pool.pending == 0
+    assert pool.stats['completed'] == len(pages)
+    assert pool.stats['peak_pending'] == 3
+    assert pool.stats['backpressure'] == max(0, len(pages) - 3)
+
+
+@pytest.mark.asyncio
+async def test_code_pattern_matches_and_errors_inline():
+    pool = ExtractionPool(workers=0)
+    matches = await pool.run(match_code_patterns, PAGE, URL)
+    assert [example['code'] for example in matches['3d_content']] == [
+        'RealityView { content in content.add(Entity()) }'
+    ]
+    assert len(matches['ui_components']) == 2
+    assert len(matches['gestures']) == 1
+    assert 'spatial_audio' not in matches
+
+    with pytest.raises(TypeError):
+        await pool.run(match_code_patterns, None, URL)
+    assert pool.stats['errors'] == 1
+    assert pool.stats['completed'] == 1
+    assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_reserve_holds_fetching_until_a_slot_frees():
+    pool = ExtractionPool(workers=0, max_pending=1)
+    await pool.reserve()
+    waiting = asyncio.create_task(pool.reserve())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    assert pool.stats['backpressure'] == 1
+
+    await pool.run(match_code_patterns, PAGE, URL, reserved=True)
+    await asyncio.wait_for(waiting, 1)
+    assert pool.pending == 1
+    pool.release()
+    assert pool.pending == 0
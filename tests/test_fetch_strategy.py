@@ -0,0 +1,159 @@
+import pytest
+import json
+from bs4 import BeautifulSoup
+from aiohttp import web
+from core.fetch_strategy import (
+    StrategyFetcher,
+    DocCJSONStrategy,
+    StaticHTMLStrategy,
+    BrowserStrategy,
+    PAGE_CONTENT_SCRIPT,
+    docc_data_url,
+    extract_html_content,
+    parse_docc_json,
+)
+from core.url_sources import DocumentationURLCollector
+
+REQUIRED = {'title': DocumentationURLCollector.DOCUMENTATION_SELECTORS['title']}
+
+RENDER_JSON = {
+    'metadata': {'title': 'RealityView', 'roleHeading': 'Structure'},
+    'abstract': [
+        {'type': 'text', 'text': 'A view for displaying '},
+        {'type': 'codeVoice', 'code': 'RealityKit'},
+        {'type': 'text', 'text': ' content.'}
+    ],
+    'primaryContentSections': [
+        {'kind': 'declarations', 'declarations': [
+            {'tokens': [{'text': 'struct'}, {'text': ' '}, {'text': 'RealityView'}]}
+        ]},
+        {'kind': 'parameters', 'parameters': [
+            {'name': 'make', 'content': [
+                {'type': 'paragraph', 'inlineContent': [{'type': 'text', 'text': 'Builds content.'}]}
+            ]}
+        ]}
+    ],
+    'topicSections': [{'title': 'Creating', 'identifiers': ['doc://child', 'doc://missing']}],
+    'references': {'doc://child': {'url': '/documentation/realitykit/realityview/init'}}
+}
+
+SHELL_HTML = '<html><body><noscript><h1 class="noscript-title">This page requires JavaScript.</h1></noscript></body></html>'
+RENDERED_HTML = ('<html><body><div class="topictitle"><h1>Entity</h1></div>'
+                 '<div class="description">An element of a scene.</div></body></html>')
+
+
+def test_docc_data_url():
+    assert docc_data_url("https://developer.apple.com/documentation/visionos/") == \
+        "https://developer.apple.com/tutorials/data/documentation/visionos.json"
+    assert docc_data_url("https://developer.apple.com/visionos/") is None
+
+
+def test_parse_docc_json():
+    content = parse_docc_json(RENDER_JSON, "https://developer.apple.com/documentation/realitykit/realityview")
+    assert content['title'] == 'RealityView'
+    assert content['type'] == 'Structure'
+    assert content['description'] == 'A view for displaying RealityKit content.'
+    assert content['declaration']['swift'] == 'struct RealityView'
+    assert content['parameters'] == [{'name': 'make', 'description': 'Builds content.'}]
+    assert content['child_pages'] == ["https://developer.apple.com/documentation/realitykit/realityview/init"]
+
+
+TOPICS_HTML = (
+    '<html><body><h1>RealityView</h1>'
+    '<div class="declaration"><pre>struct RealityView</pre></div>'
+    '<div class="code-listing" data-syntax="swift"><pre><code>RealityView { content in }</code></pre></div>'
+    '<section class="contenttable-section">'
+    '<a href="/documentation/realitykit/realityview/init#overview">init</a>'
+    '<a href="/documentation/realitykit/realityview/init">init again</a>'
+    '<a href="https://example.org/documentation/other">elsewhere</a>'
+    '<a href="/videos/play/wwdc2023">video</a>'
+    '</section></body></html>'
+)
+
+
+def test_extract_html_content_finds_child_pages_and_code():
+    url = "https://developer.apple.com/documentation/realitykit/realityview"
+    content = extract_html_content(BeautifulSoup(TOPICS_HTML, 'html.parser'), url)
+
+    assert content['child_pages'] == ["https://developer.apple.com/documentation/realitykit/realityview/init"]
+    assert content['code_blocks'] == [{'code': 'RealityView { content in }', 'language': 'swift'}]
+    assert content['declaration']['swift'] == 'struct RealityView'
+
+
+@pytest.mark.asyncio
+async def test_browser_extraction_is_one_evaluate_call(tmp_path):
+    calls = []
+
+    class EvaluatingPage:
+        async def evaluate(self, script, arg=None):
+            calls.append((script, arg))
+            return {'title': 'RealityView', 'child_pages': ['https://developer.apple.com/documentation/a']}
+
+        def __getattr__(self, name):
+            raise AssertionError(f"Unexpected Playwright call: {name}")
+
+    collector = DocumentationURLCollector(base_dir=tmp_path)
+    content = await collector._extract_page_content(EvaluatingPage(), 'https://developer.apple.com/x', 'documentation')
+    collector.writer.close()
+
+    assert content['title'] == 'RealityView'
+    assert len(calls) == 1 and calls[0][0] == PAGE_CONTENT_SCRIPT
+
+
+@pytest.mark.asyncio
+async def test_fetcher_prefers_http_and_falls_back(http_server):
+    """JSON is used when available, static HTML when it has the selectors, browser otherwise"""
+    async def render_json(request):
+        return web.json_response(RENDER_JSON)
+
+    async def not_found(request):
+        raise web.HTTPNotFound()
+
+    def html(body):
+        async def handler(request):
+            return web.Response(text=body, content_type='text/html')
+        return handler
+
+    base = await http_server([
+        web.get('/tutorials/data/documentation/realitykit/realityview.json', render_json),
+        web.get('/tutorials/data/documentation/{tail:.*}', not_found),
+        web.get('/documentation/realitykit/entity', html(RENDERED_HTML)),
+        web.get('/documentation/realitykit/shell', html(SHELL_HTML)),
+    ])
+
+    browser_calls = []
+
+    class StubPage:
+        async def goto(self, url, **kwargs):
+            browser_calls.append(url)
+
+        async def wait_for_selector(self, selector, **kwargs):
+            pass
+
+        async def content(self):
+            return RENDERED_HTML
+
+    async def extractor(page, url):
+        return {'title': 'Rendered'}
+
+    fetcher = StrategyFetcher([DocCJSONStrategy(), StaticHTMLStrategy(REQUIRED), BrowserStrategy(extractor)])
+    try:
+        json_result = await fetcher.fetch(f"{base}/documentation/realitykit/realityview", StubPage())
+        html_result = await fetcher.fetch(f"{base}/documentation/realitykit/entity", StubPage())
+        browser_result = await fetcher.fetch(f"{base}/documentation/realitykit/shell", StubPage())
+    finally:
+        await fetcher.close()
+
+    assert json_result.strategy == 'json'
+    assert json_result.content['child_pages'] == [f"{base}/documentation/realitykit/realityview/init"]
+    assert html_result.strategy == 'html'
+    assert html_result.content == {'title': 'Entity', 'description': 'An element of a scene.'}
+    assert browser_result.strategy == 'browser'
+    assert browser_calls == [f"{base}/documentation/realitykit/shell"]
+    assert fetcher.hits == {'json': 1, 'html': 1, 'browser': 1}
+    assert fetcher.hit_rates() == {'json': 1 / 3, 'html': 0.5, 'browser': 1.0}
+
+
+def test_from_names_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        StrategyFetcher.from_names(['json', 'carrier-pigeon'], REQUIRED, None)
@@ -0,0 +1,55 @@
+import json
+import pytest
+from pathlib import Path
+from core import html_parser
+from core.fetch_strategy import extract_html_content
+from core.html_parser import parse_html, resolve_parser
+from extractors import CodeBlockExtractor, DocumentationExtractor
+from extractors.base_extractor import BaseExtractor
+from analyzers.documentation_analyzer import DocumentationAnalyzer
+
+# Fixed corpus: cached documentation pages plus an article with code listings and nested headings
+FIXTURE_PAGES = sorted((Path(__file__).parent / 'fixtures' / 'html').glob('*.html'))
+
+
+def outcome(fn, *args):
+    """Result of a call, or its exception type, so both parsers can be compared either way"""
+    try:
+        return fn(*args)
+    except Exception as e:
+        return type(e).__name__
+
+
+def extract_all(html, parser):
+    """Everything the extractors derive from one page, in comparable form"""
+    soup = parse_html(html, parser)
+    doc_extractor = DocumentationExtractor()
+    entry = BaseExtractor().extract(soup)
+    return json.loads(json.dumps({
+        'content': extract_html_content(soup, 'https://developer.apple.com/documentation/visionos'),
+        'code_blocks': [block.model_dump() for block in CodeBlockExtractor().extract_code_blocks(soup)],
+        'title': doc_extractor._extract_title(soup),
+        'topics': [topic.model_dump() for topic in doc_extractor._extract_topics(soup)],
+        'entry': entry.model_dump(exclude={'scraped_at'}) if entry else None,
+        # Still raises on pages with <code> blocks; the parsers must at least agree on that
+        'code_patterns': outcome(DocumentationAnalyzer().analyze_code_patterns, html, 'page', parser),
+    }, default=str, sort_keys=True))
+
+
+def test_parity_corpus_is_present():
+    assert len(FIXTURE_PAGES) >= 4
+
+
+@pytest.mark.parametrize('path', FIXTURE_PAGES, ids=lambda path: path.name)
+def test_lxml_extraction_matches_html_parser(path):
+    pytest.importorskip('lxml')
+    html = path.read_text(encoding='utf-8')
+    assert extract_all(html, 'lxml') == extract_all(html, 'html.parser')
+
+
+def test_missing_lxml_falls_back_to_html_parser(monkeypatch):
+    monkeypatch.setattr(html_parser, 'lxml', None)
+    assert resolve_parser('lxml') == 'html.parser'
+    assert parse_html('<h1>Entity</h1>').h1.get_text() == 'Entity'
+    with pytest.raises(ValueError):
+        resolve_parser('regex')
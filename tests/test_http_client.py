@@ -0,0 +1,59 @@
+import pytest
+import asyncio
+import time
+from aiohttp import web
+from core.http_client import HttpClient, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    # First token is free, the remaining four arrive at 20/sec
+    assert time.monotonic() - started >= 0.18
+
+
+@pytest.mark.asyncio
+async def test_retries_throttling_and_server_errors(http_server):
+    """429 and 5xx responses are retried and counted before the final response is returned"""
+    responses = [
+        web.Response(status=429, headers={'Retry-After': '0'}),
+        web.Response(status=503),
+        web.Response(text='ok'),
+    ]
+
+    async def flaky(request):
+        return responses.pop(0)
+
+    base = await http_server([web.get('/flaky', flaky)])
+    async with HttpClient(rate_per_host=0, backoff_base=0.01) as client:
+        async with client.get(f"{base}/flaky") as response:
+            assert response.status == 200
+            assert await response.text() == 'ok'
+
+    assert client.stats['requests'] == 3
+    assert client.stats['retries'] == 2
+    assert client.stats['throttled'] == 1
+    assert client.stats['server_errors'] == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(http_server):
+    async def broken(request):
+        return web.Response(status=500)
+
+    base = await http_server([web.get('/broken', broken)])
+    async with HttpClient(rate_per_host=0, backoff_base=0.01, max_retries=2) as client:
+        async with client.get(f"{base}/broken") as response:
+            assert response.status == 500
+    assert client.stats['requests'] == 3
+
+
+def test_backoff_is_jittered_and_capped():
+    client = HttpClient(backoff_base=1.0, backoff_max=4.0)
+    delays = [client.backoff_delay(10) for _ in range(50)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert client.backoff_delay(0, retry_after='2') == 2.0
@@ -0,0 +1,41 @@
+import pytest
+import asyncio
+from core.page_pool import PagePool
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_concurrency_and_reuses_pages(fake_browser):
+    """Never more than `size` pages are borrowed at once and pages are reused"""
+    browser = fake_browser
+    active = 0
+    peak = 0
+
+    async def work(pool):
+        nonlocal active, peak
+        async with pool.page():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async with PagePool(browser, size=3) as pool:
+        await asyncio.gather(*(work(pool) for _ in range(12)))
+        assert pool.acquisitions == 12
+        assert pool.pages_created <= 3
+
+    assert peak == 3
+    assert len(browser.contexts) == 1
+    assert browser.contexts[0].closed
+    assert all(page.closed for page in browser.contexts[0].pages)
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_closed_pages(fake_browser):
+    """A page closed by the caller is dropped instead of returned to the pool"""
+    browser = fake_browser
+    async with PagePool(browser, size=1) as pool:
+        async with pool.page() as page:
+            await page.close()
+        async with pool.page() as second:
+            assert second is not page
+        assert pool.pages_created == 2
@@ -0,0 +1,58 @@
+import pytest
+import asyncio
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.page_readiness import PageReadiness
+
+
+class RenderingPage:
+    """Page whose readiness selectors attach after a fixed render delay"""
+
+    def __init__(self, render_seconds):
+        self.render_seconds = render_seconds
+        self.navigations = []
+        self.timeouts = []
+
+    async def goto(self, url, wait_until=None):
+        self.navigations.append((url, wait_until))
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        self.timeouts.append(timeout)
+        if self.render_seconds * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+        await asyncio.sleep(self.render_seconds)
+
+
+def test_url_patterns_group_by_section():
+    assert PageReadiness.pattern("https://developer.apple.com/documentation/realitykit/entity/children") == \
+        PageReadiness.pattern("https://developer.apple.com/documentation/realitykit/realityview")
+    assert PageReadiness.pattern("https://developer.apple.com/documentation/arkit/") != \
+        PageReadiness.pattern("https://developer.apple.com/documentation/realitykit/")
+
+
+@pytest.mark.asyncio
+async def test_timeout_adapts_to_observed_readiness():
+    readiness = PageReadiness(selectors=['h1', '.abstract'], default_timeout=2000,
+                              min_timeout=50, factor=3.0)
+    page = RenderingPage(render_seconds=0.02)
+    url = "https://developer.apple.com/documentation/realitykit/entity"
+
+    assert await readiness.goto(page, url)
+    assert page.navigations == [(url, 'domcontentloaded')]
+    assert page.timeouts[0] == 2000
+
+    # The next page in the same section gets a timeout derived from the first
+    learned = readiness.timeout_for("https://developer.apple.com/documentation/realitykit/anchorentity")
+    assert 50 <= learned < 500
+    assert readiness.timeout_for("https://developer.apple.com/documentation/arkit/arsession") == 2000
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_false_and_widens_the_window():
+    readiness = PageReadiness(default_timeout=40, min_timeout=10, factor=2.0)
+    page = RenderingPage(render_seconds=1)
+    url = "https://developer.apple.com/visionos/"
+
+    assert await readiness.wait(page, url) is False
+    assert readiness.stats['timeouts'] == 1
+    assert readiness.timeout_for(url) == 80
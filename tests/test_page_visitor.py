@@ -0,0 +1,91 @@
+from core.html_parser import parse_html
+from extractors import CodeBlockExtractor, DocumentationExtractor, PageVisitor, RelationshipExtractor
+from extractors.doc_extractor import build_topic_tree
+
+PAGE = """<html><head><title>RealityView | Apple</title></head><body>
+<div class="topictitle"><h1>RealityView</h1></div>
+<section>
+  <h2>Overview</h2>
+  <p>Display <a href="/documentation/realitykit/entity">Entity</a> content.</p>
+  <p>Second paragraph.</p>
+  <div class="code-listing" data-syntax="swift"><pre><code>RealityView { content in }</code></pre></div>
+  <h3>Loading models</h3>
+  <ul><li>Load a <a href="/documentation/realitykit/modelentity">ModelEntity</a></li></ul>
+  <div class="code-listing"><pre><code>struct ContentView: View { }</code></pre></div>
+</section>
+<h2>Topics</h2>
+<div><p>Not a sibling paragraph.</p></div>
+<div class="code-listing"><pre><code>WindowGroup { ContentView() }</code></pre></div>
+</body></html>"""
+
+
+def test_one_walk_feeds_every_extractor():
+    soup = parse_html(PAGE)
+    visits = []
+    visitor = PageVisitor()
+    visitor.register(lambda elem, visitor: visits.append(elem.name), 'p')
+    code_extractor = CodeBlockExtractor()
+    code_blocks = code_extractor.attach(visitor)
+    outline = DocumentationExtractor().attach(visitor)
+    relationships = RelationshipExtractor().attach(visitor)
+    visitor.walk(soup)
+
+    assert visits == ['p', 'p', 'p']
+    assert visitor.elements == len(soup.find_all(True))
+    assert outline.title == 'RealityView | Apple'
+    assert [(topic.title, topic.content) for topic in outline.topics] == [
+        ('RealityView', None),
+        ('Overview', 'DisplayEntitycontent.\nSecond paragraph.'),
+        ('Loading models', None),
+        ('Topics', None),
+    ]
+    assert outline.topics[2].path == ['RealityView', 'Overview', 'Loading models']
+    assert outline.topics[3].path == ['RealityView', 'Topics']
+    assert [(block.code, block.description) for block in code_blocks] == [
+        ('RealityView { content in }', 'Second paragraph.'),
+        ('struct ContentView: View { }', 'Load aModelEntity'),
+        ('WindowGroup { ContentView() }', ''),
+    ]
+    assert [(r.source, r.target) for r in relationships] == [
+        ('Overview', 'Entity'), ('Loading models', 'ModelEntity')
+    ]
+    patterns = code_extractor.extract_patterns(code_blocks, 'https://developer.apple.com/documentation/realitykit')
+    assert ('ui_component_1', 'SwiftUI') in [
+        (r.source, r.target) for r in RelationshipExtractor().pattern_relationships(patterns)
+    ]
+
+
+def test_single_extractor_helpers_match_the_shared_walk():
+    soup = parse_html(PAGE)
+    extractor = DocumentationExtractor()
+    page = extractor.extract(soup)
+    assert page.title == extractor._extract_title(soup)
+    assert page.topics == extractor._extract_topics(soup)
+    assert [block.code for block in page.code_blocks] == [
+        block.code for block in CodeBlockExtractor().extract_code_blocks(soup)
+    ]
+
+
+def test_heading_stack_builds_topic_tree():
+    sections = ''.join(
+        f'<h2>Group {i}</h2><p>About {i}</p><h3>Item {i}</h3><h4>Detail {i}</h4><h3>Other {i}</h3>'
+        for i in range(500)
+    )
+    soup = parse_html(f'<body><h1>Reference</h1>{sections}</body>')
+    outline = DocumentationExtractor().extract_outline(soup)
+
+    assert len(outline.topics) == 2001
+    assert outline.topics[-1].path == ['Reference', 'Group 499', 'Other 499']
+    assert outline.topics[-2].path == ['Reference', 'Group 499', 'Item 499', 'Detail 499']
+    assert outline.topics[-4].content == 'About 499'
+
+    [root] = outline.tree
+    assert root.topic.title == 'Reference'
+    assert len(root.children) == 500
+    group = root.children[7].to_dict()
+    assert [child['title'] for child in group['children']] == ['Item 7', 'Other 7']
+    assert group['children'][0]['children'][0]['path'] == ['Reference', 'Group 7', 'Item 7', 'Detail 7']
+
+    # Serialized topics (as stored in data/extracted) rebuild the same tree
+    rebuilt = build_topic_tree(topic.model_dump() for topic in outline.topics)
+    assert [node.to_dict() for node in rebuilt] == [node.to_dict() for node in outline.tree]
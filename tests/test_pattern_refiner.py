@@ -1,6 +1,8 @@
 import pytest
+import re
 from pathlib import Path
-from analyzers.pattern_refiner import PatternRefiner
+from analyzers.pattern_refiner import PATTERN_RULES, PatternRefiner
+from models.base import Pattern
 from extractors.code_extractor import CodeBlockExtractor
 from utils.logging import logger
 import logging
@@ -192,4 +194,46 @@ def test_scene_understanding_pattern(setup_test_files, caplog):
     assert "SceneUnderstanding" in refined_patterns["scene_understanding"]["detection_terms"]
     assert "planeDetection" in refined_patterns["scene_understanding"]["detection_terms"]
     assert {"ARKit", "RealityKit"} == refined_patterns["scene_understanding"]["common_imports"]
-    assert refined_patterns["scene_understanding"]["confidence"] >= 0.45
\ No newline at end of file
+    assert refined_patterns["scene_understanding"]["confidence"] >= 0.45
+
+
+ECS_SAMPLE = """import RealityKit
+import SwiftUI
+struct OrbitComponent: Component { var speed: Float }
+class OrbitSystem: System {
+    required init(scene: RealityKit.Scene) { scene.subscribe(to: SceneEvents.Update.self) { _ in } }
+    func update(context: SceneUpdateContext) {
+        for entity in context.scene.components.query(.init(where: .has(OrbitComponent.self))) {
+            let orbit = entity.components[OrbitComponent.self]
+            entity.move(to: Transform(scale: .one), relativeTo: nil, duration: 1)
+            entity.addChild(ModelEntity(mesh: .generateSphere(radius: 0.1)))
+            entity.transform.rotation = simd_quatf(angle: .pi, axis: [0, 1, 0])
+        }
+    }
+    func handleTapEvent(_ event: Event) { entity.playAnimation(entity.availableAnimations[0]) }
+}
+RealityView { content in
+    content.add(try await Entity.load("robot.usdz"))
+} update: { content in }
+.gesture(DragGesture().onChanged { value in
+    value.entity.position = value.convert(value.location3D, from: .local, to: .scene)
+})
+root.components[OrbitComponent.self]"""
+
+
+def test_detect_patterns_matches_per_rule_scan():
+    """The prefiltered, precompiled scan returns exactly what running every rule over the file does"""
+    fixtures = sorted((Path(__file__).parent / 'fixtures').glob('*.swift'))
+    refiner = PatternRefiner()
+    for code in [ECS_SAMPLE, ECS_SAMPLE + "\n", "", "\n".join(path.read_text() for path in fixtures)]:
+        expected = [
+            Pattern(name=pattern_type.value, type=pattern_type, confidence=0.85,
+                    line_number=code[:match.start()].count('\n') + 1, start=match.start(), end=match.end())
+            for pattern_type, regex, _ in PATTERN_RULES
+            for match in re.finditer(regex, code)
+        ]
+        assert refiner.detect_patterns(code) == expected
+
+    found = {pattern.type.name for pattern in refiner.detect_patterns(ECS_SAMPLE)}
+    assert {'COMPONENT_ACCESS', 'EVENT_HANDLING', 'HIERARCHY_ACTION', 'TRANSFORM_ACTION', 'ROTATION',
+            'USDZ_LOADING', 'GESTURE', 'ANIMATION_ACTION', 'ENTITY_SYSTEM'} <= found
@@ -0,0 +1,69 @@
+import zipfile
+from analyzers.project_analyzer import ProjectAnalyzer
+from core.project_archive import ArchiveProject, ArchivePath, archive_for, iter_project_files
+
+APP_SWIFT = """import SwiftUI
+import RealityKit
+
+struct ContentView: View {
+    var body: some View {
+        RealityView { content in }
+    }
+}
+"""
+
+
+def write_archive(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('Diorama/App/ContentView.swift', APP_SWIFT)
+        zf.writestr('Diorama/Model.swift', 'struct Model {}\n')
+        zf.writestr('Diorama/Assets/Terrain.usdz', b'\0' * 4096)
+        zf.writestr('__MACOSX/Diorama/._Model.swift', b'junk')
+        zf.writestr('../escape.swift', 'struct Escape {}\n')
+    return path
+
+
+def test_selective_extraction_only_writes_whitelisted_files(tmp_path):
+    archive = write_archive(tmp_path / 'Diorama.zip')
+    dest = tmp_path / 'out'
+    with ArchiveProject(archive, dest, extensions=['.swift']) as project:
+        count = project.extract_selected(dest)
+
+    assert count == 2
+    assert (dest / 'Diorama' / 'App' / 'ContentView.swift').read_text() == APP_SWIFT
+    assert not (dest / 'Diorama' / 'Assets' / 'Terrain.usdz').exists()
+    assert not (tmp_path / 'escape.swift').exists()
+
+
+def test_rglob_serves_members_from_the_archive(tmp_path):
+    projects = tmp_path / 'projects'
+    project_dir = projects / 'Diorama'
+    with ArchiveProject(write_archive(archive_for(project_dir)), project_dir) as project:
+        files = sorted(project.rglob('*.swift'), key=str)
+        assert [f.name for f in files] == ['escape.swift', 'ContentView.swift', 'Model.swift']
+        assert all(isinstance(f, ArchivePath) for f in files)
+        content_view = files[1]
+        assert content_view.read_text() == APP_SWIFT
+        assert content_view.parts[content_view.parts.index('projects') + 1] == 'Diorama'
+        assert [f.name for f in project.glob('Diorama/*.swift')] == ['Model.swift']
+
+
+def test_iter_project_files_mixes_extracted_and_lazy_projects(tmp_path):
+    projects = tmp_path / 'projects'
+    extracted = projects / 'HelloWorld'
+    extracted.mkdir(parents=True)
+    (extracted / 'App.swift').write_text('struct App {}\n')
+    (projects / '.downloads').mkdir()
+    (projects / '.downloads' / 'Stray.swift').write_text('')
+
+    lazy = projects / 'Diorama'
+    lazy.mkdir()
+    write_archive(archive_for(lazy))
+
+    names = sorted(f.name for f in iter_project_files(projects, '*.swift'))
+    assert names == ['App.swift', 'ContentView.swift', 'Model.swift', 'escape.swift']
+
+    # Analyzers consume archive-backed projects without any extraction
+    analysis = ProjectAnalyzer(projects).analyze_project(lazy)
+    assert analysis['patterns']['3d_content']['count'] >= 1
@@ -0,0 +1,225 @@
+import pytest
+import hashlib
+import io
+import json
+import shutil
+import zipfile
+import aiohttp
+from aiohttp import web
+from core.project_archive import changed_files, load_manifest
+from core.url_sources import DocumentationURLCollector
+from models.base import ProjectResource
+
+
+def build_archive() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('HelloWorld/App.swift', 'import SwiftUI\n@main struct HelloWorldApp: App {}\n')
+        zf.writestr('HelloWorld/Globe.usdz', b'\0' * 200_000)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def archive_server(http_server, tmp_path):
+    """Serve a sample archive with Range support and record request headers"""
+    archive = build_archive()
+    archive_path = tmp_path / 'served.zip'
+    archive_path.write_bytes(archive)
+    seen = []
+
+    async def download(request):
+        seen.append(dict(request.headers))
+        return web.FileResponse(archive_path)
+
+    async def start():
+        base = await http_server([web.get('/sample/HelloWorld.zip', download)])
+        return f"{base}/sample/HelloWorld.zip"
+    return archive, seen, start
+
+
+async def served_etag(url):
+    async with aiohttp.ClientSession() as session:
+        async with session.head(url) as response:
+            return response.headers['ETag']
+
+
+def write_part(collector, data, etag=None):
+    """Leave a partial download behind, as an interrupted attempt would"""
+    part_path = collector.downloads_dir / 'Hello_World.zip.part'
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path.write_bytes(data)
+    if etag:
+        part_path.with_name('Hello_World.zip.part.json').write_text(json.dumps({'ETag': etag}))
+    return part_path
+
+
+@pytest.mark.asyncio
+async def test_download_streams_resumes_and_records_checksum(tmp_path, archive_server):
+    archive, seen, start = archive_server
+    url = await start()
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+
+    # Simulate an interrupted earlier attempt
+    etag = await served_etag(url)
+    part_path = write_part(collector, archive[:50_000], etag)
+
+    assert await collector.download_project(project)
+
+    assert seen[-1]['Range'] == 'bytes=50000-'
+    assert seen[-1]['If-Range'] == etag
+    assert project.checksum == hashlib.sha256(archive).hexdigest()
+    assert (project.local_path / 'HelloWorld' / 'App.swift').exists()
+    assert not (project.local_path / 'HelloWorld' / 'Globe.usdz').exists()
+    assert not part_path.exists()
+    # Only lazy projects keep their archive
+    assert not (collector.projects_dir / '.archives' / 'Hello_World.zip').exists()
+
+    collector._update_cache([project])
+    cached = json.loads(collector.samples_cache.read_text())['samples'][0]
+    assert cached['checksum'] == project.checksum
+
+
+@pytest.mark.asyncio
+async def test_download_without_partial_file_fetches_everything(tmp_path, archive_server):
+    archive, seen, start = archive_server
+    url = await start()
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+
+    assert await collector.download_project(project)
+    assert 'Range' not in seen[-1]
+    assert project.checksum == hashlib.sha256(archive).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_lazy_mode_keeps_the_archive_instead_of_extracting(tmp_path, archive_server, monkeypatch):
+    monkeypatch.setattr('core.url_sources.ARCHIVE_EXTRACT_MODE', 'lazy')
+    archive, seen, start = archive_server
+    url = await start()
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+
+    assert await collector.download_project(project)
+
+    assert not any(project.local_path.iterdir())
+    assert (collector.projects_dir / '.archives' / 'Hello_World.zip').read_bytes() == archive
+    assert list(load_manifest(project.local_path)['files']) == ['HelloWorld/App.swift']
+
+
+@pytest.mark.asyncio
+async def test_resume_of_changed_archive_downloads_it_again(tmp_path, archive_server):
+    archive, seen, start = archive_server
+    url = await start()
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+    part_path = write_part(collector, b'stale bytes of an older archive', '"old"')
+
+    assert await collector.download_project(project)
+
+    assert seen[0]['If-Range'] == '"old"'
+    assert 'Range' not in seen[-1]
+    assert project.checksum == hashlib.sha256(archive).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_partial_file_without_validators_or_past_the_end_is_restarted(tmp_path, archive_server):
+    archive, seen, start = archive_server
+    url = await start()
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+
+    write_part(collector, archive[:50_000])
+    assert await collector.download_project(ProjectResource(title='Hello World', url=url, download_url=url))
+    assert 'Range' not in seen[-1]
+
+    # A "complete" part the server answers with 416 is not trusted
+    shutil.rmtree(collector.projects_dir)
+    write_part(collector, archive + b'corrupt tail', await served_etag(url))
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+    assert await collector.download_project(project)
+    assert 'Range' not in seen[-1]
+    assert project.checksum == hashlib.sha256(archive).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_archive_that_fails_to_extract_is_discarded(tmp_path, http_server):
+    async def download(request):
+        return web.Response(body=b'not a zip file', headers={'ETag': '"v1"'})
+
+    base = await http_server([web.get('/sample/HelloWorld.zip', download)])
+    url = f"{base}/sample/HelloWorld.zip"
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+
+    assert not await collector.download_project(ProjectResource(title='Hello World', url=url, download_url=url))
+    assert not any(collector.downloads_dir.iterdir())
+    assert not (collector.projects_dir / '.archives' / 'Hello_World.zip').exists()
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_partial_download_stays_conditional(tmp_path, http_server):
+    seen = []
+
+    async def download(request):
+        seen.append(dict(request.headers))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=build_archive(), headers={'ETag': '"v1"'})
+
+    base = await http_server([web.get('/sample/HelloWorld.zip', download)])
+    url = f"{base}/sample/HelloWorld.zip"
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    assert await collector.download_project(ProjectResource(title='Hello World', url=url, download_url=url))
+
+    part_path = write_part(collector, b'partial newer archive', '"v2"')
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+    assert await collector.download_project(project, refresh=True)
+
+    assert seen[-1]['If-None-Match'] == '"v1"'
+    assert load_manifest(project.local_path)['archive']['etag'] == '"v1"'
+    assert not part_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_refresh_reextracts_only_changed_archives(tmp_path, http_server):
+    versions = [build_archive()]
+    statuses = []
+
+    async def download(request):
+        etag = f'"v{len(versions)}"'
+        if request.headers.get('If-None-Match') == etag:
+            statuses.append(304)
+            return web.Response(status=304)
+        statuses.append(200)
+        return web.Response(body=versions[-1], headers={'ETag': etag})
+
+    base = await http_server([web.get('/sample/HelloWorld.zip', download)])
+    url = f"{base}/sample/HelloWorld.zip"
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+    assert await collector.download_project(project)
+    assert changed_files(project.local_path) == ['HelloWorld/App.swift']
+    app_swift = project.local_path / 'HelloWorld' / 'App.swift'
+    first_mtime = app_swift.stat().st_mtime_ns
+
+    # Unchanged archive: a 304, no re-extraction, nothing reported as changed
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+    assert await collector.download_project(project, refresh=True)
+    assert statuses == [200, 304]
+    assert app_swift.stat().st_mtime_ns == first_mtime
+    assert changed_files(project.local_path) == []
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('HelloWorld/App.swift', 'import SwiftUI\n@main struct HelloWorldApp: App { }\n')
+        zf.writestr('HelloWorld/Globe.swift', 'import RealityKit\n')
+    versions.append(buffer.getvalue())
+
+    project = ProjectResource(title='Hello World', url=url, download_url=url)
+    assert await collector.download_project(project, refresh=True)
+    manifest = load_manifest(project.local_path)
+    assert manifest['archive']['etag'] == '"v2"'
+    assert manifest['archive']['sha256'] == hashlib.sha256(versions[-1]).hexdigest()
+    assert manifest['changes'] == {'added': ['HelloWorld/Globe.swift'],
+                                   'modified': ['HelloWorld/App.swift'], 'removed': []}
+    assert (project.local_path / 'HelloWorld' / 'Globe.swift').exists()
@@ -0,0 +1,78 @@
+import pytest
+from core.page_pool import PagePool
+from core.resource_blocker import ResourceBlocker, ESTIMATED_RESOURCE_BYTES
+
+
+class FakeFrame:
+    def __init__(self, page):
+        self.page = page
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, page):
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = FakeFrame(page)
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = 'aborted'
+
+    async def fallback(self):
+        self.outcome = 'continued'
+
+
+def test_blocks_resource_types_and_third_party_hosts():
+    blocker = ResourceBlocker(resource_types=['image', 'font'], hosts=['google-analytics.com'])
+
+    assert blocker.should_block('https://developer.apple.com/hero.png', 'image')
+    assert blocker.should_block('https://www.google-analytics.com/collect', 'script')
+    assert not blocker.should_block('https://developer.apple.com/js/documentation.js', 'script')
+    assert not blocker.should_block('https://developer.apple.com/documentation/visionos', 'document')
+    assert not blocker.should_block('https://notgoogle-analytics.com/collect', 'script')
+
+
+@pytest.mark.asyncio
+async def test_blocked_requests_are_reported_per_page():
+    blocker = ResourceBlocker(resource_types=['image', 'font'], hosts=['metrics.apple.com'])
+    page_a, page_b = object(), object()
+    routes = [
+        FakeRoute(FakeRequest('https://developer.apple.com/a.png', 'image', page_a)),
+        FakeRoute(FakeRequest('https://developer.apple.com/sf.woff2', 'font', page_a)),
+        FakeRoute(FakeRequest('https://xp.metrics.apple.com/b/ss', 'script', page_b)),
+        FakeRoute(FakeRequest('https://developer.apple.com/documentation/visionos', 'document', page_b)),
+    ]
+    for route in routes:
+        await blocker.handle(route)
+
+    assert [route.outcome for route in routes] == ['aborted', 'aborted', 'aborted', 'continued']
+
+    stats_a = blocker.report(page_a, 'https://developer.apple.com/a')
+    assert stats_a['requests'] == 2
+    assert stats_a['bytes'] == ESTIMATED_RESOURCE_BYTES['image'] + ESTIMATED_RESOURCE_BYTES['font']
+    # Reporting resets the page's counters
+    assert blocker.report(page_a, 'https://developer.apple.com/a')['requests'] == 0
+
+    assert blocker.report(page_b, 'https://developer.apple.com/b')['requests'] == 1
+    assert blocker.totals['requests'] == 3
+    assert blocker.totals['pages'] == 2
+
+
+@pytest.mark.asyncio
+async def test_page_pool_routes_shared_context(fake_browser):
+    blocker = ResourceBlocker()
+    async with PagePool(fake_browser, size=2, blocker=blocker) as pool:
+        async with pool.page():
+            pass
+    assert fake_browser.contexts[0].routes == [('**/*', blocker.handle)]
+
+    disabled = ResourceBlocker(enabled=False)
+    async with PagePool(fake_browser, size=1, blocker=disabled) as pool:
+        async with pool.page():
+            pass
+    assert fake_browser.contexts[1].routes == []
@@ -0,0 +1,192 @@
+import pytest
+from aiohttp import web
+from core.blob_store import BlobStore
+from core.http_client import HttpClient
+from core.response_cache import ResponseCache
+from core.transport import Transport
+
+
+class FakeRequest:
+    def __init__(self, url, method='GET'):
+        self.url = url
+        self.method = method
+
+
+class FakeAPIResponse:
+    status = 200
+    status_text = 'OK'
+    headers_array = [{'name': 'Content-Type', 'value': 'text/html'}]
+
+    async def body(self):
+        return b'<h1>Rendered</h1>'
+
+
+class FakeRoute:
+    fetches = 0
+
+    def __init__(self, url, method='GET'):
+        self.request = FakeRequest(url, method)
+        self.fulfilled = None
+        self.fell_back = False
+
+    async def fetch(self):
+        FakeRoute.fetches += 1
+        return FakeAPIResponse()
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def fallback(self):
+        self.fell_back = True
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(BlobStore(tmp_path / 'blobs'), transport=Transport('live'))
+
+
+@pytest.mark.asyncio
+async def test_http_client_fetches_once_per_ttl(http_server, cache):
+    hits = []
+
+    async def page(request):
+        hits.append(request.path)
+        return web.Response(text='<h1>Page</h1>', content_type='text/html')
+
+    base_url = await http_server([web.get('/page', page)])
+    async with HttpClient(response_cache=cache) as client:
+        for _ in range(3):
+            async with client.get(f"{base_url}/page") as response:
+                assert await response.text() == '<h1>Page</h1>'
+        # Conditional requests go to the server
+        async with client.get(f"{base_url}/page", headers={'If-None-Match': '"v1"'}) as response:
+            assert response.status == 200
+        assert len(hits) == 2
+
+        cache.ttl = 0
+        async with client.get(f"{base_url}/page") as response:
+            assert response.headers['Content-Type'].startswith('text/html')
+    assert len(hits) == 3
+    assert cache.stats['hits'] == 2 and cache.stats['expired'] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_revalidated_with_validators(http_server, cache):
+    etag, last_modified = '"v1"', 'Tue, 19 Nov 2024 10:00:00 GMT'
+    seen = []
+
+    async def page(request):
+        seen.append(dict(request.headers))
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304)
+        return web.Response(text='<h1>Immersive spaces</h1>', content_type='text/html',
+                            headers={'ETag': etag, 'Last-Modified': last_modified})
+
+    base_url = await http_server([web.get('/page', page)])
+    async with HttpClient(response_cache=cache) as client:
+        async with client.get(f"{base_url}/page") as response:
+            assert await response.text() == '<h1>Immersive spaces</h1>'
+
+        # An expired entry sends its validators and a 304 is served from the cache
+        cache.ttl = 0
+        async with client.get(f"{base_url}/page") as response:
+            assert response.status == 200
+            assert await response.text() == '<h1>Immersive spaces</h1>'
+        assert seen[-1]['If-None-Match'] == etag
+        assert seen[-1]['If-Modified-Since'] == last_modified
+        assert client.stats['revalidated'] == 1
+
+        cache.ttl = 3600
+        async with client.get(f"{base_url}/page") as response:
+            assert await response.text() == '<h1>Immersive spaces</h1>'
+    assert len(seen) == 2
+    assert cache.stats['revalidated'] == 1 and cache.stats['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_without_body_is_fetched_unconditionally(http_server, cache):
+    seen = []
+
+    async def page(request):
+        seen.append(dict(request.headers))
+        return web.Response(text='<h1>Page</h1>', content_type='text/html', headers={'ETag': '"v1"'})
+
+    base_url = await http_server([web.get('/page', page)])
+    async with HttpClient(response_cache=cache) as client:
+        async with client.get(f"{base_url}/page") as response:
+            await response.read()
+        digest = cache.blobs.ref(cache.KIND, f"{base_url}/page")['digest']
+        cache.blobs._find_object(digest)[0].unlink()
+        cache.ttl = 0
+        async with client.get(f"{base_url}/page") as response:
+            assert await response.text() == '<h1>Page</h1>'
+    assert 'If-None-Match' not in seen[-1]
+
+
+@pytest.mark.asyncio
+async def test_chunked_responses_are_buffered_only_up_to_the_entry_limit(http_server, cache):
+    async def chunked(request):
+        response = web.StreamResponse()
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for _ in range(int(request.query['chunks'])):
+            await response.write(b'x' * 1000)
+        await response.write_eof()
+        return response
+
+    base_url = await http_server([web.get('/chunked', chunked)])
+    cache.max_entry_bytes = 2500
+    async with HttpClient(response_cache=cache) as client:
+        async with client.get(f"{base_url}/chunked?chunks=2") as response:
+            assert await response.read() == b'x' * 2000
+        async with client.get(f"{base_url}/chunked?chunks=10") as response:
+            body = b''.join([chunk async for chunk in response.content.iter_chunked(4096)])
+            assert body == b'x' * 10000
+        assert client.stats['uncached_streams'] == 1
+    assert cache.stats['stored'] == 1
+    assert cache.lookup(f"{base_url}/chunked?chunks=10") is None
+
+
+@pytest.mark.asyncio
+async def test_page_routes_and_http_client_share_entries(http_server, cache):
+    hits = []
+
+    async def page(request):
+        hits.append(request.path)
+        return web.Response(text='unused')
+
+    base_url = await http_server([web.get('/doc', page)])
+    FakeRoute.fetches = 0
+    first = FakeRoute(f"{base_url}/doc")
+    await cache.handle(first)
+    second = FakeRoute(f"{base_url}/doc")
+    await cache.handle(second)
+    assert FakeRoute.fetches == 1
+    assert second.fulfilled == {'status': 200, 'headers': {'Content-Type': 'text/html'},
+                                'body': b'<h1>Rendered</h1>'}
+
+    async with HttpClient(response_cache=cache) as client:
+        async with client.get(f"{base_url}/doc") as response:
+            assert await response.read() == b'<h1>Rendered</h1>'
+    assert hits == []
+
+    post = FakeRoute(f"{base_url}/doc", method='POST')
+    await cache.handle(post)
+    assert post.fell_back
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.max_bytes = 250
+    for age, url in enumerate(['a', 'b']):
+        cache.store(url, 200, [], b'x' * 100)
+        cache.blobs.touch(cache.KIND, url, at=1000 + age)
+    cache.lookup('a')  # a is now the most recently used
+    cache.store('c', 200, [], b'y' * 100)
+
+    assert cache.lookup('b') is None
+    assert cache.lookup('a') is not None and cache.lookup('c') is not None
+    assert cache.stats['evicted'] == 1
+
+    cache.store('d', 404, [], b'missing')
+    cache.store('e', 200, [('Cache-Control', 'no-store')], b'private')
+    assert cache.lookup('d') is None and cache.lookup('e') is None
@@ -0,0 +1,150 @@
+import pytest
+import gzip
+from aiohttp import web
+from core.crawl_journal import CrawlJournal, CrawlState
+from core.blob_store import BlobStore
+from core.crawler import CrawlStats, DocumentationCrawler
+from core.http_client import HttpClient
+from core.response_cache import ResponseCache
+from core.sitemap import fetch_sitemap_entries, parse_lastmod, parse_sitemap
+from core.transport import Transport
+from core.url_sources import DocumentationURLCollector
+
+DOCS = 'https://developer.apple.com/documentation/visionos'
+
+URLSET = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{DOCS}/new-page</loc><lastmod>2026-03-01</lastmod></url>
+  <url><loc>{DOCS}/edited</loc><lastmod>2026-03-01T12:00:00+00:00</lastmod></url>
+  <url><loc>{DOCS}/stable</loc><lastmod>2020-01-01</lastmod></url>
+  <url><loc>{DOCS}/no-lastmod</loc></url>
+  <url><loc>https://developer.apple.com/news/</loc></url>
+</urlset>"""
+
+
+def sitemap_index(base_url):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{base_url}/docs.xml.gz</loc></sitemap>
+</sitemapindex>"""
+
+
+def test_parse_sitemap_and_lastmod():
+    entries, children = parse_sitemap(URLSET)
+    assert children == []
+    assert entries[0].url == f"{DOCS}/new-page"
+    assert entries[3].lastmod is None
+    assert parse_lastmod('2026-03-01') < parse_lastmod('2026-03-01T12:00:00+00:00')
+    assert parse_lastmod('yesterday') is None
+
+
+@pytest.mark.asyncio
+async def test_sitemap_index_is_followed(http_server):
+    base_url = None
+
+    async def index(request):
+        return web.Response(text=sitemap_index(base_url), content_type='application/xml')
+
+    async def docs(request):
+        return web.Response(body=gzip.compress(URLSET.encode()))
+
+    base_url = await http_server([web.get('/sitemap.xml', index), web.get('/docs.xml.gz', docs)])
+    async with HttpClient() as client:
+        entries = await fetch_sitemap_entries(client, [f"{base_url}/sitemap.xml"],
+                                              url_filter=lambda url: '/documentation/' in url)
+        missing = await fetch_sitemap_entries(client, [f"{base_url}/missing.xml"])
+    assert set(entries) == {f"{DOCS}/new-page", f"{DOCS}/edited", f"{DOCS}/stable", f"{DOCS}/no-lastmod"}
+    assert missing == {}
+
+
+@pytest.mark.asyncio
+async def test_incremental_plan_uses_journal(http_server, tmp_path):
+    async def docs(request):
+        return web.Response(text=URLSET, content_type='application/xml')
+
+    base_url = await http_server([web.get('/sitemap.xml', docs)])
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    journal = collector.journal
+    journal.mark(f"{DOCS}/edited", CrawlState.EXTRACTED, content_hash='a', lastmod='2026-01-01')
+    journal.mark(f"{DOCS}/stable", CrawlState.EXTRACTED, content_hash='b')
+    journal.mark(f"{DOCS}/no-lastmod", CrawlState.EXTRACTED, content_hash='c')
+
+    async with HttpClient() as client:
+        plan = await collector.plan_incremental_crawl([f"{base_url}/sitemap.xml"], client)
+    assert set(plan['new']) == {f"{DOCS}/new-page"}
+    assert set(plan['changed']) == {f"{DOCS}/edited", f"{DOCS}/no-lastmod"}
+    assert set(plan['unchanged']) == {f"{DOCS}/stable"}
+
+    # Without a sitemap, every journaled documentation page is revalidated by hash
+    journal.mark(f"{DOCS}/stable", CrawlState.EXTRACTED, category='documentation')
+    async with HttpClient() as client:
+        plan = await collector.plan_incremental_crawl([f"{base_url}/gone.xml"], client)
+    assert plan['new'] == {} and plan['unchanged'] == {}
+    assert set(plan['changed']) == {f"{DOCS}/stable"}
+    collector.writer.close()
+
+
+@pytest.mark.asyncio
+async def test_changed_page_is_refetched_past_the_response_cache(http_server, tmp_path, monkeypatch):
+    cache = ResponseCache(BlobStore(tmp_path / 'blobs'), transport=Transport('live'))
+    monkeypatch.setattr('core.response_cache._response_cache', cache)
+    served = {'lastmod': '2026-01-01', 'title': 'Edited'}
+    hits = []
+
+    async def sitemap(request):
+        return web.Response(text=f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{page_url}</loc><lastmod>{served['lastmod']}</lastmod></url>
+</urlset>""", content_type='application/xml')
+
+    async def docc_json(request):
+        hits.append(request.path)
+        return web.json_response({'metadata': {'title': served['title']}})
+
+    base_url = await http_server([
+        web.get('/sitemap.xml', sitemap),
+        web.get('/tutorials/data/documentation/visionos/edited.json', docc_json),
+    ])
+    page_url = f"{base_url}/documentation/visionos/edited"
+    collector = DocumentationURLCollector(base_dir=tmp_path / 'data')
+    collector.journal.mark(page_url, CrawlState.EXTRACTED, content_hash='a', lastmod='2026-01-01',
+                           category='documentation')
+    titles = []
+
+    async def crawl(seeds, browser=None, visited_urls=None):
+        for url, _ in seeds:
+            titles.append((await collector.fetcher.fetch(url)).content['title'])
+        return CrawlStats(pages=len(seeds))
+
+    monkeypatch.setattr(collector, 'cache_documentation_pages', crawl)
+    assert (await collector.fetcher.fetch(page_url)).content['title'] == 'Edited'
+    # Sitemap read once while the page is unchanged
+    await collector.refresh_changed_pages([f"{base_url}/sitemap.xml"])
+    assert titles == []
+
+    served.update(lastmod='2026-03-01', title='Edited again')
+    await collector.refresh_changed_pages([f"{base_url}/sitemap.xml"])
+
+    assert titles == ['Edited again']
+    assert len(hits) == 2
+    await collector.fetcher.close()
+    collector.writer.close()
+
+
+@pytest.mark.asyncio
+async def test_recrawl_reports_only_changed_content(tmp_path, fake_browser):
+    journal = CrawlJournal(tmp_path / 'journal.sqlite3')
+    titles = {'root': 'Root', 'a': 'A'}
+
+    async def handler(page, url, category):
+        return {'title': titles[url], 'child_pages': ['a'] if url == 'root' else []}
+
+    first = await DocumentationCrawler(handler, workers=1, journal=journal).crawl(
+        fake_browser, [('root', 'documentation')])
+    assert first.changed == {'root', 'a'}
+
+    titles['a'] = 'A, revised'
+    second = await DocumentationCrawler(handler, workers=1, journal=journal).crawl(
+        fake_browser, [('root', 'documentation')])
+    assert second.changed == {'a'}
+    assert second.unchanged == 1
@@ -0,0 +1,99 @@
+import pytest
+import json
+import time
+import aiohttp
+from aiohttp import web
+from core.http_client import HttpClient
+from core.transport import Transport
+
+
+class FakeRequest:
+    def __init__(self, url, method='GET'):
+        self.url = url
+        self.method = method
+
+
+class FakeAPIResponse:
+    status = 200
+    status_text = 'OK'
+    headers_array = [{'name': 'Content-Type', 'value': 'text/html'},
+                     {'name': 'Content-Encoding', 'value': 'gzip'}]
+
+    async def body(self):
+        return b'<h1>Live</h1>'
+
+
+class FakeRoute:
+    def __init__(self, url):
+        self.request = FakeRequest(url)
+        self.fulfilled = None
+        self.aborted = None
+
+    async def fetch(self):
+        return FakeAPIResponse()
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def abort(self, error_code=None):
+        self.aborted = error_code
+
+
+@pytest.mark.asyncio
+async def test_http_client_records_then_replays_offline(http_server, tmp_path):
+    archive = tmp_path / 'transport.har'
+    hits = []
+
+    async def page(request):
+        hits.append(request.path)
+        return web.Response(body=b'x' * 2048, content_type='application/zip')
+
+    base_url = await http_server([web.get('/sample.zip', page)])
+    recorder = Transport('record', archive)
+    async with HttpClient(transport=recorder) as client:
+        async with client.get(f"{base_url}/sample.zip") as response:
+            chunks = [chunk async for chunk in response.content.iter_chunked(1000)]
+    assert b''.join(chunks) == b'x' * 2048
+    recorder.save()
+    assert json.loads(archive.read_text())['log']['entries'][0]['response']['status'] == 200
+
+    replayer = Transport('replay', archive, latency=0.05)
+    async with HttpClient(transport=replayer) as client:
+        started = time.monotonic()
+        async with client.get(f"{base_url}/sample.zip") as response:
+            assert response.status == 200
+            assert response.headers['Content-Type'] == 'application/zip'
+            assert await response.read() == b'x' * 2048
+        assert time.monotonic() - started >= 0.05
+        with pytest.raises(aiohttp.ClientConnectionError):
+            async with client.get(f"{base_url}/missing") as response:
+                pass
+    assert hits == ['/sample.zip']
+    assert replayer.stats['hits'] == 1 and replayer.stats['misses'] == 1
+
+
+@pytest.mark.asyncio
+async def test_page_routes_record_then_replay(tmp_path):
+    archive = tmp_path / 'transport.har'
+    recorder = Transport('record', archive)
+    route = FakeRoute('https://developer.apple.com/documentation/visionos')
+    await recorder.handle(route)
+    assert route.fulfilled['body'] == b'<h1>Live</h1>'
+    recorder.save()
+
+    replayer = Transport('replay', archive)
+    route = FakeRoute('https://developer.apple.com/documentation/visionos')
+    await replayer.handle(route)
+    assert route.fulfilled['status'] == 200
+    assert route.fulfilled['body'] == b'<h1>Live</h1>'
+    # The body was stored decoded, so its encoding header is dropped
+    assert route.fulfilled['headers'] == {'Content-Type': 'text/html'}
+
+    missing = FakeRoute('https://developer.apple.com/documentation/realitykit')
+    await replayer.handle(missing)
+    assert missing.aborted == 'internetdisconnected'
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Transport('offline', tmp_path / 'transport.har')
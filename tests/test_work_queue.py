@@ -0,0 +1,31 @@
+from core.work_queue import WorkQueue
+
+
+def test_queue_dedupes_and_applies_depth_limits(tmp_path):
+    queue = WorkQueue(tmp_path / 'queue.sqlite3', max_depth=2, max_pages_per_depth={1: 2})
+
+    assert queue.push_many(['root', 'root'], 'documentation', depth=0) == (1, 0)
+    assert queue.push_many(['a', 'b', 'c'], 'documentation', depth=1) == (2, 1)
+    assert queue.push_many(['root', 'a', 'x'], 'documentation', depth=2) == (1, 0)
+    assert queue.push_many(['too-deep'], 'documentation', depth=3) == (0, 0)
+    assert queue.counts() == {'pending': 4}
+
+
+def test_deeper_urls_wait_for_the_current_depth(tmp_path):
+    queue = WorkQueue(tmp_path / 'queue.sqlite3', max_attempts=2)
+    queue.push_many(['root'], 'documentation', depth=0)
+    queue.push_many(['a'], 'documentation', depth=1)
+
+    assert queue.claim('w1') == ('root', 'documentation', 0)
+    # 'a' could still be found again at a shallower depth while root is in flight
+    assert queue.claim('w2') is None
+    assert not queue.drained()
+
+    # The worker died: its lease goes back out until the attempts run out
+    assert queue.release('w1') == ['root']
+    assert queue.claim('w2') == ('root', 'documentation', 0)
+    queue.release('w2')
+    assert queue.failures() == {'root': 'worker exited'}
+    assert queue.claim('w3') == ('a', 'documentation', 1)
+    queue.complete('a')
+    assert queue.drained()
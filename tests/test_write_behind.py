@@ -0,0 +1,105 @@
+import pytest
+import asyncio
+import json
+import threading
+import time
+from core.write_behind import WriteBehindQueue
+
+
+@pytest.mark.asyncio
+async def test_writes_run_off_the_event_loop_in_order(tmp_path):
+    writer = WriteBehindQueue(maxsize=4)
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def record(value):
+        threads.append(threading.get_ident())
+        with open(tmp_path / 'log.txt', 'a') as f:
+            f.write(f"{value}\n")
+
+    for i in range(20):
+        await writer.submit(record, i)
+    await writer.write_json(tmp_path / 'page.json', {'title': 'RealityView'})
+    await writer.flush()
+
+    assert (tmp_path / 'log.txt').read_text().split() == [str(i) for i in range(20)]
+    assert json.loads((tmp_path / 'page.json').read_text()) == {'title': 'RealityView'}
+    assert loop_thread not in threads
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure_without_blocking_the_loop():
+    writer = WriteBehindQueue(maxsize=1)
+    release = threading.Event()
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def producer():
+        await writer.submit(release.wait)  # Occupies the worker
+        await writer.submit(lambda: None)  # Fills the queue
+        await writer.submit(lambda: None)  # Has to wait for room
+
+    tick_task = asyncio.create_task(ticker())
+    producer_task = asyncio.create_task(producer())
+    await tick_task
+    assert not producer_task.done()
+    release.set()
+    await producer_task
+    await writer.flush()
+
+    assert len(ticks) == 5
+    assert writer.stats['backpressure'] >= 1
+    assert writer.stats['completed'] == 3
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_submit_waiting_for_room_is_not_overtaken():
+    writer = WriteBehindQueue(maxsize=1)
+    release = threading.Event()
+    order = []
+    blocking_put = writer._queue.put
+
+    def slow_put(job, block=True, timeout=None):
+        if block:
+            # Leave a window in which the queue has room but the waiting job is not in it yet
+            release.wait()
+            time.sleep(0.05)
+        blocking_put(job, block, timeout)
+
+    writer._queue.put = slow_put
+    await writer.submit(release.wait)  # Occupies the worker
+    while not writer._queue.empty():
+        await asyncio.sleep(0.001)
+    await writer.submit(order.append, 'queued')  # Fills the queue
+    blocked = asyncio.create_task(writer.submit(order.append, 'blocked'))
+    await asyncio.sleep(0.01)
+    release.set()
+    while writer._queue.full():
+        await asyncio.sleep(0.001)
+    later = asyncio.create_task(writer.submit(order.append, 'later'))
+    await asyncio.gather(blocked, later)
+    await writer.flush()
+
+    assert order == ['queued', 'blocked', 'later']
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_counted_and_close_drains(tmp_path):
+    writer = WriteBehindQueue()
+
+    def fail():
+        raise OSError("disk full")
+
+    await writer.submit(fail)
+    await writer.write_text(tmp_path / 'after.txt', 'still written')
+    writer.close()
+
+    assert writer.stats['errors'] == 1
+    assert (tmp_path / 'after.txt').read_text() == 'still written'
@@ -0,0 +1,79 @@
+"""Benchmark the documentation crawl offline against a recorded transport archive
+
+Record an archive once with network access:
+
+    python run_scraper.py --transport record --archive data/cache/transport.har
+
+then replay it as often as needed, e.g. with 50ms of injected latency:
+
+    python tools/benchmark_crawl.py --archive data/cache/transport.har --latency 0.05 --profile crawl.prof
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import cProfile
+import pstats
+import sys
+import tempfile
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from playwright.async_api import async_playwright
+from core.config import BASE_URLS, MAX_CRAWL_DEPTH, TRANSPORT_ARCHIVE
+from core.response_cache import ResponseCache, configure_response_cache
+from core.transport import configure_transport
+from core.url_sources import DocumentationURLCollector
+
+
+async def run(seeds, max_depth):
+    with tempfile.TemporaryDirectory() as data_dir:
+        collector = DocumentationURLCollector(base_dir=Path(data_dir))
+        # Start from an empty response cache so every run measures the same work
+        cache = configure_response_cache(ResponseCache(collector.blobs))
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            try:
+                stats = await collector.cache_documentation_pages(
+                    [(url, 'documentation') for url in seeds], browser=browser, max_depth=max_depth)
+            finally:
+                await browser.close()
+        collector.writer.close()
+        cache.log_stats()
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded crawl and report its throughput')
+    parser.add_argument('--archive', type=Path, default=TRANSPORT_ARCHIVE, help='HAR archive to replay')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds injected per response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra uniform random seconds per response')
+    parser.add_argument('--recorded-timing', action='store_true', help='Wait as long as each response originally took')
+    parser.add_argument('--depth', type=int, default=MAX_CRAWL_DEPTH, help='Maximum crawl depth')
+    parser.add_argument('--seed', action='append', help='Seed URL (repeatable, defaults to BASE_URLS)')
+    parser.add_argument('--profile', type=Path, help='Write cProfile stats to this file')
+    args = parser.parse_args()
+
+    if not args.archive.exists():
+        parser.error(f"{args.archive} does not exist; record one with run_scraper.py --transport record")
+    transport = configure_transport('replay', args.archive, latency=args.latency, jitter=args.jitter,
+                                    recorded_timing=args.recorded_timing)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    stats = asyncio.run(run(args.seed or BASE_URLS, args.depth))
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(str(args.profile))
+
+    print(f"Pages: {stats.pages}, failures: {stats.failures}, elapsed: {stats.elapsed:.2f}s, "
+          f"{stats.pages / stats.elapsed:.2f} pages/sec")
+    print(f"Replayed responses: {transport.stats['hits']}, missing from archive: {transport.stats['misses']}")
+    if profiler:
+        pstats.Stats(str(args.profile)).sort_stats('cumulative').print_stats(20)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,7 @@ class CacheManager:
         # Define ALL cache files in one place
         self.cache_files = {
             'url_cache': self.cache_dir / 'url_cache.json',
+            'crawl_journal': self.cache_dir / 'crawl_journal.sqlite3',
             'samples_cache': self.cache_dir / 'discovered_samples.json',
             'doc_cache': self.cache_dir / 'documentation_cache.json',
             'analysis_cache': self.cache_dir / 'analysis_cache.json',